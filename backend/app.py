@@ -4,13 +4,15 @@ Main FastAPI application.
 This module creates and configures the FastAPI application.
 """
 
+import asyncio
 import logging
 import time
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 
 from .errors.handlers import register_exception_handlers
 from .routes import api_router
@@ -23,15 +25,44 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def _keep_pools_alive() -> None:
+    """Periodically ping idle pooled connections so the warehouse doesn't drop them."""
+    from .services.db.connector import POOL_KEEPALIVE_SECONDS, ping_idle_connections
+    while True:
+        await asyncio.sleep(POOL_KEEPALIVE_SECONDS)
+        ping = asyncio.ensure_future(asyncio.to_thread(ping_idle_connections))
+        try:
+            await asyncio.shield(ping)
+        except asyncio.CancelledError:
+            # The ping's thread can't be interrupted; wait for it so shutdown doesn't close pools under it
+            await asyncio.wait([ping])
+            raise
+        except Exception as e:
+            logger.warning(f"Connection keepalive failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle application startup and shutdown events."""
     logger.info("Application startup initiated")
+    from .config.settings import settings
+    from .services.db.connector import POOL_MIN_SIZE, warm_pool
+    if settings.databricks_warehouse_id and POOL_MIN_SIZE > 0:
+        opened = await warm_pool(settings.databricks_warehouse_id, POOL_MIN_SIZE)
+        logger.info(f"Opened {opened} warehouse connections")
+    keepalive = asyncio.create_task(_keep_pools_alive())
     logger.info("Application startup complete")
 
     yield
 
     logger.info("Application shutdown initiated")
+    keepalive.cancel()
+    # Wait out an in-flight ping before the pools it touches are closed
+    with suppress(asyncio.CancelledError):
+        await keepalive
+    from .services.logger import db_logger
+    if db_logger.flush():
+        logger.info("Pending log entries written")
     from .services.db.connector import close_connections
     close_connections()
     logger.info("Database connections closed")
@@ -43,11 +74,17 @@ app = FastAPI(
     description="A FastAPI application for Databricks Apps runtime",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+
 @app.middleware("http")
 async def cache_request_body_and_track_time(request: Request, call_next):
-    """Cache request body and track execution time so error handlers can access them."""
+    """Cache the request body and track execution time for error handlers.
+
+    The body is not parsed here: handlers parse it themselves, and the error logger only
+    decodes it when something actually goes wrong.
+    """
     import time
 
     start_time = time.perf_counter()
@@ -19,6 +19,12 @@ class Settings(BaseSettings):
         description="The ID of the Databricks SQL warehouse to connect to",
     )
 
+    # Unity Catalog volume used to stage large writes for COPY INTO; unset keeps row INSERTs
+    databricks_staging_volume: str | None = Field(
+        default=None,
+        description="Volume path for staging bulk writes, e.g. /Volumes/catalog/schema/staging",
+    )
+
     # Use model_config instead of class Config
     model_config = {
         "env_file": ".env",
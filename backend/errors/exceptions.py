@@ -34,6 +34,28 @@ class DatabaseError(BaseAppException):
         super().__init__(message=message, status_code=500, details=details)
 
 
+class ServiceUnavailableError(BaseAppException):
+    """Exception raised when a backing service is temporarily unavailable."""
+
+    def __init__(
+        self,
+        message: str = "Service temporarily unavailable",
+        details: dict[str, Any] | None = None,
+    ):
+        super().__init__(message=message, status_code=503, details=details)
+
+
+class TooManyRequestsError(BaseAppException):
+    """Exception raised when the server has no capacity left for the request."""
+
+    def __init__(
+        self,
+        message: str = "Too many concurrent requests",
+        details: dict[str, Any] | None = None,
+    ):
+        super().__init__(message=message, status_code=429, details=details)
+
+
 class ConfigurationError(BaseAppException):
     """Exception raised when a configuration value is missing or invalid."""
 
@@ -5,12 +5,21 @@ This module defines handlers for exceptions that can be registered
 with FastAPI to provide consistent error responses.
 """
 
+from functools import lru_cache
+
+import orjson
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import ValidationError as PydanticValidationError
 
 from ..services.logger import db_logger
-from .exceptions import BaseAppException
+from .exceptions import BaseAppException, ConfigurationError
+
+
+@lru_cache(maxsize=64)
+def _static_error_body(message: str) -> bytes:
+    """Encode a details-free error body once; configuration errors repeat on every request until fixed."""
+    return orjson.dumps({"error": True, "message": message, "details": {}})
 
 
 def register_exception_handlers(app: FastAPI) -> None:
@@ -24,7 +33,7 @@ def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(BaseAppException)
     async def handle_base_app_exception(
         request: Request, exc: BaseAppException
-    ) -> JSONResponse:
+    ) -> Response:
         """Handle BaseAppException and its subclasses."""
         import time
         start_time = getattr(request.state, "start_time", None)
@@ -41,7 +50,12 @@ def register_exception_handlers(app: FastAPI) -> None:
             },
         )
 
-        return JSONResponse(
+        if isinstance(exc, ConfigurationError) and not exc.details:
+            return Response(
+                _static_error_body(exc.message), status_code=exc.status_code, media_type="application/json"
+            )
+
+        return ORJSONResponse(
             status_code=exc.status_code,
             content={
                 "error": True,
@@ -53,7 +67,7 @@ def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(PydanticValidationError)
     async def handle_validation_error(
         request: Request, exc: PydanticValidationError
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle Pydantic validation errors."""
         from typing import Any
         errors = []
@@ -83,7 +97,7 @@ def register_exception_handlers(app: FastAPI) -> None:
             },
         )
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=400,
             content={
                 "error": True,
@@ -95,7 +109,7 @@ def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(Exception)
     async def handle_unhandled_exception(
         request: Request, exc: Exception
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Handle all unhandled exceptions."""
         import time
         start_time = getattr(request.state, "start_time", None)
@@ -111,7 +125,7 @@ def register_exception_handlers(app: FastAPI) -> None:
             },
         )
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": True,
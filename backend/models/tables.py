@@ -115,6 +115,10 @@ class TableInsertRequest(BaseModel):
         None,
         description="Table schema definition (required if auto_create=true and table doesn't exist)"
     )
+    return_data: bool = Field(
+        False,
+        description="If true, echo the inserted records (including audit fields) back in the response"
+    )
 
     @field_validator("schema_definition")
     @classmethod
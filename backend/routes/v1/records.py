@@ -1,14 +1,29 @@
-import json
+import asyncio
 import os
 import re
+import time
+from collections.abc import Iterator
 from datetime import UTC, datetime
+from decimal import Decimal
+from functools import lru_cache
 from typing import Any
+from uuid import uuid4
 
+import orjson
 from fastapi import APIRouter, Depends
+from fastapi.encoders import decimal_encoder
+from fastapi.responses import ORJSONResponse
 
 from ...config.settings import get_settings
-from ...errors.exceptions import ConfigurationError, DatabaseError, ValidationError
+from ...errors.exceptions import (
+    ConfigurationError,
+    DatabaseError,
+    ServiceUnavailableError,
+    TooManyRequestsError,
+    ValidationError,
+)
 from ...models.tables import (
+    BulkUpdateItem,
     TableDeleteRequest,
     TableInsertRequest,
     TableQueryParams,
@@ -16,16 +31,96 @@ from ...models.tables import (
     TableUpdateRequest,
 )
 from ...services.db import connector as db_connector
-from ...services.db.sql_helpers import build_where_clause
+from ...services.db.sql_helpers import _qmarks, _quote_identifier, build_where_clause
 
 router = APIRouter(tags=["records"])
 
 
 IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# fullmatch so a trailing newline can't slip past "$"
+_IDENT_FULLMATCH = IDENT_RE.fullmatch
+
+# Audit columns maintained by the API; always accepted alongside the user schema
+AUDIT_COLUMNS = frozenset({
+    "record_uuid", "is_deleted", "inserted_at", "inserted_by", "updated_at", "updated_by", "deleted_at", "deleted_by"
+})
+
+# Column definitions appended to every auto-created table
+_AUDIT_COLUMN_DEFS_SQL = (
+    "record_uuid STRING, "
+    "is_deleted BOOLEAN, "
+    "inserted_at TIMESTAMP, "
+    "inserted_by STRING, "
+    "updated_at TIMESTAMP, "
+    "updated_by STRING, "
+    "deleted_at TIMESTAMP, "
+    "deleted_by STRING"
+)
+
+# SET clause for soft deletes; binds deleted_at, deleted_by, updated_at, updated_by in that order
+_SOFT_DELETE_SET_SQL = "is_deleted = true, deleted_at = ?, deleted_by = ?, updated_at = ?, updated_by = ?"
+
+
+# Maximum number of bulk_updates items applied against the warehouse at the same time
+BULK_UPDATE_CONCURRENCY = 8
+
+# How long DESCRIBE results are reused before hitting the warehouse again
+METADATA_CACHE_TTL_SECONDS = 60.0
+
+# Writes with at least this many rows go through a staged COPY INTO when a staging volume is configured
+BULK_LOAD_MIN_ROWS = 1000
+
+# How long a served read page may be replayed while the warehouse circuit is open
+READ_FALLBACK_TTL_SECONDS = 60.0
+
+# Maximum number of read pages kept for replay while the warehouse circuit is open
+READ_FALLBACK_MAX_ENTRIES = 256
+
+# (table_path, warehouse_id) -> (monotonic timestamp, column names)
+_META_CACHE: dict[tuple[str, str], tuple[float, tuple[str, ...]]] = {}
+
+# Read request arguments -> (monotonic timestamp, last page served for them)
+_READ_FALLBACK_CACHE: dict[tuple, tuple[float, dict[str, Any]]] = {}
+
+# Accepted Python types and error label per SQL type; types without an entry are not checked
+_TYPE_CHECKS: dict[str, tuple[tuple[type, ...], str]] = {
+    **dict.fromkeys(("BIGINT", "INT", "INTEGER", "SMALLINT", "TINYINT"), ((int,), "integer")),
+    **dict.fromkeys(("DOUBLE", "FLOAT", "DECIMAL"), ((int, float), "numeric")),
+    **dict.fromkeys(("STRING", "VARCHAR", "CHAR"), ((str,), "string")),
+    "BOOLEAN": ((bool,), "boolean"),
+    **dict.fromkeys(("DATE", "TIMESTAMP"), ((str, datetime), "date/timestamp string")),
+}
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO-8601 string for the audit timestamp columns."""
+    return datetime.now(UTC).isoformat()
 
 
+def _json_default(value: Any) -> Any:
+    """Encode warehouse types orjson doesn't handle natively, the same way jsonable_encoder would."""
+    if isinstance(value, Decimal):
+        return decimal_encoder(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class RecordsJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also encodes DECIMAL and BINARY column values."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+@lru_cache(maxsize=1024)
 def _validate_identifier(name: str) -> None:
-    if not IDENT_RE.match(name):
+    # For ASCII input, str.isidentifier() accepts exactly IDENT_RE's grammar, without regex dispatch
+    if name.isascii() and name.isidentifier():
+        return
+    if not _IDENT_FULLMATCH(name):
         raise ValueError(f"Invalid identifier: {name}")
 
 
@@ -35,160 +130,232 @@ def _table_path(catalog: str | None, schema: str | None, table: str) -> str:
     return f"{catalog}.{schema}.{table}"
 
 
-def _has_column(table_path: str, column: str, warehouse_id: str) -> bool:
-    try:
-        desc = db_connector.query(f"DESCRIBE {table_path}", warehouse_id=warehouse_id, as_dict=True)
-        if isinstance(desc, list):
-            rows = desc
-        else:
-            try:
-                import pandas as _pd
+@lru_cache(maxsize=4096)
+def _validated_table_path(catalog: str | None, schema: str | None, table: str) -> str:
+    """Validate catalog, schema and table names and return the table path; cached per triple."""
+    table_path = _table_path(catalog, schema, table)
+    for name in (catalog, schema, table):
+        _validate_identifier(name)
+    return table_path
 
-                rows = _pd.DataFrame(desc).to_dict(orient="records")
-            except Exception:
-                rows = []
 
-        for row in rows:
-            # Different dialects may name the column differently
-            if any(column == v for v in row.values()):
-                return True
-        return False
-    except Exception:
-        return False
+async def _table_columns(table_path: str, warehouse_id: str) -> tuple[str, ...]:
+    """Return the table's column names, in table order, from one DESCRIBE reused for METADATA_CACHE_TTL_SECONDS.
+
+    Only successful probes are cached; exceptions propagate so the caller can decide
+    how to treat an unreachable warehouse.
+    """
+    cache_key = (table_path, warehouse_id)
+    now = time.monotonic()
+    entry = _META_CACHE.get(cache_key)
+    if entry is not None and now - entry[0] < METADATA_CACHE_TTL_SECONDS:
+        return entry[1]
 
+    rows = await db_connector.aquery(f"DESCRIBE {table_path}", warehouse_id=warehouse_id, as_dict=True)
+    names: list[str] = []
+    for row in rows:
+        # Databricks reports the column name under "col_name"; "name" covers other dialects
+        name = row.get("col_name") or row.get("name")
+        # A blank row or "# Partition Information" header ends the column section
+        if not name or name.startswith("#"):
+            break
+        names.append(name)
+    columns = tuple(names)
+    _META_CACHE[cache_key] = (now, columns)
+    return columns
 
-def _catalog_exists(catalog: str, warehouse_id: str) -> bool:
-    """Check if a catalog exists."""
-    try:
-        db_connector.query(f"SHOW CATALOGS LIKE '{catalog}'", warehouse_id=warehouse_id)
-        return True
-    except Exception:
-        return False
 
+def _invalidate_table_metadata(table_path: str, warehouse_id: str) -> None:
+    """Drop the cached columns for a table, e.g. after DDL changed its shape."""
+    _META_CACHE.pop((table_path, warehouse_id), None)
 
-def _schema_exists(catalog: str, schema: str, warehouse_id: str) -> bool:
-    """Check if a schema exists."""
-    try:
-        db_connector.query(f"SHOW SCHEMAS IN {catalog} LIKE '{schema}'", warehouse_id=warehouse_id)
-        return True
-    except Exception:
-        return False
 
+def clear_metadata_cache() -> None:
+    """Drop every cached metadata probe result."""
+    _META_CACHE.clear()
 
-def _table_exists(table_path: str, warehouse_id: str) -> bool:
-    """Check if a table exists."""
-    try:
-        db_connector.query(f"DESCRIBE TABLE {table_path}", warehouse_id=warehouse_id)
-        return True
-    except Exception:
-        return False
 
+def _remember_read_page(key: tuple, payload: dict[str, Any]) -> None:
+    """Keep a served page so it can be replayed if the warehouse circuit opens."""
+    _READ_FALLBACK_CACHE.pop(key, None)
+    if len(_READ_FALLBACK_CACHE) >= READ_FALLBACK_MAX_ENTRIES:
+        # dicts keep insertion order, so the first key is the least recently stored page
+        del _READ_FALLBACK_CACHE[next(iter(_READ_FALLBACK_CACHE))]
+    _READ_FALLBACK_CACHE[key] = (time.monotonic(), payload)
 
-def _create_catalog_if_not_exists(catalog: str, warehouse_id: str) -> None:
-    """Create catalog if it doesn't exist."""
-    if not _catalog_exists(catalog, warehouse_id):
-        db_connector.query(f"CREATE CATALOG IF NOT EXISTS {catalog}", warehouse_id=warehouse_id)
 
+def _last_good_read_page(key: tuple) -> dict[str, Any] | None:
+    """Return the page last served for these read arguments, if it is recent enough to replay."""
+    entry = _READ_FALLBACK_CACHE.get(key)
+    if entry is None or time.monotonic() - entry[0] >= READ_FALLBACK_TTL_SECONDS:
+        return None
+    return entry[1]
 
-def _create_schema_if_not_exists(catalog: str, schema: str, warehouse_id: str) -> None:
-    """Create schema if it doesn't exist."""
-    if not _schema_exists(catalog, schema, warehouse_id):
-        db_connector.query(f"CREATE SCHEMA IF NOT EXISTS {catalog}.{schema}", warehouse_id=warehouse_id)
 
+def clear_read_fallback_cache() -> None:
+    """Drop every page kept for replay while the warehouse circuit is open."""
+    _READ_FALLBACK_CACHE.clear()
 
-def _create_table_from_schema(table_path: str, schema_definition: list, warehouse_id: str) -> None:
-    """Create a table with the given schema definition and required audit columns."""
 
-    column_defs = []
-    for col in schema_definition:
-        nullable_clause = "" if col.nullable else " NOT NULL"
-        column_defs.append(f"{col.name} {col.data_type}{nullable_clause}")
+@lru_cache(maxsize=1)
+def _audit_user() -> str:
+    """Identity recorded in the *_by audit columns.
 
-    column_defs.extend([
-        "record_uuid STRING",
-        "is_deleted BOOLEAN",
-        "inserted_at TIMESTAMP",
-        "inserted_by STRING",
-        "updated_at TIMESTAMP",
-        "updated_by STRING",
-        "deleted_at TIMESTAMP",
-        "deleted_by STRING"
-    ])
+    Read on first use rather than at import, so values loaded from .env by app startup apply.
+    """
+    return os.getenv("DATABRICKS_USER") or os.getenv("DATABRICKS_CONFIG_PROFILE") or "api"
 
-    columns_sql = ", ".join(column_defs)
-    create_table_sql = f"CREATE TABLE IF NOT EXISTS {table_path} ({columns_sql})"
 
-    db_connector.query(create_table_sql, warehouse_id=warehouse_id)
+def _projection(columns: str, known_columns: tuple[str, ...]) -> str:
+    """Resolve the SELECT list for a read.
+
+    "*" expands to the table's non-audit columns so the warehouse skips the audit fields
+    (falling back to "*" if the columns are unknown). Expanded names come straight from
+    DESCRIBE and may need quoting, so each is backtick-quoted. Explicit columns must be valid
+    identifiers and, when the table's columns are known, exist in the table.
+
+    Raises: \n
+        ValueError: If a requested column is not a valid identifier or not in the table
+    """
+    if columns.strip() == "*":
+        selected = [c for c in known_columns if c not in AUDIT_COLUMNS]
+        return ", ".join(map(_quote_identifier, selected)) if selected else "*"
+
+    names = [c.strip() for c in columns.split(",")]
+    for name in names:
+        _validate_identifier(name)
+
+    if known_columns:
+        # Databricks column names are case-insensitive
+        known = {c.lower() for c in known_columns}
+        unknown = [n for n in names if n.lower() not in known]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
 
+    return ", ".join(names)
 
-def _validate_data_against_schema(data: list[dict], schema_definition: list) -> None:
-    """Validate that data conforms to the schema definition.
+
+@lru_cache(maxsize=1024)
+def _parse_filters(filters: str) -> tuple[str, tuple[Any, ...]]:
+    """Parse a filters JSON payload into a WHERE clause and its params; cached per payload.
 
     Raises: \n
-        ValueError: If validation fails. The exception includes the expected schema
-                   information in its string representation for error responses.
+        ValueError: If the payload is not valid JSON or a filter is invalid
+        TypeError: If the payload is valid JSON but not a list of filters
     """
+    try:
+        parsed = orjson.loads(filters)
+    except orjson.JSONDecodeError as e:
+        raise ValueError("Invalid filters JSON payload") from e
+    if not isinstance(parsed, list):
+        raise TypeError("Invalid filters JSON payload: expected a list of filters")
+
+    try:
+        where_clause, params = build_where_clause(parsed)
+    except (AttributeError, TypeError) as e:
+        raise ValueError("Invalid filters JSON payload: each filter must be an object with column, op and value") from e
+
+    # Params are returned as a tuple so the cached value can't be mutated by callers
+    return where_clause, tuple(params)
 
-    schema_map = {col.name: col.data_type for col in schema_definition}
-    required_cols = {col.name for col in schema_definition if not col.nullable}
 
-    audit_columns = {"record_uuid", "is_deleted", "inserted_at", "inserted_by", "updated_at", "updated_by", "deleted_at", "deleted_by"}
+async def _has_column(table_path: str, column: str, warehouse_id: str) -> bool:
+    try:
+        return column in await _table_columns(table_path, warehouse_id)
+    except Exception:
+        return False
 
-    expected_schema = [
-        {
-            "name": col.name,
-            "type": col.data_type,
-            "nullable": col.nullable
-        }
-        for col in schema_definition
+
+def _create_table_sql(table_path: str, schema_definition: list) -> str:
+    """Build the CREATE TABLE statement for a schema definition plus the required audit columns."""
+
+    column_defs = [
+        f"{col.name} {col.data_type}{'' if col.nullable else ' NOT NULL'}" for col in schema_definition
     ]
+    column_defs.append(_AUDIT_COLUMN_DEFS_SQL)
 
-    for idx, record in enumerate(data):
-        missing_cols = required_cols - set(record.keys())
-        if missing_cols:
-            error_msg = f"Record {idx} missing required columns: {missing_cols}"
-            raise ValueError(f"{error_msg}||SCHEMA||{expected_schema}")
+    columns_sql = ", ".join(column_defs)
+    return f"CREATE TABLE IF NOT EXISTS {table_path} ({columns_sql})"
 
-        unknown_cols = set(record.keys()) - set(schema_map.keys()) - audit_columns
-        if unknown_cols:
-            error_msg = f"Record {idx} contains unknown columns: {unknown_cols}"
-            raise ValueError(f"{error_msg}||SCHEMA||{expected_schema}")
 
-        for col_name, col_value in record.items():
-            if col_name in schema_map and col_value is not None:
-                expected_type = schema_map[col_name]
-                try:
-                    _validate_value_type(col_name, col_value, expected_type, idx)
-                except ValueError as e:
-                    raise ValueError(f"{str(e)}||SCHEMA||{expected_schema}") from e
+async def _create_resources(
+    catalog: str, schema: str, table_path: str, schema_definition: list, warehouse_id: str
+) -> None:
+    """Create the catalog, schema and table if missing, submitting the DDL as one batch."""
+    statements = [
+        f"CREATE CATALOG IF NOT EXISTS {catalog}",
+        f"CREATE SCHEMA IF NOT EXISTS {catalog}.{schema}",
+        _create_table_sql(table_path, schema_definition),
+    ]
 
+    await db_connector.aexecute_batch(statements, warehouse_id=warehouse_id)
+    _invalidate_table_metadata(table_path, warehouse_id)
 
-def _validate_value_type(col_name: str, value: Any, expected_type: str, record_idx: int) -> None:
-    """Validate that a value matches the expected SQL type."""
-    type_upper = expected_type.upper()
 
-    if type_upper in ("BIGINT", "INT", "INTEGER", "SMALLINT", "TINYINT"):
-        if not isinstance(value, int):
-            raise ValueError(f"Record {record_idx}: Column '{col_name}' expects integer, got {type(value).__name__}")
+def _prepare_rows(data: list[dict], schema_definition: list | None, defaults: dict[str, Any]) -> Iterator[dict]:
+    """Validate each record against the schema (if given) and merge in audit defaults, in one pass.
 
-    elif type_upper in ("DOUBLE", "FLOAT", "DECIMAL"):
-        if not isinstance(value, (int, float)):
-            raise ValueError(f"Record {record_idx}: Column '{col_name}' expects numeric, got {type(value).__name__}")
+    Caller-supplied values win over the defaults; record_uuid is generated when missing.
 
-    elif type_upper in ("STRING", "VARCHAR", "CHAR"):
-        if not isinstance(value, str):
-            raise ValueError(f"Record {record_idx}: Column '{col_name}' expects string, got {type(value).__name__}")
+    Raises: \n
+        ValueError: If validation fails. The exception includes the expected schema
+                   information in its string representation for error responses.
+    """
 
-    elif type_upper == "BOOLEAN":
-        if not isinstance(value, bool):
-            raise ValueError(f"Record {record_idx}: Column '{col_name}' expects boolean, got {type(value).__name__}")
+    checkers = []
+    required_cols: frozenset[str] = frozenset()
+    allowed_cols: frozenset[str] | None = None
+    expected_schema: list[dict[str, Any]] = []
+
+    if schema_definition:
+        # Compile the schema once: (name, accepted types, label, reject bool) per typed column
+        for col in schema_definition:
+            # data_type is already normalised to an upper-case SQLDataType literal by the model
+            type_check = _TYPE_CHECKS.get(col.data_type)
+            if type_check is not None:
+                types, label = type_check
+                checkers.append((col.name, types, label, bool not in types))
+
+        required_cols = frozenset(col.name for col in schema_definition if not col.nullable)
+        allowed_cols = frozenset(col.name for col in schema_definition) | AUDIT_COLUMNS
+
+        expected_schema = [
+            {
+                "name": col.name,
+                "type": col.data_type,
+                "nullable": col.nullable
+            }
+            for col in schema_definition
+        ]
 
-    elif type_upper in ("DATE", "TIMESTAMP"):
-        if not isinstance(value, (str, datetime)):
-            raise ValueError(f"Record {record_idx}: Column '{col_name}' expects date/timestamp string, got {type(value).__name__}")
+    for idx, record in enumerate(data):
+        if allowed_cols is not None:
+            # dict_keys supports set operations directly, so no per-record set() copies
+            keys = record.keys()
+            if not required_cols <= keys:
+                missing_cols = set(required_cols - keys)
+                error_msg = f"Record {idx} missing required columns: {missing_cols}"
+                raise ValueError(f"{error_msg}||SCHEMA||{expected_schema}")
+
+            unknown_cols = keys - allowed_cols
+            if unknown_cols:
+                error_msg = f"Record {idx} contains unknown columns: {unknown_cols}"
+                raise ValueError(f"{error_msg}||SCHEMA||{expected_schema}")
+
+            for col_name, types, label, reject_bool in checkers:
+                value = record.get(col_name)
+                # bool is a subclass of int, so booleans are only accepted by BOOLEAN columns
+                if value is not None and (not isinstance(value, types) or (reject_bool and type(value) is bool)):
+                    error_msg = f"Record {idx}: Column '{col_name}' expects {label}, got {type(value).__name__}"
+                    raise ValueError(f"{error_msg}||SCHEMA||{expected_schema}")
+
+        if "record_uuid" in record:
+            yield {**defaults, **record}
+        else:
+            yield {**defaults, "record_uuid": str(uuid4()), **record}
 
 
-@router.get("/read", response_model=TableResponse)
+@router.get("/read", response_model=TableResponse, response_class=RecordsJSONResponse)
 async def read_records(
     catalog: str,
     schema: str,
@@ -197,6 +364,7 @@ async def read_records(
     offset: int = 0,
     columns: str = "*",
     filters: str | None = None,
+    include_total: bool = False,
     settings=Depends(get_settings),
 ):
     """
@@ -214,25 +382,29 @@ async def read_records(
         table: The records table name
         limit: Maximum number of records to return (default: 100)
         offset: Number of records to skip for pagination (default: 0)
-        columns: Comma-separated list of columns to retrieve (default: "*")
+        columns: Comma-separated list of columns to retrieve (default: "*", all non-audit columns)
         filters: Optional JSON string with structured filters, e.g., '[{"column": "status", "op": "=", "value": "completed"}]'
+        include_total: Also count all matching records and return it as total (default: false)
         settings: Application settings (injected)
 
     Returns: \n
-        TableResponse containing the retrieved records data and count
+        TableResponse containing the retrieved records data, count and (if requested) total.
+        While the warehouse circuit breaker is open, the page last served for the same
+        arguments (within READ_FALLBACK_TTL_SECONDS) is returned with an X-Degraded: true header.
 
     Raises: \n
         ConfigurationError: If the SQL warehouse ID is not configured
-        DatabaseError: If identifier validation fails or the query operation fails
+        ValidationError: If an identifier or requested column is invalid
+        DatabaseError: If the query operation fails
+        ServiceUnavailableError: If the warehouse circuit breaker is open and no recent page can be replayed
+        TooManyRequestsError: If every pooled warehouse connection stays busy past the acquire timeout
     """
     warehouse_id = settings.databricks_warehouse_id
     if not warehouse_id:
         raise ConfigurationError(message="SQL warehouse ID not configured")
 
     try:
-        _validate_identifier(catalog)
-        _validate_identifier(schema)
-        _validate_identifier(table)
+        table_path = _validated_table_path(catalog, schema, table)
     except ValueError as ve:
         raise ValidationError(message=str(ve)) from ve
 
@@ -240,41 +412,62 @@ async def read_records(
         catalog=catalog, schema=schema, table=table, limit=limit, offset=offset, columns=columns, filters=None
     )
 
-    table_path = _table_path(params.catalog, params.schema_name, params.table)
+    try:
+        known_columns = await _table_columns(table_path, warehouse_id)
+    except Exception:
+        known_columns = ()
+
+    try:
+        select_list = _projection(params.columns, known_columns)
+    except ValueError as ve:
+        raise ValidationError(message=str(ve)) from ve
 
-    has_is_deleted = _has_column(table_path, "is_deleted", warehouse_id)
+    has_is_deleted = "is_deleted" in known_columns
 
-    user_filters: list[dict[str, Any]] | None = None
     if filters:
         try:
-            parsed = json.loads(filters)
-            if isinstance(parsed, list):
-                user_filters = parsed
-        except Exception as e:
-            raise DatabaseError(message="Invalid filters JSON payload") from e
+            where_clause, filter_params = _parse_filters(filters)
+        except (ValueError, TypeError) as ve:
+            raise ValidationError(message=str(ve)) from ve
+    else:
+        where_clause, filter_params = "", ()
 
+    params_list = list(filter_params)
     if has_is_deleted:
-        deleted_filter = {"column": "is_deleted", "op": "=", "value": False}
-        if user_filters:
-            user_filters.append(deleted_filter)
-        else:
-            user_filters = [deleted_filter]
-
-    where_clause, params_list = build_where_clause(user_filters)
+        where_clause = f"{where_clause} AND is_deleted = ?" if where_clause else "WHERE is_deleted = ?"
+        params_list.append(False)
 
-    sql_query = f"SELECT {params.columns} FROM {table_path} {where_clause} LIMIT {params.limit} OFFSET {params.offset}"
+    sql_query = f"SELECT {select_list} FROM {table_path} {where_clause} LIMIT {params.limit} OFFSET {params.offset}"
+    # Keyed on the request arguments: the SQL itself changes when DESCRIBE fails along with the warehouse
+    fallback_key = (warehouse_id, table_path, params.columns, filters, params.limit, params.offset, include_total)
 
     try:
-        results = db_connector.query(sql_query, warehouse_id=warehouse_id, params=params_list, as_dict=True)
-
-        import pandas as _pd
-
-        if isinstance(results, _pd.DataFrame):
-            data_list = results.to_dict(orient="records")
+        if include_total:
+            # Run the count alongside the page so latency is max(data, count), not the sum
+            count_query = f"SELECT COUNT(*) as cnt FROM {table_path} {where_clause}"
+            data_list, count_result = await asyncio.gather(
+                db_connector.aquery(sql_query, warehouse_id=warehouse_id, params=params_list, as_dict=True),
+                db_connector.aquery(count_query, warehouse_id=warehouse_id, params=params_list, as_dict=True),
+            )
+            total = int(count_result[0]["cnt"]) if count_result else 0
         else:
-            data_list = results
-
-        return TableResponse(data=data_list, count=len(data_list), total=None)
+            data_list = await db_connector.aquery(sql_query, warehouse_id=warehouse_id, params=params_list, as_dict=True)
+            total = None
+
+        # Rows are already plain dicts; skip re-validating them through TableResponse
+        payload = {"data": data_list, "count": len(data_list), "total": total}
+        # Encode before remembering the page, so a row that can't be serialised fails with a 500
+        # here and is never replayed
+        response = RecordsJSONResponse(payload)
+        _remember_read_page(fallback_key, payload)
+        return response
+    except db_connector.CircuitOpenError as e:
+        cached = _last_good_read_page(fallback_key)
+        if cached is not None:
+            return RecordsJSONResponse(cached, headers={"X-Degraded": "true"})
+        raise ServiceUnavailableError(message=str(e)) from e
+    except db_connector.PoolTimeoutError as e:
+        raise TooManyRequestsError(message=str(e)) from e
     except Exception as e:
         raise DatabaseError(message=f"Failed to query records table: {e}") from e
 
@@ -308,97 +501,98 @@ async def write_records(request: TableInsertRequest, settings=Depends(get_settin
             - data: Records to insert
             - auto_create: Whether to auto-create table (default: False)
             - schema_definition: Required when auto_create=true, defines table columns
+            - return_data: Whether to echo the inserted records back (default: False)
         settings: Application settings (injected)
 
     Returns: \n
-        TableResponse containing the inserted records data and count of records inserted
+        TableResponse containing the count of records inserted, plus the inserted records
+        (with audit fields) when return_data=true
 
     Raises: \n
         ConfigurationError: If the SQL warehouse ID is not configured
         DatabaseError: If identifier validation fails, schema validation fails, or insert operation fails
+        ServiceUnavailableError: If the warehouse circuit breaker is open
+        TooManyRequestsError: If every pooled warehouse connection stays busy past the acquire timeout
     """
     warehouse_id = settings.databricks_warehouse_id
     if not warehouse_id:
         raise ConfigurationError(message="SQL warehouse ID not configured")
 
     try:
-        _validate_identifier(request.catalog)
-        _validate_identifier(request.schema_name)
-        _validate_identifier(request.table)
+        table_path = _validated_table_path(request.catalog, request.schema_name, request.table)
     except ValueError as ve:
         raise ValidationError(message=str(ve)) from ve
 
-    table_path = _table_path(request.catalog, request.schema_name, request.table)
+    # Nothing to insert (e.g. a client retry): skip DDL and validation round trips
+    if not request.data:
+        return TableResponse(data=[], count=0, total=0)
 
     if request.auto_create:
         try:
-            _create_catalog_if_not_exists(request.catalog, warehouse_id)
-
-            _create_schema_if_not_exists(request.catalog, request.schema_name, warehouse_id)
+            if not request.schema_definition:
+                raise DatabaseError(message="schema_definition is required when creating a new table")
 
-            if not _table_exists(table_path, warehouse_id):
-                if not request.schema_definition:
-                    raise DatabaseError(message="schema_definition is required when creating a new table")
-                _create_table_from_schema(table_path, request.schema_definition, warehouse_id)
+            await _create_resources(
+                request.catalog, request.schema_name, table_path, request.schema_definition, warehouse_id
+            )
 
+        except db_connector.CircuitOpenError as e:
+            raise ServiceUnavailableError(message=str(e)) from e
+        except db_connector.PoolTimeoutError as e:
+            raise TooManyRequestsError(message=str(e)) from e
         except DatabaseError:
             raise
         except Exception as e:
             raise DatabaseError(message=f"Failed to auto-create resources: {e}") from e
 
-    if request.schema_definition:
-        try:
-            _validate_data_against_schema(request.data, request.schema_definition)
-        except DatabaseError:
-            raise
-        except Exception as e:
-            error_str = str(e)
-            error_details = {}
-
-            if "||SCHEMA||" in error_str:
-                error_msg, schema_part = error_str.split("||SCHEMA||", 1)
-                try:
-                    import ast
-                    error_details["expected_schema"] = ast.literal_eval(schema_part)
-                except Exception:
-                    pass
-            else:
-                error_msg = error_str
-
-            raise ValidationError(
-                message=f"Schema validation failed: {error_msg}",
-                details=error_details if error_details else None
-            ) from e
-
-    inserted_by = os.getenv("DATABRICKS_USER") or os.getenv("DATABRICKS_CONFIG_PROFILE") or "api"
-    now = datetime.now(UTC).isoformat()
-    rows = []
-    for r in request.data:
-        rec = dict(r)
-        if "record_uuid" not in rec:
-            from uuid import uuid4
-            rec["record_uuid"] = str(uuid4())
-        if "inserted_at" not in rec:
-            rec["inserted_at"] = now
-        if "inserted_by" not in rec:
-            rec["inserted_by"] = inserted_by
-        if "updated_at" not in rec:
-            rec["updated_at"] = now
-        if "updated_by" not in rec:
-            rec["updated_by"] = inserted_by
-        if "is_deleted" not in rec:
-            rec["is_deleted"] = False
-        if "deleted_at" not in rec:
-            rec["deleted_at"] = None
-        if "deleted_by" not in rec:
-            rec["deleted_by"] = None
-        rows.append(rec)
+    now = _now_iso()
+    user = _audit_user()
+    defaults = {
+        "inserted_at": now,
+        "inserted_by": user,
+        "updated_at": now,
+        "updated_by": user,
+        "is_deleted": False,
+        "deleted_at": None,
+        "deleted_by": None,
+    }
+
+    try:
+        rows = list(_prepare_rows(request.data, request.schema_definition, defaults))
+    except ValueError as e:
+        error_str = str(e)
+        error_details = {}
+
+        if "||SCHEMA||" in error_str:
+            error_msg, schema_part = error_str.split("||SCHEMA||", 1)
+            try:
+                import ast
+                error_details["expected_schema"] = ast.literal_eval(schema_part)
+            except Exception:
+                pass
+        else:
+            error_msg = error_str
+
+        raise ValidationError(
+            message=f"Schema validation failed: {error_msg}",
+            details=error_details if error_details else None
+        ) from e
 
     try:
-        inserted = db_connector.insert_data(table_path=table_path, data=rows, warehouse_id=warehouse_id)
-        if inserted < 0:
-            inserted = len(rows)
-        return TableResponse(data=rows, count=inserted, total=inserted)
+        if settings.databricks_staging_volume and len(rows) >= BULK_LOAD_MIN_ROWS:
+            await db_connector.abulk_load(
+                table_path=table_path,
+                data=rows,
+                warehouse_id=warehouse_id,
+                staging_volume=settings.databricks_staging_volume,
+            )
+        else:
+            await db_connector.ainsert_data(table_path=table_path, data=rows, warehouse_id=warehouse_id)
+        return TableResponse(data=rows if request.return_data else [], count=len(rows), total=len(rows))
+    except db_connector.CircuitOpenError as e:
+        raise ServiceUnavailableError(message=str(e)) from e
+    except db_connector.PoolTimeoutError as e:
+        raise TooManyRequestsError(message=str(e)) from e
     except Exception as e:
         raise DatabaseError(message=f"Failed to insert into records table: {e}") from e
 
@@ -430,26 +624,25 @@ async def update_records(request: TableUpdateRequest, settings=Depends(get_setti
     Raises: \n
         ConfigurationError: If the SQL warehouse ID is not configured
         DatabaseError: If identifier validation fails or the update operation fails
+        ServiceUnavailableError: If the warehouse circuit breaker is open
+        TooManyRequestsError: If every pooled warehouse connection stays busy past the acquire timeout
     """
     warehouse_id = settings.databricks_warehouse_id
     if not warehouse_id:
         raise ConfigurationError(message="SQL warehouse ID not configured")
 
+    catalog = request.catalog or os.getenv("DATABRICKS_CATALOG")
+    schema = request.schema_name or os.getenv("DATABRICKS_SCHEMA")
+
     try:
-        _validate_identifier(request.catalog or "default_catalog")
-        _validate_identifier(request.schema_name or "default_schema")
-        _validate_identifier(request.table)
+        table_path = _validated_table_path(catalog, schema, request.table)
         if request.key_column:
             _validate_identifier(request.key_column)
     except ValueError as ve:
         raise DatabaseError(message=str(ve)) from ve
 
-    catalog = request.catalog or os.getenv("DATABRICKS_CATALOG")
-    schema = request.schema_name or os.getenv("DATABRICKS_SCHEMA")
-    table_path = _table_path(catalog, schema, request.table)
-
-    now = datetime.now(UTC).isoformat()
-    updated_by = os.getenv("DATABRICKS_USER") or os.getenv("DATABRICKS_CONFIG_PROFILE") or "api"
+    now = _now_iso()
+    updated_by = _audit_user()
 
     try:
         total_updated = 0
@@ -457,7 +650,7 @@ async def update_records(request: TableUpdateRequest, settings=Depends(get_setti
 
         if request.key_value is not None:
             check_query = f"SELECT COUNT(*) as count FROM {table_path} WHERE {request.key_column} = ?"
-            check_result = db_connector.query(check_query, warehouse_id=warehouse_id, params=[request.key_value], as_dict=True)
+            check_result = await db_connector.aquery(check_query, warehouse_id=warehouse_id, params=[request.key_value], as_dict=True)
             if check_result and check_result[0].get("count", 0) > 0:
                 updates = dict(request.updates)
                 updates["updated_at"] = now
@@ -474,16 +667,16 @@ async def update_records(request: TableUpdateRequest, settings=Depends(get_setti
                 set_sql = ", ".join(set_clauses)
                 sql_query = f"UPDATE {table_path} SET {set_sql} WHERE {request.key_column} = ?"
 
-                db_connector.query(sql_query, warehouse_id=warehouse_id, params=params)
+                await db_connector.aquery(sql_query, warehouse_id=warehouse_id, params=params)
                 total_updated = 1
             else:
                 total_updated = 0
                 not_found.append(request.key_value)
 
         elif request.key_values is not None:
-            placeholders_check = ", ".join(["?"] * len(request.key_values))
+            placeholders_check = _qmarks(len(request.key_values))
             check_query = f"SELECT {request.key_column} FROM {table_path} WHERE {request.key_column} IN ({placeholders_check})"
-            existing_records = db_connector.query(check_query, warehouse_id=warehouse_id, params=list(request.key_values), as_dict=True)
+            existing_records = await db_connector.aquery(check_query, warehouse_id=warehouse_id, params=list(request.key_values), as_dict=True)
 
             existing_keys = [record[request.key_column] for record in existing_records] if existing_records else []
             existing_count = len(existing_keys)
@@ -504,23 +697,32 @@ async def update_records(request: TableUpdateRequest, settings=Depends(get_setti
                     set_clauses.append(f"{k} = ?")
                     params_multi.append(v)
 
-                placeholders = ", ".join(["?"] * len(request.key_values))
+                placeholders = _qmarks(len(request.key_values))
                 params_multi.extend(request.key_values)
 
                 set_sql = ", ".join(set_clauses)
                 sql_query = f"UPDATE {table_path} SET {set_sql} WHERE {request.key_column} IN ({placeholders})"
 
-                db_connector.query(sql_query, warehouse_id=warehouse_id, params=params_multi)
+                await db_connector.aquery(sql_query, warehouse_id=warehouse_id, params=params_multi)
                 total_updated = existing_count
             else:
                 total_updated = 0
                 not_found = list(request.key_values)
 
         elif request.bulk_updates is not None:
-            for item in request.bulk_updates:
-                check_query = f"SELECT COUNT(*) as count FROM {table_path} WHERE {request.key_column} = ?"
-                check_result = db_connector.query(check_query, warehouse_id=warehouse_id, params=[item.key_value], as_dict=True)
-                if check_result and check_result[0].get("count", 0) > 0:
+            # Each item is an independent check + update pair, so run them concurrently
+            # while capping how many statements hit the warehouse at once.
+            semaphore = asyncio.Semaphore(BULK_UPDATE_CONCURRENCY)
+
+            async def _apply_one(item: BulkUpdateItem) -> bool:
+                async with semaphore:
+                    check_query = f"SELECT COUNT(*) as count FROM {table_path} WHERE {request.key_column} = ?"
+                    check_result = await db_connector.aquery(
+                        check_query, warehouse_id=warehouse_id, params=[item.key_value], as_dict=True
+                    )
+                    if not (check_result and check_result[0].get("count", 0) > 0):
+                        return False
+
                     updates = dict(item.updates)
                     updates["updated_at"] = now
                     updates["updated_by"] = updated_by
@@ -536,7 +738,16 @@ async def update_records(request: TableUpdateRequest, settings=Depends(get_setti
                     set_sql = ", ".join(set_clauses)
                     sql_query = f"UPDATE {table_path} SET {set_sql} WHERE {request.key_column} = ?"
 
-                    db_connector.query(sql_query, warehouse_id=warehouse_id, params=params_bulk)
+                    await db_connector.aquery(sql_query, warehouse_id=warehouse_id, params=params_bulk)
+                    return True
+
+            results = await asyncio.gather(
+                *[_apply_one(item) for item in request.bulk_updates], return_exceptions=True
+            )
+            for item, result in zip(request.bulk_updates, results, strict=True):
+                if isinstance(result, BaseException):
+                    raise result
+                if result:
                     total_updated += 1
                 else:
                     not_found.append(item.key_value)
@@ -559,7 +770,7 @@ async def update_records(request: TableUpdateRequest, settings=Depends(get_setti
             set_sql = ", ".join(set_clauses)
             sql_query = f"UPDATE {table_path} SET {set_sql} WHERE {where_clause}"
 
-            db_connector.query(sql_query, warehouse_id=warehouse_id, params=params_filter)
+            await db_connector.aquery(sql_query, warehouse_id=warehouse_id, params=params_filter)
             total_updated = -1
 
         response_data: dict[str, Any] = {"updated_at": now, "updated_by": updated_by}
@@ -571,6 +782,10 @@ async def update_records(request: TableUpdateRequest, settings=Depends(get_setti
             count=total_updated,
             total=None
         )
+    except db_connector.CircuitOpenError as e:
+        raise ServiceUnavailableError(message=str(e)) from e
+    except db_connector.PoolTimeoutError as e:
+        raise TooManyRequestsError(message=str(e)) from e
     except Exception as e:
         raise DatabaseError(message=f"Failed to update records table: {e}") from e
 
@@ -608,26 +823,25 @@ async def delete_records(request: TableDeleteRequest, settings=Depends(get_setti
     Raises: \n
         ConfigurationError: If the SQL warehouse ID is not configured
         DatabaseError: If identifier validation fails or the delete operation fails
+        ServiceUnavailableError: If the warehouse circuit breaker is open
+        TooManyRequestsError: If every pooled warehouse connection stays busy past the acquire timeout
     """
     warehouse_id = settings.databricks_warehouse_id
     if not warehouse_id:
         raise ConfigurationError(message="SQL warehouse ID not configured")
 
+    catalog = request.catalog or os.getenv("DATABRICKS_CATALOG")
+    schema = request.schema_name or os.getenv("DATABRICKS_SCHEMA")
+
     try:
-        _validate_identifier(request.catalog or "default_catalog")
-        _validate_identifier(request.schema_name or "default_schema")
-        _validate_identifier(request.table)
+        table_path = _validated_table_path(catalog, schema, request.table)
         if request.key_column:
             _validate_identifier(request.key_column)
     except ValueError as ve:
         raise DatabaseError(message=str(ve)) from ve
 
-    catalog = request.catalog or os.getenv("DATABRICKS_CATALOG")
-    schema = request.schema_name or os.getenv("DATABRICKS_SCHEMA")
-    table_path = _table_path(catalog, schema, request.table)
-
     if request.soft:
-        has_is_deleted = _has_column(table_path, "is_deleted", warehouse_id)
+        has_is_deleted = await _has_column(table_path, "is_deleted", warehouse_id)
         if not has_is_deleted:
             raise DatabaseError(
                 message=f"Soft delete requested but table {table_path} does not have 'is_deleted' column. "
@@ -637,12 +851,12 @@ async def delete_records(request: TableDeleteRequest, settings=Depends(get_setti
     try:
         total_deleted = 0
         not_found_keys = []
-        now = datetime.now(UTC).isoformat()
-        deleted_by = os.getenv("DATABRICKS_USER") or os.getenv("DATABRICKS_CONFIG_PROFILE") or "api"
+        now = _now_iso()
+        deleted_by = _audit_user()
 
         if request.key_value is not None:
             check_query = f"SELECT COUNT(*) as cnt FROM {table_path} WHERE {request.key_column} = ?"
-            count_result = db_connector.query(check_query, warehouse_id=warehouse_id, params=[request.key_value], as_dict=True)
+            count_result = await db_connector.aquery(check_query, warehouse_id=warehouse_id, params=[request.key_value], as_dict=True)
             record_exists = count_result[0]["cnt"] > 0 if count_result else False
 
             if not record_exists:
@@ -650,21 +864,21 @@ async def delete_records(request: TableDeleteRequest, settings=Depends(get_setti
                 total_deleted = 0
             else:
                 if request.soft:
-                    sql_query = f"UPDATE {table_path} SET is_deleted = true, deleted_at = ?, deleted_by = ?, updated_at = ?, updated_by = ? WHERE {request.key_column} = ?"
+                    sql_query = f"UPDATE {table_path} SET {_SOFT_DELETE_SET_SQL} WHERE {request.key_column} = ?"
                     params = [now, deleted_by, now, deleted_by, request.key_value]
                 else:
                     # Hard delete single record
                     sql_query = f"DELETE FROM {table_path} WHERE {request.key_column} = ?"
                     params = [request.key_value]
 
-                db_connector.query(sql_query, warehouse_id=warehouse_id, params=params)
+                await db_connector.aquery(sql_query, warehouse_id=warehouse_id, params=params)
                 total_deleted = 1
 
         elif request.key_values is not None:
-            placeholders = ", ".join(["?"] * len(request.key_values))
+            placeholders = _qmarks(len(request.key_values))
 
             check_query = f"SELECT {request.key_column} FROM {table_path} WHERE {request.key_column} IN ({placeholders})"
-            existing_records = db_connector.query(check_query, warehouse_id=warehouse_id, params=list(request.key_values), as_dict=True)
+            existing_records = await db_connector.aquery(check_query, warehouse_id=warehouse_id, params=list(request.key_values), as_dict=True)
 
             existing_keys = set()
             if existing_records:
@@ -675,26 +889,26 @@ async def delete_records(request: TableDeleteRequest, settings=Depends(get_setti
             not_found_keys = list(requested_keys - existing_keys)
 
             if request.soft:
-                sql_query = f"UPDATE {table_path} SET is_deleted = true, deleted_at = ?, deleted_by = ?, updated_at = ?, updated_by = ? WHERE {request.key_column} IN ({placeholders})"
+                sql_query = f"UPDATE {table_path} SET {_SOFT_DELETE_SET_SQL} WHERE {request.key_column} IN ({placeholders})"
                 params_multi = [now, deleted_by, now, deleted_by] + list(request.key_values)
             else:
                 sql_query = f"DELETE FROM {table_path} WHERE {request.key_column} IN ({placeholders})"
                 params_multi = list(request.key_values)
 
-            db_connector.query(sql_query, warehouse_id=warehouse_id, params=params_multi)
+            await db_connector.aquery(sql_query, warehouse_id=warehouse_id, params=params_multi)
             total_deleted = len(existing_keys)
 
         elif request.filters is not None:
             where_clause, filter_params = build_where_clause(request.filters)
 
             if request.soft:
-                sql_query = f"UPDATE {table_path} SET is_deleted = true, deleted_at = ?, deleted_by = ?, updated_at = ?, updated_by = ? WHERE {where_clause}"
+                sql_query = f"UPDATE {table_path} SET {_SOFT_DELETE_SET_SQL} WHERE {where_clause}"
                 params_filter = [now, deleted_by, now, deleted_by] + filter_params
             else:
                 sql_query = f"DELETE FROM {table_path} WHERE {where_clause}"
                 params_filter = filter_params
 
-            db_connector.query(sql_query, warehouse_id=warehouse_id, params=params_filter)
+            await db_connector.aquery(sql_query, warehouse_id=warehouse_id, params=params_filter)
             total_deleted = -1
 
         response_data: list[dict[str, Any]] = [{"is_deleted": True}] if request.soft else []
@@ -704,6 +918,10 @@ async def delete_records(request: TableDeleteRequest, settings=Depends(get_setti
 
         return TableResponse(data=response_data, count=total_deleted, total=None)
 
+    except db_connector.CircuitOpenError as e:
+        raise ServiceUnavailableError(message=str(e)) from e
+    except db_connector.PoolTimeoutError as e:
+        raise TooManyRequestsError(message=str(e)) from e
     except DatabaseError:
         raise
     except Exception as e:
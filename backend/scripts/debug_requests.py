@@ -2,8 +2,6 @@ from fastapi.testclient import TestClient
 
 from backend.app import app
 
-client = TestClient(app)
-
 auto_create_example = {
     "catalog": "my_catalog",
     "schema_name": "my_schema",
@@ -29,23 +27,24 @@ endpoints = [
     ("DELETE", "/api/v1/records/delete", {"catalog":"CAT","schema_name":"SCHEMA","table":"records","key_column":"order_id","key_value":1,"soft":True}),
 ]
 
-for method, path, body in endpoints:
-    print('---', method, path)
-    if method == 'GET':
-        r = client.get(path)
-    elif method == 'POST':
-        r = client.post(path, json=body)
-    elif method == 'PUT':
-        r = client.put(path, json=body)
-    elif method == 'DELETE':
-        r = client.request('DELETE', path, json=body)
-    else:
-        continue
-    print('status', r.status_code)
-    try:
-        print('json', r.json())
-    except Exception:
-        print('text', r.text)
+with TestClient(app) as client:
+    for method, path, body in endpoints:
+        print('---', method, path)
+        if method == 'GET':
+            r = client.get(path)
+        elif method == 'POST':
+            r = client.post(path, json=body)
+        elif method == 'PUT':
+            r = client.put(path, json=body)
+        elif method == 'DELETE':
+            r = client.request('DELETE', path, json=body)
+        else:
+            continue
+        print('status', r.status_code)
+        try:
+            print('json', r.json())
+        except Exception:
+            print('text', r.text)
 
 print('done')
 
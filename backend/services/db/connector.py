@@ -5,15 +5,75 @@ This module provides functions to connect to Databricks SQL warehouses
 and execute queries against Unity Catalog tables.
 """
 
-from functools import lru_cache
-from typing import Any
-
+import asyncio
+import io
+import os
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from functools import lru_cache, partial
+from itertools import repeat
+from typing import Any, Literal, overload
+from uuid import uuid4
+
+import orjson
 import pandas as pd
 from databricks import sql
+from databricks.sdk import WorkspaceClient
 from databricks.sdk.core import Config
 
+from .sql_helpers import _qmarks
+
 _cfg: Config | None = None
 
+# Worker threads for running blocking warehouse calls off the event loop
+QUERY_EXECUTOR_MAX_WORKERS = 32
+
+# Maximum rows per INSERT ... VALUES statement issued by insert_data
+INSERT_BATCH_ROWS = 500
+
+# Databricks SQL rejects statements with more bind parameters than this
+MAX_STATEMENT_PARAMS = 256
+
+# Maximum open connections per warehouse
+POOL_MAX_SIZE = int(os.getenv("DATABRICKS_POOL_MAX_SIZE", "8"))
+
+# Connections opened per warehouse at startup so first requests skip the handshake
+POOL_MIN_SIZE = int(os.getenv("DATABRICKS_POOL_MIN_SIZE", "0"))
+
+# Seconds between keepalive pings of idle pooled connections
+POOL_KEEPALIVE_SECONDS = 60.0
+
+# Seconds to wait for a free pooled connection before giving up
+POOL_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("DATABRICKS_POOL_ACQUIRE_TIMEOUT", "2"))
+
+# Async calls per warehouse allowed to wait for a connection beyond the ones using the pool;
+# further calls are rejected on the event loop instead of queueing for an executor thread
+POOL_MAX_QUEUED = int(os.getenv("DATABRICKS_POOL_MAX_QUEUED", str(POOL_MAX_SIZE)))
+
+# Idle connections older than this are pinged with SELECT 1 before being handed out
+POOL_PING_AFTER_SECONDS = 30.0
+
+# Consecutive failed warehouse calls that open a warehouse's circuit breaker
+BREAKER_FAIL_MAX = int(os.getenv("DATABRICKS_BREAKER_FAIL_MAX", "5"))
+
+# Seconds an open circuit rejects calls before letting a trial call through
+BREAKER_RESET_SECONDS = float(os.getenv("DATABRICKS_BREAKER_RESET_SECONDS", "30"))
+
+# Attempts query() makes when the warehouse connection fails transiently
+QUERY_RETRY_ATTEMPTS = 3
+
+# Upper bound of the first retry's random backoff; doubles on each further retry
+QUERY_RETRY_BASE_DELAY_SECONDS = 0.01
+
+# Cap on the random backoff between query() retries
+QUERY_RETRY_MAX_DELAY_SECONDS = 0.1
+
+_executor = ThreadPoolExecutor(max_workers=QUERY_EXECUTOR_MAX_WORKERS, thread_name_prefix="db-query")
+
 
 def _get_config() -> Config | None:
     global _cfg
@@ -26,11 +86,12 @@ def _get_config() -> Config | None:
     return _cfg
 
 
-@lru_cache(maxsize=1)
 def get_connection(warehouse_id: str):
     """
-    Get or create a connection to the Databricks SQL warehouse.
-    Connection is cached using lru_cache to avoid creating multiple connections.
+    Open a new connection to the Databricks SQL warehouse.
+
+    Callers should normally go through the warehouse's ConnectionPool (see
+    _pool_for) rather than opening connections directly.
 
     Args:
         warehouse_id: The ID of the SQL warehouse to connect to
@@ -52,12 +113,306 @@ def get_connection(warehouse_id: str):
     )
 
 
+def _close_quietly(conn: Any) -> None:
+    with suppress(Exception):
+        conn.close()
+
+
+class ConnectorError(Exception):
+    """Raised when a warehouse call fails; the driver's error is chained as __cause__."""
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of contacting a warehouse whose circuit breaker is open."""
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection frees up in time; not retried, the pool is saturated."""
+
+
+# Network-level failures worth another attempt on a fresh connection. The driver raises its
+# own RequestError/OperationalError without chaining the socket error, so both are listed.
+_TRANSIENT_ERRORS = (ConnectionError, TimeoutError, sql.exc.RequestError, sql.exc.OperationalError)
+
+
+# Errors raised for a bad statement: the warehouse answered, so they don't count as outages
+_STATEMENT_ERRORS = (
+    sql.exc.ServerOperationError,
+    sql.exc.ProgrammingError,
+    sql.exc.IntegrityError,
+    sql.exc.DataError,
+)
+
+
+def _is_statement_error(exc: BaseException | None) -> bool:
+    while exc is not None:
+        if isinstance(exc, _STATEMENT_ERRORS):
+            return True
+        exc = exc.__cause__
+    return False
+
+
+def _is_transient_error(exc: BaseException | None) -> bool:
+    while exc is not None:
+        if isinstance(exc, PoolTimeoutError):
+            return False
+        if isinstance(exc, _TRANSIENT_ERRORS):
+            return True
+        exc = exc.__cause__
+    return False
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a warehouse keeps failing.
+
+    Closed, the breaker counts consecutive failures; at fail_max it opens and rejects
+    calls for reset_seconds. After that a single trial call is let through (half-open):
+    success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, fail_max: int, reset_seconds: float):
+        self.fail_max = fail_max
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> Literal["closed", "open", "half-open"]:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial_running or time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Return whether a call may go to the warehouse; claims the trial call when half-open."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running or time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            self._trial_running = True
+            return True
+
+    def record(self, exc: BaseException | None, will_retry: bool = False) -> None:
+        """
+        Record the outcome of an allowed call; exc is None on success.
+
+        A failure the caller is about to retry is not counted, so a retried call costs at
+        most one failure; a failed trial call still re-opens the circuit.
+        """
+        with self._lock:
+            if exc is None or _is_statement_error(exc):
+                self._failures = 0
+                self._opened_at = None
+            elif self._trial_running or not will_retry:
+                self._failures += 1
+                if self._trial_running or self._failures >= self.fail_max:
+                    self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class ConnectionPool:
+    """
+    Bounded pool of connections to one SQL warehouse.
+
+    Idle connections are reused LIFO, so the most recently used (warmest) connection
+    is handed out first and surplus ones age out. Connections that sat idle longer
+    than POOL_PING_AFTER_SECONDS are pinged before reuse and dropped if dead.
+    Every borrow goes through the warehouse's CircuitBreaker.
+
+    Async callers are admitted on the event loop (see try_admit) before they take an
+    executor thread, so at most max_queued of them ever block waiting for a slot.
+    """
+
+    def __init__(self, warehouse_id: str, max_size: int = POOL_MAX_SIZE, max_queued: int = POOL_MAX_QUEUED):
+        self.warehouse_id = warehouse_id
+        self.max_size = max_size
+        self.max_queued = max_queued
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        # (connection, monotonic time it was returned)
+        self._idle: list[tuple[Any, float]] = []
+        self._closed = False
+        self._admitted = 0
+        self.breaker = CircuitBreaker(BREAKER_FAIL_MAX, BREAKER_RESET_SECONDS)
+
+    def try_admit(self) -> bool:
+        """Claim a place for an async call without blocking; False once max_size + max_queued are taken."""
+        with self._lock:
+            if self._admitted >= self.max_size + self.max_queued:
+                return False
+            self._admitted += 1
+            return True
+
+    def leave(self) -> None:
+        """Give back a place claimed with try_admit."""
+        with self._lock:
+            self._admitted -= 1
+
+    def _is_alive(self, conn: Any) -> bool:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            return True
+        except Exception:
+            return False
+
+    def _checkout(self) -> Any:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, returned_at = self._idle.pop()
+            if time.monotonic() - returned_at < POOL_PING_AFTER_SECONDS or self._is_alive(conn):
+                return conn
+            _close_quietly(conn)
+        return get_connection(self.warehouse_id)
+
+    @contextmanager
+    def acquire(self, retry_transient: bool = False) -> Iterator[Any]:
+        """
+        Borrow a connection for the duration of the with-block.
+
+        Failures inside the with-block count towards the circuit breaker, except transient
+        ones when retry_transient says the caller will try again. The
+        connection is closed rather than returned to the pool unless the failure was
+        a statement error.
+
+        Raises:
+            PoolTimeoutError: If no connection frees up within POOL_ACQUIRE_TIMEOUT_SECONDS
+            CircuitOpenError: If the warehouse's circuit breaker is open
+        """
+        if not self._slots.acquire(timeout=POOL_ACQUIRE_TIMEOUT_SECONDS):
+            raise PoolTimeoutError(f"Timed out waiting for a connection to warehouse {self.warehouse_id}")
+        if not self.breaker.allow():
+            self._slots.release()
+            raise CircuitOpenError(f"Warehouse {self.warehouse_id} is unavailable after repeated failures")
+        try:
+            conn = self._checkout()
+        except BaseException as e:
+            self.breaker.record(e, will_retry=retry_transient and _is_transient_error(e))
+            self._slots.release()
+            raise
+
+        broken = False
+        try:
+            yield conn
+        except BaseException as e:
+            self.breaker.record(e, will_retry=retry_transient and _is_transient_error(e))
+            # Only a rejected statement proves the connection still works; anything else may have killed it
+            broken = not _is_statement_error(e)
+            raise
+        else:
+            self.breaker.record(None)
+        finally:
+            with self._lock:
+                keep = not (self._closed or broken)
+                if keep:
+                    self._idle.append((conn, time.monotonic()))
+            if not keep:
+                _close_quietly(conn)
+            self._slots.release()
+
+    def add_idle(self, connections: list[Any]) -> None:
+        """Hand freshly opened connections to the pool, up to max_size idle ones."""
+        now = time.monotonic()
+        with self._lock:
+            room = 0 if self._closed else self.max_size - len(self._idle)
+            self._idle.extend((conn, now) for conn in connections[:max(room, 0)])
+        for conn in connections[max(room, 0):]:
+            _close_quietly(conn)
+
+    def ping_idle(self) -> None:
+        """Ping idle connections so the warehouse doesn't time them out; drop dead ones."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        alive = []
+        for conn, _ in idle:
+            if self._is_alive(conn):
+                alive.append(conn)
+            else:
+                _close_quietly(conn)
+        self.add_idle(alive)
+
+    def close(self) -> None:
+        """Close idle connections; connections still in use are closed when returned."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_for(warehouse_id: str) -> ConnectionPool:
+    pool = _pools.get(warehouse_id)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(warehouse_id, ConnectionPool(warehouse_id))
+    return pool
+
+
+async def warm_pool(warehouse_id: str, size: int = POOL_MIN_SIZE) -> int:
+    """
+    Open up to `size` connections to the warehouse in parallel and park them in its pool.
+
+    Failures are not raised; the pool simply opens connections on demand later.
+
+    Returns:
+        Number of connections opened
+    """
+    pool = _pool_for(warehouse_id)
+    size = min(size, pool.max_size)
+    if size <= 0:
+        return 0
+    results = await asyncio.gather(
+        *(_run_in_executor(get_connection, warehouse_id) for _ in range(size)),
+        return_exceptions=True,
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    pool.add_idle(opened)
+    return len(opened)
+
+
+def ping_idle_connections() -> None:
+    """Keep idle connections in every pool alive; see ConnectionPool.ping_idle."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.ping_idle()
+
+
 def close_connections():
     """
-    Close all open connections.
+    Close all pooled connections.
     This should be called when shutting down the application.
     """
-    get_connection.cache_clear()
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+@overload
+def query(
+    sql_query: str, warehouse_id: str, as_dict: Literal[True] = ..., params: list[Any] | None = None
+) -> list[dict]: ...
+
+
+@overload
+def query(
+    sql_query: str, warehouse_id: str, as_dict: Literal[False], params: list[Any] | None = None
+) -> pd.DataFrame: ...
 
 
 def query(
@@ -72,36 +427,161 @@ def query(
         as_dict: Whether to return results as dictionaries (True) or pandas DataFrame (False)
 
     Returns:
-        Query results as a list of dictionaries or pandas DataFrame
+        Query results as a list of dictionaries (always, when as_dict=True) or pandas DataFrame.
+
+    Connection and timeout failures are retried up to QUERY_RETRY_ATTEMPTS times with
+    jittered exponential backoff, unless the warehouse's circuit breaker has opened.
+    Other errors fail on the first attempt. A retried call counts as one failure
+    towards the circuit breaker.
 
     Raises:
-        Exception: If the query fails
+        ConnectorError: If the query fails
+    """
+    pool = _pool_for(warehouse_id)
+    attempt = 1
+    while True:
+        try:
+            return _query_once(pool, sql_query, as_dict, params, retry_transient=attempt < QUERY_RETRY_ATTEMPTS)
+        except Exception as e:
+            if attempt >= QUERY_RETRY_ATTEMPTS or not _is_transient_error(e) or pool.breaker.state == "open":
+                raise
+        # Full jitter keeps concurrent callers from retrying in lockstep
+        delay = min(QUERY_RETRY_MAX_DELAY_SECONDS, QUERY_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+        time.sleep(random.uniform(0, delay))
+        attempt += 1
+
+
+def _query_once(
+    pool: ConnectionPool, sql_query: str, as_dict: bool, params: list[Any] | None, retry_transient: bool
+) -> Any:
+    with pool.acquire(retry_transient=retry_transient) as conn:
+        try:
+            with conn.cursor() as cursor:
+                if params:
+                    cursor.execute(sql_query, params)
+                else:
+                    cursor.execute(sql_query)
+
+                result = cursor.fetchall()
+                columns = tuple(col[0] for col in cursor.description)
+
+                if as_dict:
+                    # map/zip keep the per-row dict construction out of interpreted bytecode.
+                    # Rows stay plain dicts: routes mutate, merge and JSON-encode them directly.
+                    return list(map(dict, map(zip, repeat(columns), result)))
+                else:
+                    return pd.DataFrame(result, columns=columns)
+
+        except Exception as e:
+            raise ConnectorError(f"Query failed: {e}") from e
+
+
+async def _run_in_executor(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking connector call on the shared thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+async def _run_admitted(warehouse_id: str, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
     """
-    conn = get_connection(warehouse_id)
+    Run a blocking call against warehouse_id on the shared thread pool, or fail fast.
 
+    Admission is decided on the event loop, so excess load is rejected straight away
+    instead of tying up executor threads that would only block on the pool's slots.
+
+    Raises:
+        PoolTimeoutError: If the warehouse's connections are busy and its queue is full
+    """
+    pool = _pool_for(warehouse_id)
+    if not pool.try_admit():
+        raise PoolTimeoutError(f"Too many calls waiting for a connection to warehouse {warehouse_id}")
     try:
-        with conn.cursor() as cursor:
-            if params:
-                cursor.execute(sql_query, params)
-            else:
-                cursor.execute(sql_query)
+        return await _run_in_executor(func, *args, **kwargs)
+    finally:
+        pool.leave()
 
-            result = cursor.fetchall()
-            columns = [col[0] for col in cursor.description]
 
-            if as_dict:
-                return [dict(zip(columns, row, strict=False)) for row in result]
-            else:
-                return pd.DataFrame(result, columns=columns)
+async def aquery(
+    sql_query: str, warehouse_id: str, as_dict: bool = True, params: list[Any] | None = None
+) -> Any:
+    """
+    Async variant of query() that runs on the connector thread pool so
+    request handlers don't block the event loop for the warehouse round trip.
 
-    except Exception as e:
-        raise Exception(f"Query failed: {str(e)}") from e
+    Args:
+        sql_query: SQL query to execute
+        warehouse_id: The ID of the SQL warehouse to connect to
+        as_dict: Whether to return results as dictionaries (True) or pandas DataFrame (False)
+        params: Optional positional parameters for the query
+
+    Returns:
+        Same as query()
+
+    Raises:
+        PoolTimeoutError: If the warehouse's connections are busy and its queue is full
+        ConnectorError: If the query fails
+    """
+    return await _run_admitted(
+        warehouse_id, query, sql_query, warehouse_id=warehouse_id, as_dict=as_dict, params=params
+    )
+
+
+async def aexecute_batch(statements: list[str], warehouse_id: str) -> None:
+    """Async variant of execute_batch() that runs on the connector thread pool."""
+    await _run_admitted(warehouse_id, execute_batch, statements, warehouse_id=warehouse_id)
+
+
+async def ainsert_data(table_path: str, data: list[dict], warehouse_id: str) -> int:
+    """Async variant of insert_data() that runs on the connector thread pool."""
+    return await _run_admitted(warehouse_id, insert_data, table_path=table_path, data=data, warehouse_id=warehouse_id)
+
+
+def execute_batch(statements: list[str], warehouse_id: str) -> None:
+    """
+    Execute several statements back to back on a single cursor.
+
+    Intended for DDL sequences (e.g. CREATE CATALOG/SCHEMA/TABLE) so they reuse
+    one connection and cursor instead of paying setup cost per statement.
+
+    Args:
+        statements: SQL statements to execute in order
+        warehouse_id: The ID of the SQL warehouse to connect to
+
+    Raises:
+        ConnectorError: If any statement fails; later statements are not executed
+    """
+    if not statements:
+        return
+
+    with _pool_for(warehouse_id).acquire() as conn:
+        try:
+            with conn.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+        except Exception as e:
+            raise ConnectorError(f"Batch execution failed: {e}") from e
+
+
+@lru_cache(maxsize=256)
+def _build_insert_sql(table_path: str, columns: tuple[str, ...], n_rows: int) -> str:
+    """Build the multi-row INSERT statement for n_rows rows of the given columns."""
+    row_placeholder = f"({_qmarks(len(columns))})"
+    return f"""
+        INSERT INTO {table_path} ({", ".join(columns)})
+        VALUES {", ".join([row_placeholder] * n_rows)}
+    """
 
 
 def insert_data(table_path: str, data: list[dict], warehouse_id: str) -> int:
     """
     Insert data into a Databricks Unity Catalog table.
 
+    Records are sent as multi-row INSERT ... VALUES statements on one cursor, each
+    holding at most INSERT_BATCH_ROWS rows and MAX_STATEMENT_PARAMS bind parameters.
+    cursor.executemany() is deliberately not used: the connector implements it as
+    one execute() round trip per row, with no server-side batching.
+
     Args:
         table_path: Full path to the table (catalog.schema.table)
         data: List of dictionaries containing the records to insert
@@ -111,35 +591,98 @@ def insert_data(table_path: str, data: list[dict], warehouse_id: str) -> int:
         Number of records inserted
 
     Raises:
-        Exception: If the insert operation fails
+        ConnectorError: If the insert operation fails
     """
     if not data:
         return 0
 
-    conn = get_connection(warehouse_id)
+    with _pool_for(warehouse_id).acquire() as conn:
+        try:
+            with conn.cursor() as cursor:
+                columns = tuple(data[0].keys())
+                if len(data) == 1:
+                    cursor.execute(_build_insert_sql(table_path, columns, 1), list(data[0].values()))
+                    return int(cursor.rowcount)
 
-    try:
-        with conn.cursor() as cursor:
-            columns = list(data[0].keys())
-            columns_str = ", ".join(columns)
+                rows_per_chunk = max(1, min(INSERT_BATCH_ROWS, MAX_STATEMENT_PARAMS // len(columns)))
 
-            placeholders = ", ".join(["?"] * len(columns))
+                inserted = 0
+                for start in range(0, len(data), rows_per_chunk):
+                    batch = data[start:start + rows_per_chunk]
 
-            values_clauses: list[str] = []
-            all_values: list[Any] = []
+                    all_values: list[Any] = []
+                    all_values.extend(record[col] for record in batch for col in columns)
 
-            for record in data:
-                values_clauses.append(f"({placeholders})")
-                all_values.extend(record[col] for col in columns)
+                    insert_query = _build_insert_sql(table_path, columns, len(batch))
+                    cursor.execute(insert_query, all_values)
+                    inserted += int(cursor.rowcount)
 
-            insert_query = f"""
-                INSERT INTO {table_path} ({columns_str})
-                VALUES {", ".join(values_clauses)}
-            """
+                return inserted
 
-            cursor.execute(insert_query, all_values)
+        except Exception as e:
+            raise ConnectorError(f"Failed to insert data: {e}") from e
 
-            return int(cursor.rowcount)
+
+def bulk_load(table_path: str, data: list[dict], warehouse_id: str, staging_volume: str) -> int:
+    """
+    Load records through a staged file and COPY INTO instead of parameterised INSERTs.
+
+    The records are written as newline-delimited JSON to a temporary file in the
+    given Unity Catalog volume, ingested with COPY INTO, and the file is removed
+    afterwards whether or not the load succeeded.
+
+    Args:
+        table_path: Full path to the table (catalog.schema.table)
+        data: List of dictionaries containing the records to insert
+        warehouse_id: The ID of the SQL warehouse to connect to
+        staging_volume: Volume directory to stage the file in, e.g. /Volumes/catalog/schema/staging
+
+    Returns:
+        Number of records inserted
+
+    Raises:
+        ConnectorError: If staging or the COPY INTO fails
+    """
+    if not data:
+        return 0
+
+    cfg = _get_config()
+    if cfg is None:
+        raise ConnectorError("Failed to bulk load data: Databricks workspace configuration unavailable")
+
+    file_path = f"{staging_volume.rstrip('/')}/{uuid4().hex}.json"
+    files = WorkspaceClient(config=cfg).files
+
+    try:
+        payload = b"\n".join(orjson.dumps(record, default=str) for record in data)
+        files.upload(file_path, io.BytesIO(payload), overwrite=True)
+
+        with _pool_for(warehouse_id).acquire() as conn, conn.cursor() as cursor:
+            cursor.execute(
+                f"COPY INTO {table_path} FROM '{file_path}' FILEFORMAT = JSON "
+                "FORMAT_OPTIONS ('inferTimestamp' = 'true') COPY_OPTIONS ('mergeSchema' = 'false')"
+            )
+            result = cursor.fetchall()
+            columns = [col[0] for col in cursor.description]
+
+        # COPY INTO reports its metrics as a single result row
+        metrics = dict(zip(columns, result[0], strict=False)) if result else {}
+        return int(metrics.get("num_inserted_rows", len(data)))
 
     except Exception as e:
-        raise Exception(f"Failed to insert data: {str(e)}") from e
+        raise ConnectorError(f"Failed to bulk load data: {e}") from e
+    finally:
+        with suppress(Exception):
+            files.delete(file_path)
+
+
+async def abulk_load(table_path: str, data: list[dict], warehouse_id: str, staging_volume: str) -> int:
+    """Async variant of bulk_load() that runs on the connector thread pool."""
+    return await _run_admitted(
+        warehouse_id,
+        bulk_load,
+        table_path=table_path,
+        data=data,
+        warehouse_id=warehouse_id,
+        staging_volume=staging_volume,
+    )
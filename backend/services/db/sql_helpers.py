@@ -1,16 +1,32 @@
+import re
+from functools import lru_cache
 from typing import Any
 
-IDENT_OPS = {"=", "!=", ">", "<", ">=", "<=", "LIKE", "IN"}
+IDENT_OPS = frozenset({"=", "!=", ">", "<", ">=", "<=", "LIKE", "IN"})
+
+_IDENT_FULLMATCH = re.compile(r"[A-Za-z_][A-Za-z0-9_]*").fullmatch
+
+
+@lru_cache(maxsize=1024)
+def _is_identifier(name: str) -> bool:
+    return _IDENT_FULLMATCH(name) is not None
+
+
+@lru_cache(maxsize=64)
+def _qmarks(n: int) -> str:
+    """Return n comma-separated ? placeholders."""
+    return ", ".join(["?"] * n)
+
+
+def _quote_identifier(name: str) -> str:
+    """Backtick-quote a column name, doubling embedded backticks, so any name the table holds is safe in SQL."""
+    return "`" + name.replace("`", "``") + "`"
 
 
 def _validate_identifier(name: str | None) -> None:
-    if not isinstance(name, str) or not name:
-        raise ValueError("Invalid identifier")
-    if not name[0].isalpha() and name[0] != "_":
+    # Check the type first: non-strings (e.g. a list from filter JSON) can't be cache keys
+    if not isinstance(name, str) or not _is_identifier(name):
         raise ValueError("Invalid identifier")
-    for ch in name:
-        if not (ch.isalnum() or ch == "_"):
-            raise ValueError("Invalid identifier")
 
 
 def build_where_clause(filters: list[dict[str, Any]] | None) -> tuple[str, list[Any]]:
@@ -24,26 +40,28 @@ def build_where_clause(filters: list[dict[str, Any]] | None) -> tuple[str, list[
 
     parts: list[str] = []
     params: list[Any] = []
+    parts_append = parts.append
+    params_append = params.append
+    params_extend = params.extend
 
     for cond in filters:
         column = cond.get("column")
-        op = cond.get("op", "=")
+        op = cond.get("op", "=").upper()
         value = cond.get("value")
 
         _validate_identifier(column)
 
-        if op.upper() not in IDENT_OPS:
+        if op not in IDENT_OPS:
             raise ValueError(f"Unsupported operator: {op}")
 
-        if op.upper() == "IN":
+        if op == "IN":
             if not isinstance(value, (list, tuple)):
                 raise ValueError("IN operator requires a list/tuple value")
-            placeholders = ", ".join(["?"] * len(value))
-            parts.append(f"{column} IN ({placeholders})")
-            params.extend(list(value))
+            parts_append(f"{column} IN ({_qmarks(len(value))})")
+            params_extend(value)
         else:
-            parts.append(f"{column} {op} ?")
-            params.append(value)
+            parts_append(f"{column} {op} ?")
+            params_append(value)
 
     where_clause = "WHERE " + " AND ".join(parts) if parts else ""
     return where_clause, params
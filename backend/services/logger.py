@@ -5,25 +5,140 @@ This module provides functionality to log API errors and events to a Databricks
 for persistent audit trails and troubleshooting.
 """
 
+import atexit
+import logging
 import os
+import queue
+import threading
+import time
 import traceback
+from collections.abc import Callable
 from datetime import UTC, datetime
 from typing import Any
 from uuid import uuid4
 
+import orjson
 from fastapi import Request
 
+from .db import connector
+
+logger = logging.getLogger(__name__)
+
+# Entries buffered for the background writer before new ones are dropped
+LOG_QUEUE_MAX_SIZE = 10000
+
+# Maximum entries written by one INSERT from the background writer
+LOG_BATCH_MAX_ENTRIES = 500
+
+# Seconds the background writer waits to fill a batch before writing it
+LOG_FLUSH_INTERVAL_SECONDS = 1.0
+
+# Request body bytes kept in a log entry
+LOG_BODY_MAX_BYTES = 5000
+
+# Seconds flush() waits for queued entries to be written, so shutdown can't hang on the warehouse
+LOG_FLUSH_TIMEOUT_SECONDS = 5.0
+
+# (table_path, warehouse_id, catalog, schema, entry) as queued by log_error
+LogItem = tuple[str, str, str | None, str | None, dict[str, Any]]
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+class _LogWriter:
+    """Daemon thread that drains queued log entries and writes them in batches."""
+
+    def __init__(self, write_batch: Callable[[list[LogItem]], None]):
+        self._write_batch = write_batch
+        self._queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_MAX_SIZE)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-log-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def put(self, item: LogItem) -> None:
+        """Queue an entry for writing; drops it with a warning when the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            logger.warning("Log queue is full, dropping log entry")
+
+    def flush(self, timeout: float = LOG_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """
+        Wait up to timeout seconds for every entry queued so far to be written.
+
+        Returns:
+            False if the writer didn't finish in time; the entries still queued are then
+            left behind and lost if the process exits
+        """
+        if self._thread is None:
+            return True
+        # The writer sets the marker once it has written everything queued before it
+        written = threading.Event()
+        try:
+            self._queue.put(written, timeout=timeout)
+        except queue.Full:
+            pass
+        else:
+            if written.wait(timeout):
+                return True
+        logger.warning(
+            f"Log flush timed out after {timeout}s; dropping about {self._queue.qsize()} queued log entries"
+        )
+        return False
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL_SECONDS
+            while not isinstance(batch[-1], threading.Event) and len(batch) < LOG_BATCH_MAX_ENTRIES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                items = [item for item in batch if not isinstance(item, threading.Event)]
+                if items:
+                    self._write_batch(items)
+            except Exception as e:
+                logger.warning(f"Failed to write log batch: {e}")
+            finally:
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+
 
 class DatabaseLogger:
     """Service for logging API errors and events to Databricks table."""
 
-    def __init__(self):
-        """Initialize the database logger."""
+    def __init__(self, clock: Callable[[], datetime] = _utc_now):
+        """Initialize the database logger.
+
+        Args:
+            clock: Returns the time stamped on each entry; tests can pass a fixed one
+        """
+        self._clock = clock
         self.enabled = os.getenv("DATABRICKS_LOGGING_ENABLED", "true").lower() == "true"
         self.catalog = os.getenv("DATABRICKS_LOG_CATALOG") or os.getenv("DATABRICKS_CATALOG")
         self.schema = os.getenv("DATABRICKS_LOG_SCHEMA") or os.getenv("DATABRICKS_SCHEMA")
         self.table = "api_log"
         self.user = os.getenv("DATABRICKS_USER") or os.getenv("DATABRICKS_CONFIG_PROFILE") or "api"
+        self._table_exists_cache: set[str] = set()
+        self._writer = _LogWriter(self._write_batch)
 
     def _get_warehouse_id(self) -> str | None:
         """Get the warehouse ID from environment, reading it dynamically."""
@@ -42,6 +157,9 @@ class DatabaseLogger:
         """
         Ensure the api_log table exists, create if it doesn't.
 
+        Runs a single idempotent CREATE TABLE IF NOT EXISTS the first time a table
+        path is seen; later calls for that path are answered from memory.
+
         Args:
             catalog: Optional catalog name (extracted from request)
             schema: Optional schema name (extracted from request)
@@ -57,38 +175,35 @@ class DatabaseLogger:
         if not table_path:
             return False
 
-        try:
-            from .db.connector import query
+        if table_path in self._table_exists_cache:
+            return True
 
-            try:
-                query(f"SELECT 1 FROM {table_path} LIMIT 1", warehouse_id=warehouse_id)
-                return True
-            except Exception:
-                create_table_sql = f"""
-                CREATE TABLE IF NOT EXISTS {table_path} (
-                    log_id STRING NOT NULL,
-                    timestamp TIMESTAMP NOT NULL,
-                    level STRING NOT NULL,
-                    endpoint STRING,
-                    method STRING,
-                    status_code INT,
-                    error_type STRING,
-                    error_message STRING,
-                    stack_trace STRING,
-                    request_body STRING,
-                    user STRING,
-                    catalog STRING,
-                    schema STRING,
-                    table_name STRING,
-                    execution_time_ms DOUBLE
-                )
-                """
-                query(create_table_sql, warehouse_id=warehouse_id)
-                return True
+        try:
+            create_table_sql = f"""
+            CREATE TABLE IF NOT EXISTS {table_path} (
+                log_id STRING NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                level STRING NOT NULL,
+                endpoint STRING,
+                method STRING,
+                status_code INT,
+                error_type STRING,
+                error_message STRING,
+                stack_trace STRING,
+                request_body STRING,
+                user STRING,
+                catalog STRING,
+                schema STRING,
+                table_name STRING,
+                execution_time_ms DOUBLE
+            )
+            """
+            connector.query(create_table_sql, warehouse_id=warehouse_id)
+            self._table_exists_cache.add(table_path)
+            return True
 
         except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"Failed to ensure log table exists: {e}", exc_info=True)
+            logger.warning(f"Failed to ensure log table exists: {e}", exc_info=True)
             return False
 
     def log_error(
@@ -101,16 +216,38 @@ class DatabaseLogger:
         """
         Log an error to the Databricks table.
 
+        The entry is queued for the background writer, so the caller never waits on
+        the warehouse. Call flush() to wait for queued entries to be written.
+
         Args:
             error: The exception that occurred
             request: The FastAPI request object (optional)
             level: Log level (ERROR, WARNING, INFO)
             additional_context: Additional context to include in the log
         """
-        import logging
-        logger = logging.getLogger(__name__)
+        # Format the error's own traceback, not whatever exception happens to be handled now
+        stack_trace = "".join(traceback.format_exception(error)) if error.__traceback__ is not None else None
+        self._log(
+            error_type=type(error).__name__,
+            error_message=str(error),
+            stack_trace=stack_trace,
+            request=request,
+            level=level,
+            additional_context=additional_context,
+        )
+
+    def _log(
+        self,
+        error_type: str,
+        error_message: str,
+        stack_trace: str | None,
+        request: Request | None,
+        level: str,
+        additional_context: dict[str, Any] | None,
+    ) -> None:
+        """Build a log entry from the request and context and queue it for writing."""
         warehouse_id = self._get_warehouse_id()
-        logger.info(f"log_error called: enabled={self.enabled}, warehouse_id={warehouse_id}")
+        logger.info(f"Log entry requested: enabled={self.enabled}, warehouse_id={warehouse_id}")
 
         if not self.enabled:
             logger.info("Logging disabled, returning")
@@ -125,22 +262,28 @@ class DatabaseLogger:
             request_schema = None
             request_table = None
 
+            if request is not None:
+                body_json = None
+                raw_body = getattr(request, "_body", None)
+                if isinstance(raw_body, bytes) and raw_body:
+                    # Parsed only on this error path so successful requests never pay for it
+                    try:
+                        body_json = orjson.loads(raw_body)
+                    except orjson.JSONDecodeError:
+                        pass
+                if isinstance(body_json, dict):
+                    request_catalog = body_json.get("catalog")
+                    request_schema = body_json.get("schema") or body_json.get("schema_name")
+                    request_table = body_json.get("table") or body_json.get("table_name")
+
             if request and hasattr(request, "_body"):
                 try:
                     body_bytes = request._body
                     if body_bytes:
-                        request_body = body_bytes.decode("utf-8")
-                        import json
-                        try:
-                            body_json = json.loads(request_body)
-                            request_catalog = body_json.get("catalog")
-                            request_schema = body_json.get("schema") or body_json.get("schema_name")
-                            request_table = body_json.get("table") or body_json.get("table_name")
-                        except Exception:
-                            pass
-
-                        if len(request_body) > 5000:
-                            request_body = request_body[:5000] + "... (truncated)"
+                        # Cut before decoding so huge payloads cost at most LOG_BODY_MAX_BYTES
+                        request_body = body_bytes[:LOG_BODY_MAX_BYTES].decode("utf-8", errors="replace")
+                        if len(body_bytes) > LOG_BODY_MAX_BYTES:
+                            request_body += "... (truncated)"
                 except Exception:
                     request_body = "<unable to decode>"
 
@@ -149,25 +292,23 @@ class DatabaseLogger:
             schema = context.get("schema") or request_schema
             table_name = context.get("table") or request_table
 
-            if not self._ensure_log_table_exists(catalog=catalog, schema=schema):
-                return
-
             table_path = self._get_table_path(catalog=catalog, schema=schema)
-            if not table_path:
+            if not warehouse_id or not table_path:
                 return
             status_code = context.get("status_code")
             execution_time = context.get("execution_time_ms")
 
             log_entry = {
                 "log_id": str(uuid4()),
-                "timestamp": datetime.now(UTC).isoformat(),
+                # Formatted by the background writer, off the request path
+                "timestamp": self._clock(),
                 "level": level,
                 "endpoint": endpoint,
                 "method": method,
                 "status_code": status_code,
-                "error_type": type(error).__name__,
-                "error_message": str(error),
-                "stack_trace": traceback.format_exc(),
+                "error_type": error_type,
+                "error_message": error_message,
+                "stack_trace": stack_trace,
                 "request_body": request_body,
                 "user": self.user,
                 "catalog": catalog,
@@ -176,12 +317,29 @@ class DatabaseLogger:
                 "execution_time_ms": execution_time,
             }
 
-            from .db.connector import insert_data
-            insert_data(table_path, [log_entry], warehouse_id=warehouse_id)
+            self._writer.put((table_path, warehouse_id, catalog, schema, log_entry))
 
-        except Exception as log_error:
-            import logging
-            logging.getLogger(__name__).warning(f"Failed to log error to database: {log_error}")
+        except Exception as e:
+            logger.warning(f"Failed to log error to database: {e}")
+
+    def _write_batch(self, items: list[LogItem]) -> None:
+        """Write queued entries with one insert per log table."""
+        grouped: dict[tuple[str, str, str | None, str | None], list[dict[str, Any]]] = {}
+        for table_path, warehouse_id, catalog, schema, entry in items:
+            entry["timestamp"] = entry["timestamp"].isoformat()
+            grouped.setdefault((table_path, warehouse_id, catalog, schema), []).append(entry)
+
+        for (table_path, warehouse_id, catalog, schema), entries in grouped.items():
+            try:
+                if not self._ensure_log_table_exists(catalog=catalog, schema=schema):
+                    continue
+                connector.insert_data(table_path, entries, warehouse_id=warehouse_id)
+            except Exception as e:
+                logger.warning(f"Failed to log error to database: {e}")
+
+    def flush(self, timeout: float = LOG_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Wait up to timeout seconds for queued log entries to be written; False if some were not."""
+        return self._writer.flush(timeout)
 
     def log_event(
         self,
@@ -199,11 +357,10 @@ class DatabaseLogger:
             level: Log level (ERROR, WARNING, INFO)
             additional_context: Additional context to include in the log
         """
-        class LogEvent(Exception):
-            pass
-
-        self.log_error(
-            LogEvent(message),
+        self._log(
+            error_type="LogEvent",
+            error_message=message,
+            stack_trace=None,
             request=request,
             level=level,
             additional_context=additional_context,
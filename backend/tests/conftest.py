@@ -1,9 +1,114 @@
 """Test configuration for the FastAPI application."""
 
+import ast
+import functools
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import httpx
 import pytest
+import pytest_asyncio
+from databricks.sql.client import Connection, Cursor
 from fastapi.testclient import TestClient
 
 from backend.app import app
+from backend.routes.v1.records import clear_metadata_cache, clear_read_fallback_cache
+from backend.services.db.connector import close_connections
+from backend.services.logger import db_logger
+from backend.tests.fakes import FakeConnector
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional, not available on Windows
+    uvloop = None
+
+
+if uvloop is not None and sys.platform != "win32":
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop, which schedules short coroutines more cheaply."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+def _name_of(node: ast.AST) -> str | None:
+    """Trailing name of a bare or dotted reference: fixture, pytest.fixture -> "fixture"."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _is_fixture(node: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
+    return any(
+        _name_of(decorator.func if isinstance(decorator, ast.Call) else decorator) == "fixture"
+        for decorator in node.decorator_list
+    )
+
+
+@functools.cache
+def _stray_test_client_lines(path: str) -> tuple[int, ...]:
+    """Line numbers of TestClient(...) calls in path that are not inside a fixture."""
+    lines: list[int] = []
+
+    def visit(node: ast.AST, in_fixture: bool) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                visit(child, in_fixture or _is_fixture(child))
+                continue
+            if not in_fixture and isinstance(child, ast.Call) and _name_of(child.func) == "TestClient":
+                lines.append(child.lineno)
+            visit(child, in_fixture)
+
+    visit(ast.parse(Path(path).read_bytes(), filename=path), False)
+    return tuple(lines)
+
+
+def pytest_collection_modifyitems(session, config, items):
+    """Stop the run if a test builds its own TestClient; app startup belongs to the session client."""
+    for path in sorted({str(item.path) for item in items}):
+        lines = _stray_test_client_lines(path)
+        if lines:
+            pytest.exit(
+                f"{path}:{lines[0]}: use the client fixture, not TestClient(app)",
+                returncode=pytest.ExitCode.USAGE_ERROR,
+            )
+
+
+def _make_conn(*, execute_error=None, fetchall=None, description=None):
+    """Build a mock warehouse connection whose cursor is its own context manager."""
+    cursor = MagicMock(spec=Cursor)
+    cursor.__enter__.return_value = cursor
+    cursor.execute.side_effect = execute_error
+    cursor.fetchall.return_value = fetchall
+    cursor.description = description
+    conn = MagicMock(spec=Connection)
+    conn.cursor.return_value = cursor
+    return conn
+
+
+@pytest.fixture(scope="session")
+def make_conn():
+    """Factory for mock warehouse connections; the cursor is conn.cursor.return_value."""
+    return _make_conn
+
+
+@pytest.fixture(scope="module")
+def fake_connector():
+    """Route the connector to FakeConnector once for the requesting module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("backend.services.db.connector.query", FakeConnector.query)
+        mp.setattr("backend.services.db.connector.insert_data", FakeConnector.insert_data)
+        yield FakeConnector
+
+
+@pytest.fixture
+def fake_db(fake_connector):
+    """FakeConnector with nothing recorded yet; opt in with pytest.mark.usefixtures("fake_db")."""
+    fake_connector.reset()
+    return fake_connector
 
 
 @pytest.fixture(scope="session")
@@ -12,8 +117,50 @@ def app_instance():
     return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(app_instance):
-    """Create a test client for the FastAPI application."""
-    with TestClient(app_instance) as test_client:
-        yield test_client
\ No newline at end of file
+    """Create a test client whose lifespan runs once for the whole session.
+
+    Unhandled errors come back as the app's 500 response rather than being re-raised in the test.
+    """
+    with TestClient(app_instance, raise_server_exceptions=False) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_client(app_instance):
+    """Create one in-process async client, on the session event loop, for async tests."""
+    transport = httpx.ASGITransport(app=app_instance)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def reset_metadata_cache():
+    """Start every test with an empty DESCRIBE/SHOW cache so patched connectors are hit."""
+    clear_metadata_cache()
+    yield
+    clear_metadata_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_read_fallback_cache():
+    """Start every test without replayable read pages so degraded responses never leak between tests."""
+    clear_read_fallback_cache()
+    yield
+    clear_read_fallback_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_connection_pools():
+    """Drop pooled connections so a connection mocked in one test never leaks into the next."""
+    close_connections()
+    yield
+    close_connections()
+
+
+@pytest.fixture(autouse=True)
+def flush_db_logger(monkeypatch):
+    """Write queued log entries while the test's connector patches are still in place."""
+    yield
+    db_logger.flush()
@@ -0,0 +1,65 @@
+"""In-memory stand-ins for the warehouse connector, shared across test modules."""
+
+from collections import deque
+from types import MappingProxyType
+from typing import Any, ClassVar, NamedTuple
+
+# Columns DESCRIBE reports for every table the fake knows about; shared and read-only,
+# since routes only read column names from them
+_DESCRIBE_ROWS = tuple(
+    MappingProxyType(row)
+    for row in (
+        {"col_name": "id", "data_type": "bigint"},
+        {"col_name": "name", "data_type": "string"},
+        {"col_name": "is_deleted", "data_type": "boolean"},
+    )
+)
+
+
+# Calls kept per list; tests only look at the most recent ones
+_MAX_RECORDED_CALLS = 64
+
+
+class Statement(NamedTuple):
+    """One call to FakeConnector.query."""
+
+    query: str
+    params: list[Any] | None
+    warehouse_id: str
+
+
+class Insert(NamedTuple):
+    """One call to FakeConnector.insert_data."""
+
+    table_path: str
+    data: list[dict]
+    warehouse_id: str
+
+
+class FakeConnector:
+    """Records every statement and insert instead of contacting a warehouse.
+
+    Install it once per module (see the fake_connector fixture in conftest) and call reset()
+    between tests; the recorded calls live on the class so nothing is reallocated.
+    """
+
+    queries: ClassVar[deque[Statement]] = deque(maxlen=_MAX_RECORDED_CALLS)
+    inserts: ClassVar[deque[Insert]] = deque(maxlen=_MAX_RECORDED_CALLS)
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.queries.clear()
+        cls.inserts.clear()
+
+    @staticmethod
+    def query(sql_query: str, warehouse_id: str, as_dict: bool = True, params: list[Any] | None = None) -> Any:
+        FakeConnector.queries.append(Statement(sql_query, params, warehouse_id))
+        if sql_query[:8].upper() == "DESCRIBE":
+            return _DESCRIBE_ROWS
+        # Data rows stay fresh dicts: routes JSON-encode them with orjson, which rejects mapping proxies
+        return [{"id": 1, "name": "Test"}]
+
+    @staticmethod
+    def insert_data(table_path: str, data: list[dict], warehouse_id: str) -> int:
+        FakeConnector.inserts.append(Insert(table_path, data, warehouse_id))
+        return len(data)
@@ -0,0 +1,16 @@
+"""Assertion helpers shared across test modules."""
+
+from typing import Any
+
+
+def assert_error(resp, status: int, message: str | None = None) -> dict[str, Any]:
+    """Assert resp is the app's error envelope with the given status and, optionally, a message substring.
+
+    Returns the parsed body so callers can check details without decoding it again.
+    """
+    assert resp.status_code == status
+    body = resp.json()
+    assert body["error"] is True
+    if message:
+        assert message in body["message"]
+    return body
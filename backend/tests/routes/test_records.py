@@ -1,97 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+
 import pytest
-from fastapi.testclient import TestClient
 
-from backend.app import app
+from backend.errors.exceptions import ValidationError
+from backend.models.tables import TableInsertRequest
+from backend.routes.v1.records import write_records
+from backend.services.db import connector as _conn
+from backend.tests.helpers import assert_error
 
+AUTO_CREATE_PAYLOAD = {
+    "catalog": "CAT",
+    "schema_name": "SCHEMA",
+    "table": "records",
+    "data": [{"order_id": 2}],
+    "auto_create": True,
+    "schema_definition": [{"name": "order_id", "data_type": "BIGINT", "nullable": False}],
+}
 
-@pytest.fixture(autouse=True)
-def patch_connector(monkeypatch):
-    def fake_query(sql_query, warehouse_id, as_dict=True, params=None):
-        sql_upper = sql_query.strip().upper()
-        if "COUNT(*)" in sql_upper or "SELECT COUNT" in sql_upper:
-            return [{"cnt": 1, "count": 1}]
-        elif sql_upper.startswith("SELECT"):
-            return [{"order_id": 1, "amount": 10.0, "is_deleted": False}]
-        elif sql_upper.startswith("DESCRIBE"):
-            return [
-                {"col_name": "order_id", "data_type": "bigint"},
-                {"col_name": "amount", "data_type": "double"},
-                {"col_name": "record_uuid", "data_type": "string"},
-                {"col_name": "is_deleted", "data_type": "boolean"},
-                {"col_name": "inserted_at", "data_type": "timestamp"},
-                {"col_name": "inserted_by", "data_type": "string"},
-                {"col_name": "updated_at", "data_type": "timestamp"},
-                {"col_name": "updated_by", "data_type": "string"},
-                {"col_name": "deleted_at", "data_type": "timestamp"},
-                {"col_name": "deleted_by", "data_type": "string"},
-            ]
-        return []
 
-    def fake_insert(table_path, data, warehouse_id):
-        return len(data)
+_COUNT_ROWS = ({"cnt": 1, "count": 1},)
+_SELECT_ROWS = ({"order_id": 1, "amount": 10.0, "is_deleted": False},)
+_DESCRIBE_ROWS = (
+    {"col_name": "order_id", "data_type": "bigint"},
+    {"col_name": "amount", "data_type": "double"},
+    {"col_name": "record_uuid", "data_type": "string"},
+    {"col_name": "is_deleted", "data_type": "boolean"},
+    {"col_name": "inserted_at", "data_type": "timestamp"},
+    {"col_name": "inserted_by", "data_type": "string"},
+    {"col_name": "updated_at", "data_type": "timestamp"},
+    {"col_name": "updated_by", "data_type": "string"},
+    {"col_name": "deleted_at", "data_type": "timestamp"},
+    {"col_name": "deleted_by", "data_type": "string"},
+)
 
-    monkeypatch.setattr("backend.services.db.connector.query", fake_query)
-    monkeypatch.setattr("backend.services.db.connector.insert_data", fake_insert)
 
+def _fake_query(sql_query, warehouse_id, as_dict=True, params=None):
+    # Routes only read the returned rows, so a shallow copy of the shared dicts is enough.
+    # Route SQL keywords are always uppercase, so no case folding is needed.
+    sql = sql_query.lstrip()
+    if "COUNT(*)" in sql:
+        return list(_COUNT_ROWS)
+    elif sql.startswith("SELECT"):
+        return list(_SELECT_ROWS)
+    elif sql.startswith("DESCRIBE"):
+        return list(_DESCRIBE_ROWS)
+    return []
 
-def test_read_records():
-    with TestClient(app) as client:
-        resp = client.get(
-            "/api/v1/records/read?catalog=CAT&schema=SCHEMA&table=records&limit=1&offset=0"
-        )
-        assert resp.status_code == 200
-        body = resp.json()
-        assert "data" in body
-        assert body["count"] == 1 or isinstance(body["count"], int)
 
+def _fake_insert(table_path, data, warehouse_id):
+    return len(data)
 
-def test_write_records():
-    payload = {
-        "catalog": "CAT",
-        "schema_name": "SCHEMA",
-        "table": "records",
-        "data": [{"order_id": 2, "amount": 20.0}],
-    }
-    with TestClient(app) as client:
-        resp = client.post("/api/v1/records/write", json=payload)
-        assert resp.status_code == 201
-        body = resp.json()
-        assert body["count"] == 1
 
+@pytest.fixture(autouse=True)
+def patch_connector(monkeypatch):
+    monkeypatch.setattr(_conn, "query", _fake_query)
+    monkeypatch.setattr(_conn, "insert_data", _fake_insert)
 
-def test_update_records():
-    payload = {
-        "catalog": "CAT",
-        "schema_name": "SCHEMA",
-        "table": "records",
-        "key_column": "order_id",
-        "key_value": 1,
-        "updates": {"amount": 15.0},
-    }
-    with TestClient(app) as client:
-        resp = client.put("/api/v1/records/update", json=payload)
-        assert resp.status_code == 200
-        body = resp.json()
-        assert body["count"] == 1
 
+_TABLE = {"catalog": "CAT", "schema_name": "SCHEMA", "table": "records"}
+_SETTINGS = SimpleNamespace(databricks_warehouse_id="test-wh", databricks_staging_volume=None)
 
-def test_delete_records_soft():
-    payload = {
-        "catalog": "CAT",
-        "schema_name": "SCHEMA",
-        "table": "records",
-        "key_column": "order_id",
-        "key_value": 1,
-        "soft": True,
-    }
-    with TestClient(app) as client:
-        resp = client.request("DELETE", "/api/v1/records/delete", json=payload)
-        assert resp.status_code == 200
-        body = resp.json()
-        assert body["count"] == 1
+
+def _write_directly(payload):
+    """Call write_records without the HTTP stack, for validation-only assertions."""
+    return asyncio.run(write_records(TableInsertRequest(**payload), settings=_SETTINGS))
 
 
-def test_schema_validation_error_returns_expected_schema():
+@pytest.mark.parametrize(
+    "method,path,payload,expected_status",
+    [
+        ("GET", "/api/v1/records/read?catalog=CAT&schema=SCHEMA&table=records&limit=1&offset=0", None, 200),
+        ("POST", "/api/v1/records/write", {**_TABLE, "data": [{"order_id": 2, "amount": 20.0}]}, 201),
+        (
+            "PUT",
+            "/api/v1/records/update",
+            {**_TABLE, "key_column": "order_id", "key_value": 1, "updates": {"amount": 15.0}},
+            200,
+        ),
+        ("DELETE", "/api/v1/records/delete", {**_TABLE, "key_column": "order_id", "key_value": 1, "soft": True}, 200),
+    ],
+    ids=["read", "write", "update", "delete_soft"],
+)
+def test_records_crud(client, method, path, payload, expected_status):
+    resp = client.request(method, path, json=payload)
+    assert resp.status_code == expected_status
+    body = resp.json()
+    assert "data" in body
+    assert body["count"] == 1
+
+
+def test_schema_validation_error_returns_expected_schema(client):
     """Test that schema validation errors include the expected schema information."""
     payload = {
         "catalog": "CAT",
@@ -106,23 +105,14 @@ def test_schema_validation_error_returns_expected_schema():
         ],
         "auto_create": False
     }
-    with TestClient(app) as client:
-        resp = client.post("/api/v1/records/write", json=payload)
-        assert resp.status_code == 400
-        body = resp.json()
-        assert body["error"] is True
-        assert "Schema validation failed" in body["message"]
-        assert "details" in body
-        assert body["details"] is not None
-        assert "expected_schema" in body["details"]
-        expected_schema = body["details"]["expected_schema"]
-        assert len(expected_schema) == 2
-        assert expected_schema[0]["name"] == "order_id"
-        assert expected_schema[0]["type"] == "BIGINT"
-        assert expected_schema[0]["nullable"] is False
-        assert expected_schema[1]["name"] == "amount"
-        assert expected_schema[1]["type"] == "DOUBLE"
-        assert expected_schema[1]["nullable"] is True
+    resp = client.post("/api/v1/records/write", json=payload)
+    body = assert_error(resp, 400, "Schema validation failed")
+    assert body["details"] == {
+        "expected_schema": [
+            {"name": "order_id", "type": "BIGINT", "nullable": False},
+            {"name": "amount", "type": "DOUBLE", "nullable": True},
+        ]
+    }
 
 
 def test_schema_validation_missing_required_column_with_schema():
@@ -140,13 +130,10 @@ def test_schema_validation_missing_required_column_with_schema():
         ],
         "auto_create": False
     }
-    with TestClient(app) as client:
-        resp = client.post("/api/v1/records/write", json=payload)
-        assert resp.status_code == 400
-        body = resp.json()
-        assert body["error"] is True
-        assert "missing required columns" in body["message"]
-        assert "expected_schema" in body["details"]
+    with pytest.raises(ValidationError) as exc_info:
+        _write_directly(payload)
+    assert "missing required columns" in exc_info.value.message
+    assert "expected_schema" in exc_info.value.details
 
 
 def test_schema_validation_unknown_column_with_schema():
@@ -164,11 +151,476 @@ def test_schema_validation_unknown_column_with_schema():
         ],
         "auto_create": False
     }
-    with TestClient(app) as client:
-        resp = client.post("/api/v1/records/write", json=payload)
-        assert resp.status_code == 400
-        body = resp.json()
-        assert body["error"] is True
-        assert "unknown columns" in body["message"]
-        assert "expected_schema" in body["details"]
+    with pytest.raises(ValidationError) as exc_info:
+        _write_directly(payload)
+    assert "unknown columns" in exc_info.value.message
+    assert "expected_schema" in exc_info.value.details
+
+
+def test_has_column_matches_only_the_column_name_field(monkeypatch):
+    """DESCRIBE values other than the column name (types, comments) must not match."""
+    from backend.routes.v1.records import _has_column
+
+    def fake_describe(sql_query, warehouse_id, as_dict=True, params=None):
+        return [
+            {"col_name": "order_id", "data_type": "bigint", "comment": "is_deleted"},
+            {"col_name": "status", "data_type": "is_deleted", "comment": None},
+        ]
+
+    monkeypatch.setattr(_conn, "query", fake_describe)
+
+    assert asyncio.run(_has_column("CAT.SCHEMA.records", "order_id", "wh")) is True
+    assert asyncio.run(_has_column("CAT.SCHEMA.records", "is_deleted", "wh")) is False
+
+
+def test_bulk_update_records_reports_missing_keys(client, monkeypatch):
+    """Bulk updates apply found keys and keep not_found in request order."""
+    executed = []
+
+    def fake_query(sql_query, warehouse_id, as_dict=True, params=None):
+        executed.append(sql_query)
+        if "COUNT(*)" in sql_query:
+            return [{"count": 0 if params == [2] else 1}]
+        return []
+
+    monkeypatch.setattr(_conn, "query", fake_query)
+
+    payload = {
+        "catalog": "CAT",
+        "schema_name": "SCHEMA",
+        "table": "records",
+        "key_column": "order_id",
+        "bulk_updates": [
+            {"key_value": 1, "updates": {"amount": 15.0}},
+            {"key_value": 2, "updates": {"amount": 25.0}},
+            {"key_value": 3, "updates": {"amount": 35.0}},
+        ],
+    }
+    resp = client.put("/api/v1/records/update", json=payload)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["count"] == 2
+    assert body["data"][0]["not_found"] == [2]
+    assert sum(q.startswith("UPDATE") for q in executed) == 2
+
+
+def test_schema_validation_rejects_boolean_for_integer_column():
+    """bool is an int subclass in Python but must not satisfy a BIGINT column."""
+    payload = {
+        "catalog": "CAT",
+        "schema_name": "SCHEMA",
+        "table": "records",
+        "data": [{"order_id": True, "amount": 20.0}],
+        "schema_definition": [
+            {"name": "order_id", "data_type": "BIGINT", "nullable": False},
+            {"name": "amount", "data_type": "DOUBLE", "nullable": True}
+        ],
+        "auto_create": False
+    }
+    with pytest.raises(ValidationError, match="expects integer, got bool"):
+        _write_directly(payload)
+
+
+def test_write_records_echoes_rows_only_when_requested(client):
+    """Inserted rows are returned only with return_data=true."""
+    payload = {
+        "catalog": "CAT",
+        "schema_name": "SCHEMA",
+        "table": "records",
+        "data": [{"order_id": 2, "amount": 20.0}],
+    }
+    resp = client.post("/api/v1/records/write", json=payload)
+    assert resp.status_code == 201
+    assert resp.json()["data"] == []
+
+    resp = client.post("/api/v1/records/write", json={**payload, "return_data": True})
+    assert resp.status_code == 201
+    row = resp.json()["data"][0]
+    assert row["order_id"] == 2
+    assert row["is_deleted"] is False
+    assert "record_uuid" in row
+
+
+def test_has_column_reuses_cached_describe(monkeypatch):
+    """Repeated column probes for the same table issue a single DESCRIBE."""
+    from backend.routes.v1.records import _has_column
+
+    describes = []
+
+    def fake_describe(sql_query, warehouse_id, as_dict=True, params=None):
+        describes.append(sql_query)
+        return [{"col_name": "is_deleted", "data_type": "boolean"}]
+
+    monkeypatch.setattr(_conn, "query", fake_describe)
+
+    for _ in range(3):
+        assert asyncio.run(_has_column("CAT.SCHEMA.records", "is_deleted", "wh")) is True
+
+    assert describes == ["DESCRIBE CAT.SCHEMA.records"]
+
+
+def test_has_column_does_not_cache_failures(monkeypatch):
+    """A failed DESCRIBE is retried on the next probe instead of being cached."""
+    from backend.routes.v1.records import _has_column
+
+    calls = []
+
+    def flaky_describe(sql_query, warehouse_id, as_dict=True, params=None):
+        calls.append(sql_query)
+        if len(calls) == 1:
+            raise RuntimeError("warehouse unavailable")
+        return [{"col_name": "is_deleted", "data_type": "boolean"}]
+
+    monkeypatch.setattr(_conn, "query", flaky_describe)
+
+    assert asyncio.run(_has_column("CAT.SCHEMA.records", "is_deleted", "wh")) is False
+    assert asyncio.run(_has_column("CAT.SCHEMA.records", "is_deleted", "wh")) is True
+    assert len(calls) == 2
+
+
+def test_write_records_auto_create_submits_ddl_as_one_batch(client, monkeypatch):
+    """auto_create ships the idempotent DDL in a single batch without existence probes."""
+    batches = []
+    queries = []
+
+    def fake_batch(statements, warehouse_id):
+        batches.append(statements)
+
+    def fake_query(sql_query, warehouse_id, as_dict=True, params=None):
+        queries.append(sql_query)
+        return []
+
+    monkeypatch.setattr(_conn, "execute_batch", fake_batch)
+    monkeypatch.setattr(_conn, "query", fake_query)
+
+    resp = client.post("/api/v1/records/write", json=AUTO_CREATE_PAYLOAD)
+    assert resp.status_code == 201
+
+    assert len(batches) == 1
+    statements = batches[0]
+    assert statements[0] == "CREATE CATALOG IF NOT EXISTS CAT"
+    assert statements[1] == "CREATE SCHEMA IF NOT EXISTS CAT.SCHEMA"
+    assert statements[2].startswith("CREATE TABLE IF NOT EXISTS CAT.SCHEMA.records (")
+    assert queries == []
+
+
+def test_write_records_auto_create_failure_is_not_replayed(client, monkeypatch):
+    """A failed DDL batch surfaces as an error instead of being re-run statement by statement."""
+    queries = []
+
+    def failing_batch(statements, warehouse_id):
+        raise RuntimeError("Batch execution failed: PERMISSION_DENIED")
+
+    def fake_query(sql_query, warehouse_id, as_dict=True, params=None):
+        queries.append(sql_query)
+        return []
+
+    monkeypatch.setattr(_conn, "execute_batch", failing_batch)
+    monkeypatch.setattr(_conn, "query", fake_query)
+
+    resp = client.post("/api/v1/records/write", json=AUTO_CREATE_PAYLOAD)
+    assert_error(resp, 500, "Failed to auto-create resources")
+    assert queries == []
+
+
+def test_schema_validation_checks_every_typed_column():
+    """Each typed column is checked; untyped columns and NULLs pass through."""
+    from backend.models.tables import ColumnDefinition
+    from backend.routes.v1.records import _prepare_rows
+
+    schema = [
+        ColumnDefinition(name="amount", data_type="DECIMAL", nullable=True),
+        ColumnDefinition(name="tags", data_type="ARRAY", nullable=True),
+    ]
+
+    rows = list(_prepare_rows(
+        [{"amount": 1, "tags": ["a"]}, {"amount": 2.5, "tags": None}, {"amount": None}], schema, {}
+    ))
+    assert len(rows) == 3
+
+    with pytest.raises(ValueError, match="Record 1: Column 'amount' expects numeric, got str"):
+        list(_prepare_rows([{"amount": 1}, {"amount": "2.5"}], schema, {}))
+
+
+def test_write_records_caller_audit_values_win_over_defaults(client):
+    """Audit columns supplied by the caller are kept; the rest are filled in."""
+    payload = {
+        "catalog": "CAT",
+        "schema_name": "SCHEMA",
+        "table": "records",
+        "data": [{"order_id": 2, "inserted_by": "loader", "record_uuid": "fixed"}],
+        "return_data": True,
+    }
+    resp = client.post("/api/v1/records/write", json=payload)
+    assert resp.status_code == 201
+    row = resp.json()["data"][0]
+    assert row["inserted_by"] == "loader"
+    assert row["record_uuid"] == "fixed"
+    assert row["updated_at"] == row["inserted_at"]
+    assert row["deleted_at"] is None
+
+
+def test_read_records_include_total_counts_with_same_filters(client, monkeypatch):
+    """include_total issues a COUNT(*) with the page's WHERE clause and params."""
+    calls = []
+
+    def fake_query(sql_query, warehouse_id, as_dict=True, params=None):
+        calls.append((sql_query, params))
+        if sql_query.startswith("DESCRIBE"):
+            return [{"col_name": "status", "data_type": "string"}]
+        if "COUNT(*)" in sql_query:
+            return [{"cnt": 42}]
+        return [{"status": "active"}]
+
+    monkeypatch.setattr(_conn, "query", fake_query)
+
+    resp = client.get(
+        "/api/v1/records/read",
+        params={
+            "catalog": "CAT",
+            "schema": "SCHEMA",
+            "table": "records",
+            "filters": '[{"column": "status", "op": "=", "value": "active"}]',
+            "include_total": "true",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.json()["total"] == 42
+    assert resp.json()["count"] == 1
+
+    resp = client.get("/api/v1/records/read?catalog=CAT&schema=SCHEMA&table=records")
+    assert resp.json()["total"] is None
+
+    count_calls = [c for c in calls if "COUNT(*)" in c[0]]
+    assert len(count_calls) == 1
+    assert count_calls[0][0] == "SELECT COUNT(*) as cnt FROM CAT.SCHEMA.records WHERE status = ?"
+    assert count_calls[0][1] == ["active"]
+
+
+def test_read_and_soft_delete_share_one_describe(client, monkeypatch):
+    """The is_deleted checks on read and soft delete reuse one cached DESCRIBE per table."""
+    describes = []
+    base_query = _conn.query
+
+    def counting_query(sql_query, warehouse_id, as_dict=True, params=None):
+        if sql_query.startswith("DESCRIBE"):
+            describes.append(sql_query)
+        return base_query(sql_query, warehouse_id, as_dict=as_dict, params=params)
+
+    monkeypatch.setattr(_conn, "query", counting_query)
+
+    payload = {
+        "catalog": "CAT",
+        "schema_name": "SCHEMA",
+        "table": "records",
+        "key_column": "order_id",
+        "key_value": 1,
+        "soft": True,
+    }
+    for _ in range(2):
+        resp = client.get("/api/v1/records/read?catalog=CAT&schema=SCHEMA&table=records")
+        assert resp.status_code == 200
+    resp = client.request("DELETE", "/api/v1/records/delete", json=payload)
+    assert resp.status_code == 200
+
+    assert describes == ["DESCRIBE CAT.SCHEMA.records"]
+
+
+@pytest.mark.parametrize("name", ["records", "_tmp", "Orders2024", "a"])
+def test_route_identifier_validation_accepts_plain_names(name):
+    from backend.routes.v1.records import _validate_identifier
+
+    _validate_identifier(name)
+
+
+@pytest.mark.parametrize("name", ["", "1records", "rec-ords", "records\n", "tåble", "a b"])
+def test_route_identifier_validation_rejects_unsafe_names(name):
+    from backend.routes.v1.records import _validate_identifier
+
+    with pytest.raises(ValueError, match="Invalid identifier"):
+        _validate_identifier(name)
+
+
+def test_read_records_encodes_warehouse_types(client, monkeypatch):
+    """DECIMAL, TIMESTAMP and DATE values are serialised like jsonable_encoder would."""
+    from datetime import date, datetime
+    from decimal import Decimal
+
+    def fake_query(sql_query, warehouse_id, as_dict=True, params=None):
+        if sql_query.startswith("DESCRIBE"):
+            return []
+        return [{
+            "amount": Decimal("10.50"),
+            "qty": Decimal(3),
+            "inserted_at": datetime(2024, 1, 2, 3, 4, 5),
+            "spud": date(2024, 1, 2),
+        }]
+
+    monkeypatch.setattr(_conn, "query", fake_query)
+
+    resp = client.get("/api/v1/records/read?catalog=CAT&schema=SCHEMA&table=records")
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "data": [{"amount": 10.5, "qty": 3, "inserted_at": "2024-01-02T03:04:05", "spud": "2024-01-02"}],
+        "count": 1,
+        "total": None,
+    }
+
+
+def test_validated_table_path_checks_every_part():
+    from backend.routes.v1.records import _validated_table_path
+
+    assert _validated_table_path("CAT", "SCHEMA", "records") == "CAT.SCHEMA.records"
+
+    for bad in [("CAT;", "SCHEMA", "records"), ("CAT", "SCH EMA", "records"), ("CAT", "SCHEMA", "rec--")]:
+        with pytest.raises(ValueError, match="Invalid identifier"):
+            _validated_table_path(*bad)
+
+    with pytest.raises(ValueError, match="Catalog and schema must be provided"):
+        _validated_table_path(None, "SCHEMA", "records")
+
+
+def test_read_records_unencodable_row_is_500_and_not_remembered(client, monkeypatch):
+    """A page that can't be encoded fails as a whole and is never kept for replay."""
+    from backend.routes.v1 import records
+
+    def fake_query(sql_query, warehouse_id, as_dict=True, params=None):
+        if sql_query.startswith("DESCRIBE"):
+            return []
+        return [{"order_id": 1}, {"order_id": object()}]
+
+    monkeypatch.setattr(_conn, "query", fake_query)
+
+    resp = client.get("/api/v1/records/read?catalog=CAT&schema=SCHEMA&table=records")
+    assert_error(resp, 500, "not JSON serializable")
+    assert records._READ_FALLBACK_CACHE == {}
+
+
+def test_read_records_projects_columns(client, monkeypatch):
+    """"*" expands to non-audit columns; explicit columns are checked against the table."""
+    queries = []
+    base_query = _conn.query
+
+    def recording_query(sql_query, warehouse_id, as_dict=True, params=None):
+        queries.append(sql_query)
+        return base_query(sql_query, warehouse_id, as_dict=as_dict, params=params)
+
+    monkeypatch.setattr(_conn, "query", recording_query)
+
+    resp = client.get("/api/v1/records/read?catalog=CAT&schema=SCHEMA&table=records")
+    assert resp.status_code == 200
+    assert queries[-1].startswith("SELECT `order_id`, `amount` FROM CAT.SCHEMA.records ")
+
+    resp = client.get("/api/v1/records/read?catalog=CAT&schema=SCHEMA&table=records&columns=amount, inserted_at")
+    assert resp.status_code == 200
+    assert queries[-1].startswith("SELECT amount, inserted_at FROM CAT.SCHEMA.records ")
+
+    resp = client.get("/api/v1/records/read?catalog=CAT&schema=SCHEMA&table=records&columns=amount,missing")
+    assert_error(resp, 400, "Unknown columns: missing")
+
+
+def test_audit_user_is_read_on_first_use(monkeypatch):
+    from backend.routes.v1.records import _audit_user
+
+    _audit_user.cache_clear()
+    monkeypatch.delenv("DATABRICKS_USER", raising=False)
+    monkeypatch.setenv("DATABRICKS_CONFIG_PROFILE", "dotenv_profile")
+    try:
+        assert _audit_user() == "dotenv_profile"
+    finally:
+        _audit_user.cache_clear()
+
+
+def test_projection_quotes_expanded_column_names():
+    from backend.routes.v1.records import _projection
+
+    known = ("order id", "select", "a`b", "inserted_at")
+    assert _projection("*", known) == "`order id`, `select`, `a``b`"
+    assert _projection("*", ()) == "*"
+
+
+def test_parse_filters_is_cached_and_rejects_bad_filters():
+    from backend.routes.v1.records import _parse_filters
+
+    payload = '[{"column": "status", "op": "IN", "value": ["a", "b"]}]'
+    assert _parse_filters(payload) == ("WHERE status IN (?, ?)", ("a", "b"))
+    assert _parse_filters(payload) is _parse_filters(payload)
+
+    for bad in ["not json", '[{"column": "status", "op": "; DROP", "value": 1}]', '["status"]']:
+        with pytest.raises(ValueError):
+            _parse_filters(bad)
+
+    for not_a_list in ['{"column": "status", "op": "=", "value": 1}', "1"]:
+        with pytest.raises(TypeError, match="expected a list of filters"):
+            _parse_filters(not_a_list)
+
+
+def test_read_records_rejects_filter_object_with_400(client):
+    resp = client.get(
+        "/api/v1/records/read",
+        params={
+            "catalog": "CAT",
+            "schema": "SCHEMA",
+            "table": "records",
+            "filters": '{"column": "amount", "op": "=", "value": 1}',
+        },
+    )
+    assert_error(resp, 400, "expected a list of filters")
+
+
+def test_read_records_rejects_invalid_filter_operator_with_400(client):
+    resp = client.get(
+        "/api/v1/records/read",
+        params={
+            "catalog": "CAT",
+            "schema": "SCHEMA",
+            "table": "records",
+            "filters": '[{"column": "amount", "op": "OR 1=1 --", "value": 1}]',
+        },
+    )
+    assert_error(resp, 400, "Unsupported operator")
+
+
+def test_write_records_with_no_data_skips_the_warehouse(client, monkeypatch):
+    def unexpected(*args, **kwargs):
+        raise AssertionError("warehouse should not be called for an empty write")
+
+    monkeypatch.setattr(_conn, "query", unexpected)
+    monkeypatch.setattr(_conn, "execute_batch", unexpected)
+    monkeypatch.setattr(_conn, "insert_data", unexpected)
+
+    resp = client.post("/api/v1/records/write", json={**AUTO_CREATE_PAYLOAD, "data": []})
+    assert resp.status_code == 201
+    assert resp.json() == {"data": [], "count": 0, "total": 0}
+
+
+def test_write_records_uses_staged_bulk_load_for_large_batches(client, monkeypatch):
+    """Large writes go through COPY INTO only when a staging volume is configured."""
+    from backend.config.settings import settings
+    from backend.routes.v1 import records
+
+    loads = []
+
+    def fake_bulk_load(table_path, data, warehouse_id, staging_volume):
+        loads.append((table_path, len(data), staging_volume))
+        return len(data)
+
+    monkeypatch.setattr(_conn, "bulk_load", fake_bulk_load)
+    monkeypatch.setattr(records, "BULK_LOAD_MIN_ROWS", 2)
+
+    payload = {
+        "catalog": "CAT",
+        "schema_name": "SCHEMA",
+        "table": "records",
+        "data": [{"order_id": 1}, {"order_id": 2}],
+    }
+    resp = client.post("/api/v1/records/write", json=payload)
+    assert resp.status_code == 201
+    assert loads == []
+
+    monkeypatch.setattr(settings, "databricks_staging_volume", "/Volumes/CAT/SCHEMA/staging")
+    resp = client.post("/api/v1/records/write", json=payload)
+    assert resp.status_code == 201
+    assert resp.json()["count"] == 2
 
+    assert loads == [("CAT.SCHEMA.records", 2, "/Volumes/CAT/SCHEMA/staging")]
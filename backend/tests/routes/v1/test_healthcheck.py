@@ -6,89 +6,51 @@ from datetime import datetime
 import pytest
 from fastapi import status
 
+from backend.services.db import connector
 
-class TestHealthcheckEndpoint:
-    """Test suite for the healthcheck endpoint."""
+_ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:\d{2})$")
 
-    def test_healthcheck_status_code(self, client, mocker, monkeypatch):
-        """Test the healthcheck endpoint returns 200 OK."""
-        monkeypatch.setenv("DATABRICKS_WAREHOUSE_ID", "test-warehouse-id")
 
-        mock_query = mocker.patch("backend.services.db.connector.query")
-        mock_query.return_value = [[1]]
-
-        response = client.get("/api/v1/healthcheck")
-        assert response.status_code == status.HTTP_200_OK
+class TestHealthcheckEndpoint:
+    """Test suite for the healthcheck endpoint."""
 
-    def test_healthcheck_content(self, client, mocker, monkeypatch):
-        """Test the healthcheck endpoint returns the expected content."""
+    @pytest.fixture
+    def patched_query(self, mocker, monkeypatch):
+        """Configure a warehouse and replace connector.query with a mock."""
         monkeypatch.setenv("DATABRICKS_WAREHOUSE_ID", "test-warehouse-id")
+        return mocker.patch.object(connector, "query")
 
-        mock_query = mocker.patch("backend.services.db.connector.query")
-        mock_query.return_value = [[1]]
+    @pytest.fixture
+    def healthy_db(self, patched_query):
+        """Configure a warehouse whose connectivity probe succeeds."""
+        patched_query.return_value = [[1]]
+        return patched_query
 
-        response = client.get("/api/v1/healthcheck")
+    @pytest.mark.parametrize(
+        "accept_header", [None, "application/json", "application/json; charset=utf-8"]
+    )
+    def test_healthcheck_healthy(self, client, healthy_db, accept_header):
+        """Test the healthcheck reports healthy, well-formed JSON when the database is up."""
+        headers = {"Accept": accept_header} if accept_header else None
+        response = client.get("/api/v1/healthcheck", headers=headers)
         data = response.json()
 
-        assert "status" in data
-        assert "components" in data
-        assert "timestamp" in data
-        assert data["status"] == "healthy"
-        assert data["components"]["api"] == "up"
-        assert data["components"]["database"] == "connected"
-
-        timestamp = data["timestamp"]
-        assert timestamp is not None
+        assert response.status_code == status.HTTP_200_OK
+        assert "application/json" in response.headers["content-type"]
+        timestamp = data.pop("timestamp")
+        assert data == {"status": "healthy", "components": {"api": "up", "database": "connected"}}
+        healthy_db.assert_called_once()
 
-        iso_pattern = (
-            r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:\d{2})$"
-        )
-        assert re.match(
-            iso_pattern, timestamp
-        ), f"Timestamp '{timestamp}' is not in ISO format"
+        assert _ISO_RE.match(timestamp), f"Timestamp '{timestamp}' is not in ISO format"
 
         try:
             datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
         except ValueError:
             pytest.fail(f"Could not parse timestamp: {timestamp}")
 
-    @pytest.mark.parametrize(
-        "accept_header", ["application/json", "application/json; charset=utf-8"]
-    )
-    def test_healthcheck_content_type(self, client, mocker, monkeypatch, accept_header):
-        """Test the healthcheck endpoint handles different accept headers."""
-        monkeypatch.setenv("DATABRICKS_WAREHOUSE_ID", "test-warehouse-id")
-
-        mock_query = mocker.patch("backend.services.db.connector.query")
-        mock_query.return_value = [[1]]
-
-        response = client.get("/api/v1/healthcheck", headers={"Accept": accept_header})
-        assert response.status_code == status.HTTP_200_OK
-        assert "application/json" in response.headers["content-type"]
-
-    def test_healthcheck_database_connection_success(self, client, mocker, monkeypatch):
-        """Test healthcheck when database connection succeeds."""
-        monkeypatch.setenv("DATABRICKS_WAREHOUSE_ID", "test-warehouse-id")
-
-        mock_query = mocker.patch("backend.services.db.connector.query")
-        mock_query.return_value = [[1]]
-
-        response = client.get("/api/v1/healthcheck")
-        data = response.json()
-
-        assert response.status_code == status.HTTP_200_OK
-        assert data["status"] == "healthy"
-        assert "components" in data
-        assert data["components"]["api"] == "up"
-        assert data["components"]["database"] == "connected"
-        mock_query.assert_called_once()
-
-    def test_healthcheck_database_connection_failure(self, client, mocker, monkeypatch):
+    def test_healthcheck_database_connection_failure(self, client, patched_query):
         """Test healthcheck when database connection fails."""
-        monkeypatch.setenv("DATABRICKS_WAREHOUSE_ID", "test-warehouse-id")
-
-        mock_query = mocker.patch("backend.services.db.connector.query")
-        mock_query.side_effect = Exception("Connection timeout")
+        patched_query.side_effect = Exception("Connection timeout")
 
         response = client.get("/api/v1/healthcheck")
         data = response.json()
@@ -100,7 +62,7 @@ class TestHealthcheckEndpoint:
         assert "error" in data["components"]["database"]
         assert "Connection timeout" in data["components"]["database"]
 
-    def test_healthcheck_missing_warehouse_id(self, client, mocker, monkeypatch):
+    def test_healthcheck_missing_warehouse_id(self, client, monkeypatch):
         """Test healthcheck when DATABRICKS_WAREHOUSE_ID is not set."""
         monkeypatch.delenv("DATABRICKS_WAREHOUSE_ID", raising=False)
 
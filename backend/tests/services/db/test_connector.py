@@ -1,9 +1,22 @@
 """Tests for the database connector module using pytest best practices."""
 
+import asyncio
+from unittest.mock import MagicMock
+
 import pandas as pd
 import pytest
 
-from backend.services.db.connector import close_connections, get_connection, insert_data, query
+from backend.services.db import connector
+from backend.services.db.connector import (
+    ainsert_data,
+    aquery,
+    bulk_load,
+    close_connections,
+    execute_batch,
+    get_connection,
+    insert_data,
+    query,
+)
 
 
 @pytest.fixture
@@ -12,41 +25,62 @@ def mock_sql(mocker):
     return mocker.patch("backend.services.db.connector.sql")
 
 
-@pytest.fixture
-def mock_cursor(mocker):
-    """Create a mock cursor with test data."""
-    cursor = mocker.MagicMock()
-    cursor.description = [("id",), ("name",)]
-    cursor.fetchall.return_value = [(1, "Test")]
+class _StubCursor:
+    """Plain stand-in for a DB-API cursor that records every execute() call."""
+
+    def __init__(self):
+        self.description = [("id",), ("name",)]
+        self.rows = [(1, "Test")]
+        self.rowcount = 0
+        self.calls: list[tuple] = []
+        self.error: Exception | None = None
+
+    def __enter__(self):
+        return self
 
-    def execute_side_effect(query, *args, **kwargs):
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, *args):
+        self.calls.append((query, *args))
+        if self.error is not None:
+            raise self.error
         if "INSERT" in query.upper():
-            value_count = query.count("(?, ?)")
-            cursor.rowcount = value_count
+            self.rowcount = query.count("(?, ?)")
         elif "SELECT" in query.upper():
-            cursor.rowcount = len(cursor.fetchall.return_value)
+            self.rowcount = len(self.rows)
         else:
-            cursor.rowcount = 1
-        return None
+            self.rowcount = 1
+
+    def fetchall(self):
+        return self.rows
 
-    cursor.execute.side_effect = execute_side_effect
 
-    cursor.rowcount = 0
-    return cursor
+@pytest.fixture(scope="class")
+def _connection_skeleton():
+    """One connection mock per test class; mock_connection resets and rewires it per test."""
+    return MagicMock()
 
 
 @pytest.fixture
-def mock_connection(mocker, mock_cursor):
+def mock_cursor():
+    """Create a stub cursor with test data."""
+    return _StubCursor()
+
+
+@pytest.fixture
+def mock_connection(_connection_skeleton, mock_cursor):
     """Create a mock database connection."""
-    conn = mocker.MagicMock()
-    conn.cursor.return_value.__enter__.return_value = mock_cursor
+    conn = _connection_skeleton
+    conn.reset_mock(return_value=True, side_effect=True)
+    conn.cursor.return_value = mock_cursor
     return conn
 
 
 class TestDatabaseConnector:
     """Tests for the database connector functionality."""
 
-    def test_get_connection_creates_proper_connection(self, mocker, mock_sql):
+    def test_get_connection_creates_proper_connection(self, mock_sql):
         """Test that get_connection creates a connection with the correct parameters."""
         # Arrange
         warehouse_id = "test-warehouse-id"
@@ -70,7 +104,7 @@ class TestDatabaseConnector:
         assert len(result) == 1
         assert result[0]["id"] == 1
         assert result[0]["name"] == "Test"
-        mock_cursor.execute.assert_called_once_with(test_query)
+        assert mock_cursor.calls == [(test_query,)]
 
     def test_query_returns_dataframe(self, mocker, mock_connection, mock_cursor):
         """Test that query returns results as a DataFrame when as_dict=False."""
@@ -84,7 +118,7 @@ class TestDatabaseConnector:
         assert len(result) == 1
         assert result.iloc[0]["id"] == 1
         assert result.iloc[0]["name"] == "Test"
-        mock_cursor.execute.assert_called_once_with(test_query)
+        assert mock_cursor.calls == [(test_query,)]
 
     def test_query_handles_exceptions(self, mocker):
         """Test that query properly handles and wraps exceptions."""
@@ -100,19 +134,184 @@ class TestDatabaseConnector:
         assert "Query failed" in str(exc_info.value)
         assert "Database connection error" in str(exc_info.value)
 
-    def test_close_connections_clears_cache(self, mocker):
-        """Test that close_connections clears the connection cache."""
-        mock_cache_clear = mocker.patch.object(get_connection, "cache_clear")
+    def test_aquery_runs_query_off_the_event_loop(self, mocker):
+        """Test that aquery delegates to query with the same arguments."""
+        mock_query = mocker.patch(
+            "backend.services.db.connector.query", return_value=[{"id": 1}]
+        )
+
+        result = asyncio.run(aquery("SELECT 1", "warehouse-id", params=[1]))
+
+        assert result == [{"id": 1}]
+        mock_query.assert_called_once_with(
+            "SELECT 1", warehouse_id="warehouse-id", as_dict=True, params=[1]
+        )
+
+    def test_aquery_rejects_calls_beyond_pool_capacity(self, mocker):
+        """Test that async calls past max_size + max_queued fail without reaching the executor."""
+        mock_query = mocker.patch("backend.services.db.connector.query", return_value=[])
+        pool = connector.ConnectionPool("warehouse-id", max_size=1, max_queued=1)
+        mocker.patch("backend.services.db.connector._pool_for", return_value=pool)
+
+        assert pool.try_admit() and pool.try_admit()
+        with pytest.raises(connector.PoolTimeoutError):
+            asyncio.run(aquery("SELECT 1", "warehouse-id"))
+        mock_query.assert_not_called()
+
+        pool.leave()
+        asyncio.run(aquery("SELECT 1", "warehouse-id"))
+        mock_query.assert_called_once()
+        # The finished call gave its place back
+        assert pool.try_admit()
+
+    def test_ainsert_data_delegates_to_insert_data(self, mocker):
+        """Test that ainsert_data runs insert_data with the same arguments."""
+        mock_insert = mocker.patch("backend.services.db.connector.insert_data", return_value=2)
+
+        result = asyncio.run(ainsert_data("c.s.t", [{"id": 1}, {"id": 2}], "warehouse-id"))
+
+        assert result == 2
+        mock_insert.assert_called_once_with(
+            table_path="c.s.t", data=[{"id": 1}, {"id": 2}], warehouse_id="warehouse-id"
+        )
+
+    def test_execute_batch_reuses_one_cursor(self, mocker, mock_connection, mock_cursor):
+        """Test that execute_batch runs every statement in order on a single cursor."""
+        statements = ["CREATE CATALOG IF NOT EXISTS c", "CREATE SCHEMA IF NOT EXISTS c.s"]
+        mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
+
+        execute_batch(statements, "warehouse-id")
+
+        mock_connection.cursor.assert_called_once()
+        assert [c[0] for c in mock_cursor.calls] == statements
+
+    def test_execute_batch_wraps_errors(self, mocker, mock_connection, mock_cursor):
+        """Test that a failing statement surfaces as a batch failure."""
+        mock_cursor.error = ValueError("syntax error")
+        mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
+
+        with pytest.raises(Exception) as exc_info:
+            execute_batch(["CREATE CATALOG c"], "warehouse-id")
+
+        assert "Batch execution failed" in str(exc_info.value)
+
+    def test_close_connections_closes_pooled_connections(self, mocker, mock_connection):
+        """Test that close_connections closes idle pooled connections and empties the pool."""
+        get_conn = mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
+        query("SELECT 1", "warehouse-id")
 
         close_connections()
 
-        mock_cache_clear.assert_called_once()
+        mock_connection.close.assert_called_once()
+        query("SELECT 1", "warehouse-id")
+        assert get_conn.call_count == 2
+
+    def test_pool_reuses_idle_connection(self, mocker, mock_connection):
+        """Test that sequential queries share one pooled connection."""
+        get_conn = mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
+
+        query("SELECT 1", "warehouse-id")
+        query("SELECT 2", "warehouse-id")
+
+        get_conn.assert_called_once_with("warehouse-id")
+
+    def test_pool_drops_dead_idle_connection(self, mocker, make_conn):
+        """Test that a stale idle connection failing its ping is replaced."""
+        dead = make_conn(execute_error=ConnectionError("gone"))
+        fresh = make_conn(fetchall=[(1,)], description=[("x",)])
+        mocker.patch("backend.services.db.connector.get_connection", side_effect=[dead, fresh])
+        mocker.patch("backend.services.db.connector.POOL_PING_AFTER_SECONDS", 0.0)
+
+        pool = connector._pool_for("warehouse-id")
+        with pool.acquire():
+            pass
+
+        assert query("SELECT 1", "warehouse-id") == [{"x": 1}]
+        dead.close.assert_called_once()
+
+    def test_pool_discards_connection_that_failed_in_use(self, mocker, make_conn):
+        """Test that a pooled connection failing mid-query is closed and the retry opens a new one."""
+        stale = make_conn(execute_error=ConnectionError("Connection reset by peer"))
+        fresh = make_conn(fetchall=[(1,)], description=[("x",)])
+        get_conn = mocker.patch("backend.services.db.connector.get_connection", return_value=fresh)
+        pool = connector._pool_for("warehouse-id")
+        pool.add_idle([stale])
+
+        assert query("SELECT 1", "warehouse-id") == [{"x": 1}]
+
+        stale.close.assert_called_once()
+        get_conn.assert_called_once_with("warehouse-id")
+        assert [conn for conn, _ in pool._idle] == [fresh]
+
+    def test_pool_keeps_connection_after_statement_error(self, make_conn):
+        """Test that a connection whose statement was rejected goes back to the pool."""
+        conn = make_conn(execute_error=connector.sql.exc.ServerOperationError("[PARSE_SYNTAX_ERROR]"))
+        pool = connector._pool_for("warehouse-id")
+        pool.add_idle([conn])
+
+        with pytest.raises(Exception, match="Query failed"):
+            query("SELCT 1", "warehouse-id")
+
+        conn.close.assert_not_called()
+        assert [idle for idle, _ in pool._idle] == [conn]
+
+    def test_pool_times_out_when_exhausted(self, mocker, mock_connection):
+        """Test that acquire gives up once every connection is checked out."""
+        mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
+        mocker.patch("backend.services.db.connector.POOL_ACQUIRE_TIMEOUT_SECONDS", 0.01)
+        pool = connector.ConnectionPool("warehouse-id", max_size=1)
+
+        with pool.acquire(), pytest.raises(connector.PoolTimeoutError), pool.acquire():
+            pass
+
+    def test_warm_pool_opens_connections_up_front(self, mocker):
+        """Test that warm_pool parks connections that later queries reuse."""
+        conns = [mocker.MagicMock() for _ in range(3)]
+        get_conn = mocker.patch(
+            "backend.services.db.connector.get_connection",
+            side_effect=[*conns[:2], ConnectionError("refused")],
+        )
+
+        assert asyncio.run(connector.warm_pool("warehouse-id", size=3)) == 2
+        query("SELECT 1", "warehouse-id")
+
+        assert get_conn.call_count == 3
+        assert len(connector._pool_for("warehouse-id")._idle) == 2
+
+    def test_ping_idle_connections_drops_dead_ones(self, make_conn):
+        """Test that the keepalive ping closes idle connections that no longer answer."""
+        dead, alive = make_conn(execute_error=ConnectionError("gone")), make_conn()
+        pool = connector._pool_for("warehouse-id")
+        pool.add_idle([dead, alive])
+
+        connector.ping_idle_connections()
+
+        assert [conn for conn, _ in pool._idle] == [alive]
+        dead.close.assert_called_once()
+
+
+_EXPECTED_INSERT_SQL_FRAGMENTS = (
+    "INSERT INTO test_catalog.test_schema.test_table",
+    "(id, name)",
+    "VALUES (?, ?), (?, ?)",
+)
+_EXPECTED_INSERT_PARAMS = [1, "Test1", 2, "Test2"]
 
 
 class TestInsertData:
     """Test suite for insert_data function."""
 
-    def test_insert_data_success(self, mocker, mock_connection):
+    def test_insert_data_success(self, mocker, mock_connection, mock_cursor):
         """Test successful data insertion."""
         test_data = [{"id": 1, "name": "Test1"}, {"id": 2, "name": "Test2"}]
 
@@ -128,18 +327,29 @@ class TestInsertData:
 
         assert result == 2
 
-        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
-        mock_cursor.execute.assert_called_once()
+        assert len(mock_cursor.calls) == 1
+        sql, params = mock_cursor.calls[0]
 
-        call_args = mock_cursor.execute.call_args[0]
-        sql = call_args[0]
-        params = call_args[1]
+        for fragment in _EXPECTED_INSERT_SQL_FRAGMENTS:
+            assert fragment in sql
+        assert params == _EXPECTED_INSERT_PARAMS
 
-        assert "INSERT INTO test_catalog.test_schema.test_table" in sql
-        assert "(id, name)" in sql
-        assert "VALUES (?, ?), (?, ?)" in sql
+    def test_insert_data_single_row(self, mocker, mock_connection, mock_cursor):
+        """Test that a single record is bound straight from its values."""
+        mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
 
-        assert params == [1, "Test1", 2, "Test2"]
+        result = insert_data(
+            table_path="test_catalog.test_schema.test_table",
+            data=[{"id": 7, "name": "Solo"}],
+            warehouse_id="test-warehouse-123",
+        )
+
+        assert result == 1
+        sql, params = mock_cursor.calls[-1]
+        assert "VALUES (?, ?)" in sql
+        assert params == [7, "Solo"]
 
     def test_insert_data_empty(self, mocker, mock_connection):
         """Test insertion with empty data list."""
@@ -156,10 +366,9 @@ class TestInsertData:
         assert result == 0
         mock_connection.cursor.assert_not_called()
 
-    def test_insert_data_error(self, mocker, mock_connection):
+    def test_insert_data_error(self, mocker, mock_connection, mock_cursor):
         """Test error handling during insertion."""
-        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
-        mock_cursor.execute.side_effect = Exception("Database error")
+        mock_cursor.error = Exception("Database error")
 
         mocker.patch(
             "backend.services.db.connector.get_connection", return_value=mock_connection
@@ -193,3 +402,100 @@ class TestInsertData:
             )
 
         assert "Failed to insert data" in str(exc_info.value)
+
+    def test_insert_data_splits_large_batches(self, mocker, mock_connection, mock_cursor):
+        """Test that large inserts are chunked into INSERT_BATCH_ROWS-row statements."""
+        mocker.patch("backend.services.db.connector.INSERT_BATCH_ROWS", 2)
+        mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
+        test_data = [{"id": i, "name": f"Test{i}"} for i in range(5)]
+
+        result = insert_data(
+            table_path="test_catalog.test_schema.test_table",
+            data=test_data,
+            warehouse_id="test-warehouse-123",
+        )
+
+        assert result == 5
+        mock_connection.cursor.assert_called_once()
+        calls = mock_cursor.calls
+        assert [c[0].count("(?, ?)") for c in calls] == [2, 2, 1]
+        assert calls[-1][1] == [4, "Test4"]
+
+    def test_insert_data_respects_parameter_limit(self, mocker, mock_connection, mock_cursor):
+        """Test that each INSERT stays within the warehouse's bind parameter limit."""
+        mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
+        test_data = [{"id": i, "name": f"Test{i}"} for i in range(300)]
+
+        result = insert_data(
+            table_path="test_catalog.test_schema.test_table",
+            data=test_data,
+            warehouse_id="test-warehouse-123",
+        )
+
+        assert result == 300
+        calls = mock_cursor.calls
+        assert [len(c[1]) for c in calls] == [256, 256, 88]
+
+    def test_insert_data_reuses_cached_sql(self, mocker, mock_connection, mock_cursor):
+        """Test that repeated inserts of the same shape reuse the built INSERT text."""
+        mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
+        connector._build_insert_sql.cache_clear()
+
+        for i in range(3):
+            insert_data(
+                table_path="test_catalog.test_schema.test_table",
+                data=[{"id": i, "name": f"Test{i}"}],
+                warehouse_id="test-warehouse-123",
+            )
+
+        info = connector._build_insert_sql.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+        sqls = {c[0] for c in mock_cursor.calls}
+        assert len(sqls) == 1
+
+
+class TestBulkLoad:
+    """Test suite for the staged COPY INTO bulk_load function."""
+
+    @pytest.fixture
+    def mock_files(self, mocker):
+        mocker.patch("backend.services.db.connector._get_config", return_value=mocker.MagicMock())
+        client = mocker.patch("backend.services.db.connector.WorkspaceClient")
+        return client.return_value.files
+
+    def test_bulk_load_stages_file_and_copies(self, mocker, mock_files, mock_connection, mock_cursor):
+        """Test that records are staged as NDJSON, copied in, and the file removed."""
+        mock_cursor.description = [("num_affected_rows",), ("num_inserted_rows",)]
+        mock_cursor.rows = [(2, 2)]
+        mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
+
+        result = bulk_load("c.s.t", [{"id": 1}, {"id": 2}], "warehouse-id", "/Volumes/c/s/staging/")
+
+        assert result == 2
+        file_path, contents = mock_files.upload.call_args.args
+        assert file_path.startswith("/Volumes/c/s/staging/") and file_path.endswith(".json")
+        assert contents.read() == b'{"id":1}\n{"id":2}'
+        sql = mock_cursor.calls[-1][0]
+        assert sql.startswith(f"COPY INTO c.s.t FROM '{file_path}' FILEFORMAT = JSON")
+        mock_files.delete.assert_called_once_with(file_path)
+
+    def test_bulk_load_removes_staged_file_on_failure(self, mocker, mock_files, mock_connection, mock_cursor):
+        """Test that a failed COPY INTO is wrapped and still cleans up the staged file."""
+        mock_cursor.error = ValueError("copy failed")
+        mocker.patch(
+            "backend.services.db.connector.get_connection", return_value=mock_connection
+        )
+
+        with pytest.raises(Exception) as exc_info:
+            bulk_load("c.s.t", [{"id": 1}], "warehouse-id", "/Volumes/c/s/staging")
+
+        assert "Failed to bulk load data" in str(exc_info.value)
+        mock_files.delete.assert_called_once()
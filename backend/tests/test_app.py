@@ -1,5 +1,9 @@
 """Tests for the main application."""
 
+import asyncio
+import threading
+import time
+
 import pytest
 from fastapi import status
 
@@ -38,3 +42,30 @@ class TestMainApplication:
         """Test that non-existent endpoints return 404."""
         response = client.get(endpoint)
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_shutdown_waits_for_in_flight_keepalive_ping(monkeypatch):
+    """Pools are not closed while a keepalive ping is still running."""
+    from backend.app import app, lifespan
+
+    events = []
+    ping_started = threading.Event()
+
+    def slow_ping():
+        ping_started.set()
+        time.sleep(0.1)
+        events.append("ping done")
+
+    monkeypatch.setattr("backend.services.db.connector.POOL_KEEPALIVE_SECONDS", 0)
+    monkeypatch.setattr("backend.services.db.connector.ping_idle_connections", slow_ping)
+    monkeypatch.setattr(
+        "backend.services.db.connector.close_connections",
+        lambda: events.append("closed"),
+    )
+
+    async with lifespan(app):
+        while not ping_started.is_set():
+            await asyncio.sleep(0.005)
+
+    assert events == ["ping done", "closed"]
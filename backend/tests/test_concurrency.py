@@ -1,336 +1,235 @@
 """Tests for concurrent request handling."""
 
+import asyncio
 import threading
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 
+import orjson
 import pytest
-from fastapi.testclient import TestClient
-
-from backend.app import app
-
 
+_DESCRIBE_ROWS = (
+    {"col_name": "id", "data_type": "bigint"},
+    {"col_name": "name", "data_type": "string"},
+    {"col_name": "value", "data_type": "double"},
+    {"col_name": "is_deleted", "data_type": "boolean"},
+)
+_COUNT_ROWS = ({"cnt": 1},)
+_SELECT_ROWS = ({"id": 1, "name": "Test", "value": 100.5},)
+
+_JSON_HEADERS = {"content-type": "application/json"}
+_TABLE_BASE = {"catalog": "test", "schema": "test", "table": "test_table"}
+_READ_PARAMS = {**_TABLE_BASE, "limit": 10}
+_RECORD_BASE = {"catalog": "test", "schema_name": "test", "table": "records", "key_column": "id"}
+
+
+def _write_body(record_id: int) -> bytes:
+    """Encode a single-record write payload once, outside the request call."""
+    return orjson.dumps({**_TABLE_BASE, "data": [{"id": record_id, "name": f"Record_{record_id}"}]})
+
+
+# (method, url, per-request kwargs builder, request count, expected status) for plain fan-outs.
+_FAN_OUT_CASES = [
+    pytest.param(
+        "POST", "/api/v1/records/write",
+        lambda i: {"content": _write_body(i), "headers": _JSON_HEADERS},
+        5, 201, id="write",
+    ),
+    pytest.param(
+        "GET", "/api/v1/records/read",
+        lambda i: {"params": {**_READ_PARAMS, "table": "records", "offset": i * 10}},
+        5, 200, id="read-paged",
+    ),
+    pytest.param(
+        "GET", "/api/v1/records/read",
+        lambda i: {"params": {**_READ_PARAMS, "table": f"table_{i}"}},
+        3, 200, id="read-tables",
+    ),
+    pytest.param(
+        "PUT", "/api/v1/records/update",
+        lambda i: {
+            "content": orjson.dumps({**_RECORD_BASE, "key_value": i + 1, "updates": {"status": "updated"}}),
+            "headers": _JSON_HEADERS,
+        },
+        5, 200, id="update",
+    ),
+    pytest.param(
+        "DELETE", "/api/v1/records/delete",
+        lambda i: {
+            "content": orjson.dumps({**_RECORD_BASE, "key_value": i + 1, "soft": True}),
+            "headers": _JSON_HEADERS,
+        },
+        3, 200, id="soft-delete",
+    ),
+]
+
+
+@pytest.mark.asyncio(loop_scope="session")
 class TestConcurrentRequests:
     """Test suite for concurrent request handling."""
 
     @pytest.fixture(autouse=True)
     def patch_connector(self, monkeypatch):
         """Mock database connector with simulated delays."""
-        self.concurrent_calls = []
-        self.lock = threading.Lock()
+        # deque.append is atomic, so worker threads can record calls without a lock.
+        self.concurrent_calls = deque()
+        # Optional callable run inside each fake SELECT, for tests that instrument calls.
+        self.query_hook = None
 
         def fake_query(sql_query, warehouse_id, as_dict=True, params=None):
             sql_upper = sql_query.strip().upper()
 
             if sql_upper.startswith("DESCRIBE"):
-                return [
-                    {"col_name": "id", "data_type": "bigint"},
-                    {"col_name": "name", "data_type": "string"},
-                    {"col_name": "value", "data_type": "double"},
-                    {"col_name": "is_deleted", "data_type": "boolean"},
-                ]
+                return list(_DESCRIBE_ROWS)
 
             if "COUNT(*)" in sql_upper or "SELECT COUNT" in sql_upper:
-                return [{"cnt": 1}]
+                return list(_COUNT_ROWS)
 
-            with self.lock:
-                call_time = time.time()
-                self.concurrent_calls.append({
-                    "query": sql_query,
-                    "time": call_time,
-                    "thread": threading.current_thread().name
-                })
+            self.concurrent_calls.append({
+                "query": sql_query,
+                "tid": threading.get_ident()
+            })
 
-            time.sleep(0.1)
+            if self.query_hook is not None:
+                self.query_hook()
 
-            return [{"id": 1, "name": "Test", "value": 100.5}]
+            return list(_SELECT_ROWS)
 
         def fake_insert(table_path, data, warehouse_id):
-            with self.lock:
-                self.concurrent_calls.append({
-                    "operation": "insert",
-                    "time": time.time(),
-                    "thread": threading.current_thread().name
-                })
-            time.sleep(0.1)
+            self.concurrent_calls.append({
+                "operation": "insert",
+                "tid": threading.get_ident()
+            })
             return len(data)
 
         monkeypatch.setattr("backend.services.db.connector.query", fake_query)
         monkeypatch.setattr("backend.services.db.connector.insert_data", fake_insert)
 
-    def test_concurrent_read_requests(self):
+    async def test_concurrent_read_requests(self, async_client):
         """Test multiple concurrent read requests."""
-        with TestClient(app) as client:
-            def make_request(request_id):
-                resp = client.get(
-                    "/api/v1/records/read",
-                    params={
-                        "catalog": "test",
-                        "schema": "test",
-                        "table": "test_table",
-                        "limit": 10,
-                        "offset": request_id * 10
-                    }
-                )
-                return resp.status_code, request_id
-
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                futures = [executor.submit(make_request, i) for i in range(10)]
-                results = [future.result() for future in as_completed(futures)]
-
-            assert len(results) == 10
-            for status_code, _request_id in results:
-                assert status_code == 200
-
-            assert len(self.concurrent_calls) == 10
-
-    def test_concurrent_write_requests(self):
-        """Test multiple concurrent write requests."""
-        with TestClient(app) as client:
-            def make_insert(request_id):
-                resp = client.post(
-                    "/api/v1/records/write",
-                    json={
-                        "catalog": "test",
-                        "schema": "test",
-                        "table": "test_table",
-                        "data": [{"id": request_id, "name": f"Record_{request_id}"}]
-                    }
-                )
-                return resp.status_code, request_id
-
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = [executor.submit(make_insert, i) for i in range(5)]
-                results = [future.result() for future in as_completed(futures)]
-
-            assert len(results) == 5
-            for status_code, _ in results:
-                assert status_code == 201
-
-    def test_mixed_concurrent_operations(self):
+        async def make_request(request_id):
+            resp = await async_client.get(
+                "/api/v1/records/read",
+                params={**_READ_PARAMS, "offset": request_id * 10}
+            )
+            return resp.status_code, request_id
+
+        results = await asyncio.gather(*[make_request(i) for i in range(10)])
+
+        assert len(results) == 10
+        for status_code, _request_id in results:
+            assert status_code == 200
+
+        assert len(self.concurrent_calls) == 10
+
+    @pytest.mark.parametrize(
+        ("method", "url", "request_kwargs", "count", "expected_status"), _FAN_OUT_CASES
+    )
+    async def test_concurrent_fan_out(
+        self, async_client, method, url, request_kwargs, count, expected_status
+    ):
+        """Fan out requests to one endpoint and expect every one to succeed."""
+        kwargs_list = [request_kwargs(i) for i in range(count)]
+        responses = await asyncio.gather(
+            *[async_client.request(method, url, **kwargs) for kwargs in kwargs_list]
+        )
+
+        assert [resp.status_code for resp in responses] == [expected_status] * count
+
+    async def test_mixed_concurrent_operations(self, async_client):
         """Test concurrent mix of read and write operations."""
-        with TestClient(app) as client:
-            def make_read():
-                return client.get(
-                    "/api/v1/records/read",
-                    params={
-                        "catalog": "test",
-                        "schema": "test",
-                        "table": "test_table",
-                        "limit": 10
-                    }
-                ).status_code
-
-            def make_write(i):
-                return client.post(
-                    "/api/v1/records/write",
-                    json={
-                        "catalog": "test",
-                        "schema": "test",
-                        "table": "test_table",
-                        "data": [{"id": i, "name": f"Record_{i}"}]
-                    }
-                ).status_code
-
-            with ThreadPoolExecutor(max_workers=8) as executor:
-                futures = []
-                for i in range(4):
-                    futures.append(executor.submit(make_read))
-                    futures.append(executor.submit(make_write, i))
-
-                results = [future.result() for future in as_completed(futures)]
-
-            assert len(results) == 8
-            for status_code in results:
-                assert status_code in [200, 201]
-
-    def test_concurrent_records_operations(self):
-        """Test concurrent operations on records endpoint."""
-        with TestClient(app) as client:
-            def read_records(offset):
-                return client.get(
-                    "/api/v1/records/read",
-                    params={
-                        "catalog": "test",
-                        "schema": "test",
-                        "table": "records",
-                        "limit": 10,
-                        "offset": offset
-                    }
-                ).status_code
-
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = [executor.submit(read_records, i * 10) for i in range(5)]
-                results = [future.result() for future in as_completed(futures)]
-
-            assert len(results) == 5
-            for status_code in results:
-                assert status_code == 200
-
-    def test_concurrent_healthcheck_requests(self, mocker):
+        async def make_read():
+            resp = await async_client.get("/api/v1/records/read", params=_READ_PARAMS)
+            return resp.status_code
+
+        async def make_write(body):
+            resp = await async_client.post("/api/v1/records/write", content=body, headers=_JSON_HEADERS)
+            return resp.status_code
+
+        coros = []
+        for i in range(4):
+            coros.append(make_read())
+            coros.append(make_write(_write_body(i)))
+        results = await asyncio.gather(*coros)
+
+        assert len(results) == 8
+        for status_code in results:
+            assert status_code in [200, 201]
+
+    async def test_concurrent_healthcheck_requests(self, async_client, mocker):
         """Test that healthcheck can handle many concurrent requests."""
         mock_query = mocker.patch("backend.services.db.connector.query")
         mock_query.return_value = [[1]]
 
-        with TestClient(app) as client:
-            def check_health():
-                return client.get("/api/v1/healthcheck").status_code
-
-            with ThreadPoolExecutor(max_workers=20) as executor:
-                futures = [executor.submit(check_health) for _ in range(20)]
-                results = [future.result() for future in as_completed(futures)]
-
-            assert len(results) == 20
-            for status_code in results:
-                assert status_code == 200
-
-    def test_concurrent_requests_different_warehouses(self):
-        """Test concurrent requests to different warehouses."""
-        with TestClient(app) as client:
-            def make_request(warehouse_id):
-                return client.get(
-                    "/api/v1/records/read",
-                    params={
-                        "catalog": "test",
-                        "schema": "test",
-                        "table": f"table_{warehouse_id}",
-                        "limit": 10
-                    }
-                ).status_code
-
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                futures = [executor.submit(make_request, i) for i in range(3)]
-                results = [future.result() for future in as_completed(futures)]
-
-            assert all(status == 200 for status in results)
-
-    def test_concurrent_update_operations(self):
-        """Test concurrent update operations."""
-        with TestClient(app) as client:
-            def update_order(order_id):
-                return client.put(
-                    "/api/v1/records/update",
-                    json={
-                        "catalog": "test",
-                        "schema_name": "test",
-                        "table": "records",
-                        "key_column": "id",
-                        "key_value": order_id,
-                        "updates": {"status": "updated"}
-                    }
-                ).status_code
-
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = [executor.submit(update_order, i) for i in range(1, 6)]
-                results = [future.result() for future in as_completed(futures)]
-
-            assert all(status == 200 for status in results)
-
-    def test_concurrent_delete_operations(self):
-        """Test concurrent delete operations."""
-        with TestClient(app) as client:
-            def delete_order(order_id):
-                return client.request(
-                    "DELETE",
-                    "/api/v1/records/delete",
-                    json={
-                        "catalog": "test",
-                        "schema_name": "test",
-                        "table": "records",
-                        "key_column": "id",
-                        "key_value": order_id,
-                        "soft": True
-                    }
-                ).status_code
-
-            with ThreadPoolExecutor(max_workers=3) as executor:
-                futures = [executor.submit(delete_order, i) for i in range(1, 4)]
-                results = [future.result() for future in as_completed(futures)]
-
-            assert all(status == 200 for status in results)
-
-    def test_race_condition_on_same_resource(self):
-        """Test race condition when multiple requests modify same resource."""
-        with TestClient(app) as client:
-            def update_same_order(new_value):
-                return client.put(
-                    "/api/v1/records/update",
-                    json={
-                        "catalog": "test",
-                        "schema_name": "test",
-                        "table": "records",
-                        "key_column": "id",
-                        "key_value": 1,
-                        "updates": {"status": f"status_{new_value}"}
-                    }
-                ).status_code
-
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = [executor.submit(update_same_order, i) for i in range(5)]
-                results = [future.result() for future in as_completed(futures)]
-
-            assert all(status == 200 for status in results)
-
-    def test_sequential_vs_concurrent_performance(self):
-        """Compare sequential vs concurrent request performance."""
-        with TestClient(app) as client:
-            def make_request():
-                return client.get(
-                    "/api/v1/records/read",
-                    params={
-                        "catalog": "test",
-                        "schema": "test",
-                        "table": "test_table",
-                        "limit": 10
-                    }
-                )
-
-            num_requests = 5
-
-            start = time.time()
-            for _ in range(num_requests):
-                make_request()
-            sequential_time = time.time() - start
-
-            start = time.time()
-            with ThreadPoolExecutor(max_workers=num_requests) as executor:
-                futures = [executor.submit(make_request) for _ in range(num_requests)]
-                [future.result() for future in as_completed(futures)]
-            concurrent_time = time.time() - start
-
-            assert concurrent_time < sequential_time * 1.5
-            assert sequential_time > 0
-            assert concurrent_time > 0
-
-    def test_concurrent_requests_thread_safety(self):
-        """Verify thread safety of concurrent operations."""
-        with TestClient(app) as client:
-            errors = []
-
-            def make_request_safe(request_id):
-                try:
-                    resp = client.get(
-                        "/api/v1/records/read",
-                        params={
-                            "catalog": "test",
-                            "schema": "test",
-                            "table": "test_table",
-                            "limit": 10,
-                            "offset": request_id * 10
-                        }
-                    )
-                    return resp.status_code
-                except Exception as e:
-                    errors.append(str(e))
-                    return None
-
-            with ThreadPoolExecutor(max_workers=15) as executor:
-                futures = [executor.submit(make_request_safe, i) for i in range(15)]
-                results = [future.result() for future in as_completed(futures)]
-
-            assert len(errors) == 0
-            assert len(errors) == 0
-            assert all(status == 200 for status in results if status is not None)
+        async def check_health():
+            return (await async_client.get("/api/v1/healthcheck")).status_code
 
+        results = await asyncio.gather(*[check_health() for _ in range(20)])
 
+        assert len(results) == 20
+        for status_code in results:
+            assert status_code == 200
 
+    async def test_race_condition_on_same_resource(self, async_client):
+        """Test race condition when multiple requests modify same resource."""
+        async def update_same_order(body):
+            resp = await async_client.put("/api/v1/records/update", content=body, headers=_JSON_HEADERS)
+            return resp.status_code
+
+        bodies = [
+            orjson.dumps({**_RECORD_BASE, "key_value": 1, "updates": {"status": f"status_{i}"}})
+            for i in range(5)
+        ]
+        results = await asyncio.gather(*[update_same_order(body) for body in bodies])
+
+        assert all(status == 200 for status in results)
+
+    async def test_sequential_vs_concurrent_in_flight_queries(self, async_client):
+        """Sequential requests query one at a time; gathered requests overlap fully."""
+        num_requests = 5
+        lock = threading.Lock()
+        in_flight = {"current": 0, "peak": 0}
+        barrier = None
+
+        def track_in_flight():
+            with lock:
+                in_flight["current"] += 1
+                in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+            if barrier is not None:
+                # Only passes once every gathered request is inside the connector at once.
+                barrier.wait(timeout=5)
+            with lock:
+                in_flight["current"] -= 1
+
+        self.query_hook = track_in_flight
+
+        async def make_request():
+            resp = await async_client.get("/api/v1/records/read", params=_READ_PARAMS)
+            return resp.status_code
+
+        for _ in range(num_requests):
+            assert await make_request() == 200
+        assert in_flight["peak"] == 1
+
+        in_flight["peak"] = 0
+        barrier = threading.Barrier(num_requests)
+        results = await asyncio.gather(*[make_request() for _ in range(num_requests)])
+
+        assert results == [200] * num_requests
+        assert in_flight["peak"] == num_requests
+
+    async def test_concurrent_requests_thread_safety(self, async_client):
+        """Verify thread safety of concurrent operations."""
+        async def make_request_safe(request_id):
+            resp = await async_client.get(
+                "/api/v1/records/read",
+                params={**_READ_PARAMS, "offset": request_id * 10}
+            )
+            return resp.status_code
+
+        results = await asyncio.gather(
+            *[make_request_safe(i) for i in range(15)], return_exceptions=True
+        )
+
+        errors = [str(r) for r in results if isinstance(r, BaseException)]
+        assert len(errors) == 0
+        assert all(status == 200 for status in results)
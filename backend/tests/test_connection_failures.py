@@ -1,81 +1,109 @@
 """Tests for database connection failure scenarios."""
 
+import time
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
-from fastapi.testclient import TestClient
-
-from backend.app import app
-from backend.services.db.connector import close_connections, insert_data, query
+from databricks.sql import exc as sql_exc
+
+from backend.config.settings import get_settings
+from backend.services.db.connector import (
+    POOL_ACQUIRE_TIMEOUT_SECONDS,
+    CircuitOpenError,
+    _pool_for,
+    close_connections,
+    insert_data,
+    query,
+)
+from backend.tests.helpers import assert_error
+
+
+def _run_query():
+    return query("SELECT * FROM test", "warehouse-123")
+
+
+def _run_insert():
+    return insert_data("catalog.schema.table", [{"id": 1, "name": "test"}], "warehouse-123")
+
+
+# (where the driver fails, raised error, connector call, expected wrapped message)
+_DRIVER_FAILURES = [
+    pytest.param("cursor", TimeoutError("Connection timeout"), _run_query, "Query failed", id="query-timeout"),
+    pytest.param("execute", ConnectionError("Network unreachable"), _run_query, "Query failed", id="query-network"),
+    pytest.param("execute", PermissionError("Authentication failed"), _run_query, "Query failed", id="query-auth"),
+    pytest.param(
+        "execute", SyntaxError("SQL syntax error near 'SELCT'"), _run_query, "Query failed", id="query-syntax"
+    ),
+    pytest.param(
+        "cursor", ConnectionError("Connection lost"), _run_insert, "Failed to insert data", id="insert-connection"
+    ),
+    pytest.param(
+        "execute", ValueError("Unique constraint violation"), _run_insert, "Failed to insert data",
+        id="insert-constraint",
+    ),
+]
+
+
+@pytest.fixture(scope="class")
+def _driver_skeleton(make_conn):
+    """One connection/cursor mock pair per test class; driver resets and rewires it per test."""
+    conn = make_conn()
+    return conn, conn.cursor.return_value
+
+
+@pytest.fixture
+def driver(mocker, _driver_skeleton):
+    """Patch get_connection to hand out a mock connection whose failures the test chooses."""
+    conn, cursor = _driver_skeleton
+    conn.reset_mock(return_value=True, side_effect=True)
+    cursor.reset_mock(return_value=True, side_effect=True)
+    # Resetting return values makes __exit__ return a truthy mock, which would swallow errors
+    cursor.__enter__.return_value = cursor
+    cursor.__exit__.return_value = False
+    conn.cursor.return_value = cursor
+    mocker.patch("backend.services.db.connector.get_connection", return_value=conn)
+
+    def fail(fail_at, error):
+        """Raise error when a cursor is opened ("cursor") or a statement runs ("execute")."""
+        (conn.cursor if fail_at == "cursor" else cursor.execute).side_effect = error
+
+    return SimpleNamespace(conn=conn, cursor=cursor, fail=fail)
 
 
 class TestConnectionFailures:
     """Test suite for database connection failure handling."""
 
-    def test_query_with_connection_timeout(self, mocker):
-        """Test query behavior when connection times out."""
-        mock_conn = MagicMock()
-        mock_conn.cursor.side_effect = TimeoutError("Connection timeout")
-
-        mocker.patch(
-            "backend.services.db.connector.get_connection",
-            return_value=mock_conn
-        )
-
-        with pytest.raises(Exception, match="Query failed"):
-            query("SELECT * FROM test", "warehouse-123")
-
-    def test_query_with_network_error(self, mocker):
-        """Test query behavior when network fails."""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.execute.side_effect = ConnectionError("Network unreachable")
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-
-        mocker.patch(
-            "backend.services.db.connector.get_connection",
-            return_value=mock_conn
-        )
-
-        with pytest.raises(Exception, match="Query failed"):
-            query("SELECT * FROM test", "warehouse-123")
-
-    def test_query_with_authentication_failure(self, mocker):
-        """Test query behavior when authentication fails."""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.execute.side_effect = PermissionError("Authentication failed")
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-
-        mocker.patch(
-            "backend.services.db.connector.get_connection",
-            return_value=mock_conn
-        )
-
-        with pytest.raises(Exception, match="Query failed"):
-            query("SELECT * FROM test", "warehouse-123")
-
-    def test_insert_with_connection_failure(self, mocker):
-        """Test insert operation when connection fails."""
-        mock_conn = MagicMock()
-        mock_conn.cursor.side_effect = ConnectionError("Connection lost")
-
-        mocker.patch(
-            "backend.services.db.connector.get_connection",
-            return_value=mock_conn
-        )
+    @pytest.mark.parametrize(("fail_at", "error", "operation", "match"), _DRIVER_FAILURES)
+    def test_driver_failure_is_wrapped(self, driver, fail_at, error, operation, match):
+        """Test that driver errors opening a cursor or executing surface as the connector's error."""
+        driver.fail(fail_at, error)
 
-        with pytest.raises(Exception, match="Failed to insert data"):
-            insert_data("catalog.schema.table", [{"id": 1}], "warehouse-123")
+        with pytest.raises(Exception, match=match):
+            operation()
 
-    def test_endpoint_handles_database_error_gracefully(self, mocker):
+    def test_endpoint_handles_database_error_gracefully(self, client, mocker):
         """Test API endpoint handles database errors with proper error response."""
         mocker.patch(
             "backend.services.db.connector.query",
             side_effect=Exception("Database unavailable")
         )
 
-        with TestClient(app) as client:
+        resp = client.get(
+            "/api/v1/records/read",
+            params={
+                "catalog": "test",
+                "schema": "test",
+                "table": "test",
+                "limit": 10
+            }
+        )
+
+        assert_error(resp, 500, "Failed to query records table")
+
+    def test_missing_warehouse_id_configuration(self, client):
+        """Test behavior when warehouse ID is not configured."""
+        with patch("backend.config.settings.settings.databricks_warehouse_id", None):
             resp = client.get(
                 "/api/v1/records/read",
                 params={
@@ -88,115 +116,199 @@ class TestConnectionFailures:
 
             assert resp.status_code == 500
             data = resp.json()
-            assert data["error"] is True
-            assert "Failed to query records table" in data["message"]
+            assert data == {"error": True, "message": "SQL warehouse ID not configured", "details": {}}
+            assert resp.headers["content-type"] == "application/json"
 
-    def test_missing_warehouse_id_configuration(self):
-        """Test behavior when warehouse ID is not configured."""
-        with TestClient(app) as client:
-            with patch("backend.config.settings.settings.databricks_warehouse_id", None):
-                resp = client.get(
-                    "/api/v1/records/read",
-                    params={
-                        "catalog": "test",
-                        "schema": "test",
-                        "table": "test",
-                        "limit": 10
-                    }
-                )
-
-                assert resp.status_code == 500
-                data = resp.json()
-                assert "SQL warehouse ID not configured" in data["message"]
-
-    def test_connection_recovery_after_failure(self, mocker):
-        """Test that system can recover after connection failure."""
-        call_count = 0
-
-        def side_effect_connection(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                raise ConnectionError("First connection failed")
-            mock_conn = MagicMock()
-            mock_cursor = MagicMock()
-            mock_cursor.fetchall.return_value = [(1, "test")]
-            mock_cursor.description = [("id",), ("name",)]
-            mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-            return mock_conn
-
-        mocker.patch(
+    def test_connection_recovery_after_failure(self, mocker, make_conn):
+        """Test that a transient connection failure is retried with a fresh connection."""
+        connect = mocker.patch(
             "backend.services.db.connector.sql.connect",
-            side_effect=side_effect_connection
+            side_effect=[
+                sql_exc.RequestError("Error during request to server"),
+                make_conn(fetchall=[(1, "test")], description=[("id",), ("name",)]),
+            ],
         )
 
-        with pytest.raises((RuntimeError, ConnectionError)):
+        result = query("SELECT * FROM test", "warehouse-123", as_dict=True)
+
+        assert len(result) == 1
+        assert connect.call_count == 2
+
+    @pytest.mark.parametrize(
+        ("error", "attempts"),
+        [
+            pytest.param(ConnectionError("Network unreachable"), 3, id="connection"),
+            pytest.param(TimeoutError("Read timed out"), 3, id="timeout"),
+            pytest.param(sql_exc.RequestError("Error during request to server"), 3, id="driver-request"),
+            pytest.param(sql_exc.OperationalError("Session is closed"), 3, id="driver-operational"),
+            pytest.param(PermissionError("Authentication failed"), 1, id="auth"),
+            pytest.param(SyntaxError("SQL syntax error near 'SELCT'"), 1, id="syntax"),
+            pytest.param(sql_exc.ServerOperationError("[PARSE_SYNTAX_ERROR]"), 1, id="statement"),
+        ],
+    )
+    def test_query_retries_only_transient_errors(self, driver, error, attempts):
+        """Test that only connection and timeout errors are retried, within the attempt budget."""
+        driver.fail("execute", error)
+
+        with pytest.raises(Exception, match="Query failed"):
             query("SELECT * FROM test", "warehouse-123")
 
-        close_connections()
+        assert driver.cursor.execute.call_count == attempts
 
-        result = query("SELECT * FROM test", "warehouse-456", as_dict=True)
-        assert len(result) == 1
+    def test_retried_query_counts_once_towards_breaker(self, driver, monkeypatch):
+        """Test that a call failing on every retry costs the breaker one failure, not one per attempt."""
+        monkeypatch.setattr("backend.services.db.connector.BREAKER_FAIL_MAX", 2)
+        driver.fail("execute", sql_exc.RequestError("Error during request to server"))
+        breaker = _pool_for("warehouse-123").breaker
 
-    def test_concurrent_connection_failures(self, mocker):
-        """Test behavior when multiple connections fail simultaneously."""
-        mock_conn = MagicMock()
-        mock_conn.cursor.side_effect = ConnectionError("Connection pool exhausted")
+        with pytest.raises(Exception, match="Query failed"):
+            query("SELECT * FROM test", "warehouse-123")
+        assert driver.cursor.execute.call_count == 3
+        assert breaker.state == "closed"
 
-        mocker.patch(
-            "backend.services.db.connector.get_connection",
-            return_value=mock_conn
-        )
+        with pytest.raises(Exception, match="Query failed"):
+            query("SELECT * FROM test", "warehouse-123")
+        assert breaker.state == "open"
 
-        with TestClient(app) as client:
-            responses = []
-            for _ in range(3):
-                resp = client.get(
-                    "/api/v1/records/read",
-                    params={
-                        "catalog": "test",
-                        "schema": "test",
-                        "table": "test",
-                        "limit": 10
-                    }
-                )
-                responses.append(resp)
-
-            for resp in responses:
-                assert resp.status_code == 500
-
-    def test_query_with_corrupted_result(self, mocker):
-        """Test handling of corrupted query results."""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.fetchall.return_value = None
-        mock_cursor.description = [("id",)]
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    def test_query_retry_stops_when_circuit_opens(self, driver, monkeypatch):
+        """Test that retries stop once other callers' failures have opened the circuit."""
+        monkeypatch.setattr("backend.services.db.connector.BREAKER_FAIL_MAX", 1)
+        breaker = _pool_for("warehouse-123").breaker
 
-        mocker.patch(
-            "backend.services.db.connector.get_connection",
-            return_value=mock_conn
-        )
+        def fail_after_circuit_opens(*args):
+            breaker.record(ConnectionError("Failure seen by another request"))
+            raise ConnectionError("Network unreachable")
+
+        driver.fail("execute", fail_after_circuit_opens)
 
         with pytest.raises(Exception, match="Query failed"):
             query("SELECT * FROM test", "warehouse-123")
 
-    def test_insert_with_constraint_violation(self, mocker):
-        """Test insert when database constraint is violated."""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.execute.side_effect = ValueError("Unique constraint violation")
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        assert driver.cursor.execute.call_count == 1
+        assert breaker.state == "open"
 
-        mocker.patch(
-            "backend.services.db.connector.get_connection",
-            return_value=mock_conn
-        )
+    def test_concurrent_connection_failures(self, client, driver, monkeypatch):
+        """Repeated connection failures open the circuit so later requests fail fast with 503."""
+        monkeypatch.setattr("backend.services.db.connector.BREAKER_FAIL_MAX", 1)
+        driver.fail("cursor", ConnectionError("Connection pool exhausted"))
+
+        params = {"catalog": "test", "schema": "test", "table": "test", "limit": 10}
+
+        # The DESCRIBE probe fails on every retry and opens the circuit, so the page query fails fast
+        resp = client.get("/api/v1/records/read", params=params)
+        assert resp.status_code == 503
+        attempts = driver.conn.cursor.call_count
+        assert attempts == 3
+
+        for _ in range(3):
+            resp = client.get("/api/v1/records/read", params=params)
+            assert_error(resp, 503, "unavailable")
+
+        assert driver.conn.cursor.call_count == attempts
+
+    def test_saturated_pool_returns_429(self, client, driver):
+        """Requests beyond the pool's connections and wait queue are turned away with 429 at once."""
+        pool = _pool_for(get_settings().databricks_warehouse_id)
+        capacity = pool.max_size + pool.max_queued
+        for _ in range(capacity):
+            assert pool.try_admit()
+
+        try:
+            started = time.monotonic()
+            resp = client.get(
+                "/api/v1/records/read", params={"catalog": "test", "schema": "test", "table": "test", "limit": 10}
+            )
+        finally:
+            for _ in range(capacity):
+                pool.leave()
+
+        assert_error(resp, 429, "Too many calls waiting")
+        # Rejected on the event loop, well before the pool's acquire timeout
+        assert time.monotonic() - started < POOL_ACQUIRE_TIMEOUT_SECONDS / 2
+        # Saturation is not a warehouse failure, so neither retries nor the breaker kick in
+        assert driver.cursor.execute.call_count == 0
+        assert pool.breaker.state == "closed"
+
+    def test_open_circuit_replays_last_good_read_page(self, client, mocker):
+        """While the circuit is open a page served earlier is replayed as degraded; others get 503."""
+        rows = [{"id": 1, "name": "test"}]
+        fake_query = mocker.patch("backend.services.db.connector.query", return_value=rows)
+        params = {"catalog": "test", "schema": "test", "table": "test", "limit": 10}
+
+        resp = client.get("/api/v1/records/read", params=params)
+        assert resp.status_code == 200
+        assert "X-Degraded" not in resp.headers
+
+        fake_query.side_effect = CircuitOpenError("SQL warehouse unavailable")
+
+        resp = client.get("/api/v1/records/read", params=params)
+        assert resp.status_code == 200
+        assert resp.headers["X-Degraded"] == "true"
+        assert resp.json()["data"] == rows
+
+        resp = client.get("/api/v1/records/read", params={**params, "offset": 10})
+        assert resp.status_code == 503
+
+    def test_circuit_half_open_probe_recovers(self, driver, monkeypatch):
+        """After the reset timeout one trial call goes through and closes the circuit on success."""
+        monkeypatch.setattr("backend.services.db.connector.BREAKER_FAIL_MAX", 1)
+        monkeypatch.setattr("backend.services.db.connector.BREAKER_RESET_SECONDS", 0.01)
+        driver.fail("execute", ConnectionError("Network unreachable"))
+        driver.cursor.fetchall.return_value = [(1,)]
+        driver.cursor.description = [("id",)]
+
+        with pytest.raises(Exception, match="Query failed"):
+            query("SELECT * FROM test", "warehouse-123")
+        with pytest.raises(CircuitOpenError):
+            query("SELECT * FROM test", "warehouse-123")
+        assert driver.cursor.execute.call_count == 3
+
+        time.sleep(0.02)
+        driver.fail("execute", None)
+
+        assert query("SELECT * FROM test", "warehouse-123") == [{"id": 1}]
+        assert _pool_for("warehouse-123").breaker.state == "closed"
+
+    def test_circuit_half_open_probe_failure_reopens(self, driver, monkeypatch):
+        """A failed trial call re-opens the circuit for another reset period."""
+        monkeypatch.setattr("backend.services.db.connector.BREAKER_FAIL_MAX", 1)
+        monkeypatch.setattr("backend.services.db.connector.BREAKER_RESET_SECONDS", 0.01)
+        driver.fail("cursor", TimeoutError("Connection timeout"))
+
+        with pytest.raises(Exception, match="Query failed"):
+            query("SELECT * FROM test", "warehouse-123")
+
+        time.sleep(0.02)
+        assert _pool_for("warehouse-123").breaker.state == "half-open"
+        with pytest.raises(Exception, match="Query failed"):
+            query("SELECT * FROM test", "warehouse-123")
 
-        with pytest.raises(Exception, match="Failed to insert data"):
-            insert_data("test.test.test", [{"id": 1, "name": "test"}], "warehouse-123")
+        assert _pool_for("warehouse-123").breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            query("SELECT * FROM test", "warehouse-123")
+        # Three attempts before the circuit opened, then a single trial that is not retried
+        assert driver.conn.cursor.call_count == 4
+
+    def test_statement_errors_do_not_open_circuit(self, driver, monkeypatch):
+        """Errors for a bad statement mean the warehouse answered, so the circuit stays closed."""
+        monkeypatch.setattr("backend.services.db.connector.BREAKER_FAIL_MAX", 1)
+        driver.fail("execute", sql_exc.ServerOperationError("[PARSE_SYNTAX_ERROR]"))
+
+        for _ in range(3):
+            with pytest.raises(Exception, match="Query failed"):
+                query("SELCT * FROM test", "warehouse-123")
+
+        assert _pool_for("warehouse-123").breaker.state == "closed"
 
-    def test_connection_close_failure(self, mocker):
+    def test_query_with_corrupted_result(self, driver):
+        """Test handling of corrupted query results."""
+        driver.cursor.fetchall.return_value = None
+        driver.cursor.description = [("id",)]
+
+        with pytest.raises(Exception, match="Query failed"):
+            query("SELECT * FROM test", "warehouse-123")
+
+    def test_connection_close_failure(self):
         """Test that connection close failures don't crash the app."""
         mock_conn = MagicMock()
         mock_conn.close.side_effect = Exception("Connection already closed")
@@ -216,40 +328,23 @@ class TestConnectionFailures:
         with pytest.raises(ValueError):
             query("SELECT 1", "invalid-warehouse")
 
-    def test_sql_syntax_error_in_query(self, mocker):
-        """Test handling of SQL syntax errors."""
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.execute.side_effect = SyntaxError("SQL syntax error near 'SELCT'")
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-
-        mocker.patch(
-            "backend.services.db.connector.get_connection",
-            return_value=mock_conn
-        )
-
-        with pytest.raises(Exception, match="Query failed"):
-            query("SELCT * FROM test", "warehouse-123")
-
-    def test_records_endpoint_connection_failure(self, mocker):
+    def test_records_endpoint_connection_failure(self, client, mocker):
         """Test records endpoint handles connection failures."""
         mocker.patch(
             "backend.services.db.connector.query",
             side_effect=ConnectionError("Database unavailable")
         )
 
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "records",
-                    "limit": 10
-                }
-            )
+        resp = client.get(
+            "/api/v1/records/read",
+            params={
+                "catalog": "test",
+                "schema": "test",
+                "table": "records",
+                "limit": 10
+            }
+        )
 
-            assert resp.status_code == 500
-            assert "Failed to query records table" in resp.json()["message"]
+        assert_error(resp, 500, "Failed to query records table")
 
 
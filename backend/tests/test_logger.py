@@ -1,11 +1,19 @@
 """Tests for database logging functionality."""
 
+import threading
+from datetime import UTC, datetime
+from types import SimpleNamespace
 
 import pytest
 
 from backend.services.logger import DatabaseLogger, db_logger
 
 
+def _request(path="/", method="GET", body=None, **state):
+    """Plain stand-in for a Starlette request, carrying only what the logger reads."""
+    return SimpleNamespace(url=SimpleNamespace(path=path), method=method, _body=body, state=SimpleNamespace(**state))
+
+
 class TestDatabaseLogger:
     """Test suite for database logging."""
 
@@ -81,6 +89,31 @@ class TestDatabaseLogger:
         assert result is True
         assert any("CREATE TABLE IF NOT EXISTS" in q for q in self.queries_executed)
 
+    def test_ensure_log_table_runs_ddl_once_per_table(self, mock_db):
+        """Test that the log table DDL is issued once and then served from cache."""
+        logger = DatabaseLogger()
+
+        assert logger._ensure_log_table_exists() is True
+        assert logger._ensure_log_table_exists() is True
+        assert logger._ensure_log_table_exists(catalog="other_catalog") is True
+
+        assert not any("SELECT 1 FROM" in q for q in self.queries_executed)
+        assert len(self.queries_executed) == 2
+        assert "test_catalog.test_schema.api_log" in self.queries_executed[0]
+        assert "other_catalog.test_schema.api_log" in self.queries_executed[1]
+
+    def test_log_error_checks_log_table_once(self, mock_db):
+        """Test that repeated log_error calls hit the warehouse for the log table only once."""
+        logger = DatabaseLogger()
+
+        for i in range(10):
+            logger.log_error(ValueError(f"error {i}"), request=None)
+            logger.flush()
+
+        assert sum("CREATE TABLE IF NOT EXISTS" in q for q in self.queries_executed) == 1
+        assert not any("SELECT 1 FROM" in q for q in self.queries_executed)
+        assert len(self.logged_entries) == 10
+
     def test_log_error_with_exception(self, mock_db):
         """Test logging an error with exception details."""
         logger = DatabaseLogger()
@@ -89,6 +122,7 @@ class TestDatabaseLogger:
             raise ValueError("Test error message")
         except ValueError as e:
             logger.log_error(e, request=None, level="ERROR")
+        logger.flush()
 
         assert len(self.logged_entries) == 1
         entry = self.logged_entries[0]
@@ -101,13 +135,18 @@ class TestDatabaseLogger:
         assert "timestamp" in entry
         assert "stack_trace" in entry
 
-    def test_log_error_with_request_context(self, mock_db, monkeypatch):
-        """Test logging includes request context."""
-        from unittest.mock import Mock
+    def test_log_entry_timestamp_comes_from_clock(self, mock_db):
+        """Test that entries are stamped by the injected clock and written as ISO strings."""
+        logger = DatabaseLogger(clock=lambda: datetime(2024, 1, 1, tzinfo=UTC))
+
+        logger.log_event("stamped", request=None)
+        logger.flush()
 
-        mock_request = Mock()
-        mock_request.url.path = "/api/v1/records"
-        mock_request.method = "POST"
+        assert self.logged_entries[0]["timestamp"] == "2024-01-01T00:00:00+00:00"
+
+    def test_log_error_with_request_context(self, mock_db):
+        """Test logging includes request context."""
+        mock_request = _request("/api/v1/records", "POST")
 
         logger = DatabaseLogger()
 
@@ -115,12 +154,61 @@ class TestDatabaseLogger:
             raise ValueError("Test error with request")
         except ValueError as e:
             logger.log_error(e, request=mock_request)
+        logger.flush()
 
         assert len(self.logged_entries) == 1
         entry = self.logged_entries[0]
         assert entry["endpoint"] == "/api/v1/records"
         assert entry["method"] == "POST"
 
+    def test_log_error_reads_table_from_body(self, mock_db):
+        """Test that catalog/schema/table come from the cached request body."""
+        mock_request = _request(
+            "/api/v1/records/write",
+            "POST",
+            b'{"catalog": "body_catalog", "schema": "body_schema", "table": "body_table"}',
+        )
+
+        logger = DatabaseLogger()
+
+        try:
+            raise ValueError("Test error with body")
+        except ValueError as e:
+            logger.log_error(e, request=mock_request)
+        logger.flush()
+
+        entry = self.logged_entries[0]
+        assert (entry["catalog"], entry["schema"], entry["table_name"]) == (
+            "body_catalog",
+            "body_schema",
+            "body_table",
+        )
+        assert entry["request_body"].startswith('{"catalog": "body_catalog"')
+
+    def test_log_error_accepts_schema_name_in_body(self, mock_db):
+        """Test that the write payload's schema_name field is logged as the schema."""
+        mock_request = _request(body=b'{"catalog": "raw_catalog", "schema_name": "raw_schema"}')
+
+        logger = DatabaseLogger()
+        logger.log_event("raw body", request=mock_request)
+        logger.flush()
+
+        entry = self.logged_entries[0]
+        assert (entry["catalog"], entry["schema"]) == ("raw_catalog", "raw_schema")
+
+    def test_log_error_truncates_large_body_at_byte_level(self, mock_db):
+        """Test that oversized bodies are cut to LOG_BODY_MAX_BYTES before decoding."""
+        mock_request = _request(body=("é" * 5000).encode("utf-8"))
+
+        logger = DatabaseLogger()
+        logger.log_event("big body", request=mock_request)
+        logger.flush()
+
+        body = self.logged_entries[0]["request_body"]
+        assert body.endswith("... (truncated)")
+        assert body.startswith("é" * 2500)
+        assert len(body) == 2500 + len("... (truncated)")
+
     def test_log_error_with_additional_context(self, mock_db):
         """Test logging includes additional context."""
         logger = DatabaseLogger()
@@ -139,6 +227,7 @@ class TestDatabaseLogger:
                     "status_code": 500,
                 },
             )
+        logger.flush()
 
         assert len(self.logged_entries) == 1
         entry = self.logged_entries[0]
@@ -148,6 +237,64 @@ class TestDatabaseLogger:
         assert entry["table_name"] == "my_table"
         assert entry["status_code"] == 500
 
+    def test_log_error_is_written_in_the_background(self, mock_db, monkeypatch):
+        """Test that log_error returns before the insert and queued entries share one insert."""
+        inserts = []
+        release = threading.Event()
+
+        def slow_insert(table_path, data, warehouse_id):
+            release.wait(timeout=5)
+            inserts.append(list(data))
+            return len(data)
+
+        monkeypatch.setattr("backend.services.db.connector.insert_data", slow_insert)
+        logger = DatabaseLogger()
+
+        for i in range(3):
+            logger.log_event(f"event {i}", request=None)
+        assert inserts == []
+
+        release.set()
+        logger.flush()
+
+        assert [len(batch) for batch in inserts] == [3]
+
+    def test_flush_gives_up_when_the_warehouse_hangs(self, mock_db, monkeypatch):
+        """Test that flush returns after its timeout instead of waiting on a stuck insert."""
+        release = threading.Event()
+
+        def hanging_insert(table_path, data, warehouse_id):
+            release.wait(timeout=5)
+            return len(data)
+
+        monkeypatch.setattr("backend.services.db.connector.insert_data", hanging_insert)
+        logger = DatabaseLogger()
+        logger.log_event("stuck", request=None)
+
+        try:
+            assert logger.flush(timeout=0.05) is False
+        finally:
+            release.set()
+        assert logger.flush() is True
+
+    def test_error_burst_is_written_in_few_inserts(self, mock_db, monkeypatch):
+        """Test that a burst of log_error calls is coalesced into multi-row inserts."""
+        insert_sizes = []
+
+        def counting_insert(table_path, data, warehouse_id):
+            insert_sizes.append(len(data))
+            return len(data)
+
+        monkeypatch.setattr("backend.services.db.connector.insert_data", counting_insert)
+        logger = DatabaseLogger()
+
+        for i in range(100):
+            logger.log_error(ValueError(f"error {i}"), request=None)
+        logger.flush()
+
+        assert sum(insert_sizes) == 100
+        assert len(insert_sizes) <= 2
+
     def test_log_error_does_nothing_when_disabled(self, monkeypatch, mock_db):
         """Test that logging is skipped when disabled."""
         monkeypatch.setenv("DATABRICKS_LOGGING_ENABLED", "false")
@@ -157,6 +304,7 @@ class TestDatabaseLogger:
             raise ValueError("This should not be logged")
         except ValueError as e:
             logger.log_error(e, request=None)
+        logger.flush()
 
         assert len(self.logged_entries) == 0
 
@@ -173,6 +321,7 @@ class TestDatabaseLogger:
             raise ValueError("Original error")
         except ValueError as e:
             logger.log_error(e, request=None)
+        logger.flush()
 
     def test_log_event_creates_log_entry(self, mock_db):
         """Test logging a general event."""
@@ -183,6 +332,7 @@ class TestDatabaseLogger:
             level="INFO",
             additional_context={"catalog": "test_cat"},
         )
+        logger.flush()
 
         assert len(self.logged_entries) == 1
         entry = self.logged_entries[0]
@@ -191,6 +341,43 @@ class TestDatabaseLogger:
         assert "User action completed successfully" in entry["error_message"]
         assert entry["catalog"] == "test_cat"
 
+    def test_stack_trace_only_recorded_for_active_exceptions(self, mock_db):
+        """Test that events and errors logged outside an except block carry no stack trace."""
+        logger = DatabaseLogger()
+
+        logger.log_event("Nothing went wrong", request=None)
+        logger.log_error(ValueError("Not raised"), request=None)
+        try:
+            raise ValueError("Raised")
+        except ValueError as e:
+            logger.log_error(e, request=None)
+        logger.flush()
+
+        event, unraised, raised = self.logged_entries
+        assert event["error_type"] == "LogEvent"
+        assert event["stack_trace"] is None
+        assert unraised["stack_trace"] is None
+        assert "ValueError: Raised" in raised["stack_trace"]
+
+    def test_stack_trace_comes_from_the_logged_error(self, mock_db):
+        """Test that the trace is the error's own, even when logged later or while another is handled."""
+        logger = DatabaseLogger()
+        try:
+            raise ValueError("Logged later")
+        except ValueError as e:
+            earlier = e
+
+        logger.log_error(earlier, request=None)
+        try:
+            raise KeyError("Being handled")
+        except KeyError:
+            logger.log_error(earlier, request=None)
+        logger.flush()
+
+        for entry in self.logged_entries:
+            assert "ValueError: Logged later" in entry["stack_trace"]
+            assert "KeyError" not in entry["stack_trace"]
+
     def test_global_logger_instance_exists(self):
         """Test that global db_logger instance is available."""
         assert db_logger is not None
@@ -1,11 +1,28 @@
 """Tests for pagination with large datasets."""
 
+import asyncio
+import re
+from urllib.parse import urlencode
+
 import pytest
-from fastapi.testclient import TestClient
 
-from backend.app import app
+_LIMIT_RE = re.compile(r'LIMIT (\d+)')
+_OFFSET_RE = re.compile(r'OFFSET (\d+)')
+
+# Query strings are built once at import instead of urlencoding a params dict per request
+_READ_URL = "/api/v1/records/read?catalog=test&schema=test&table=large_table"
+_RECORDS_READ_URL = "/api/v1/records/read?catalog=test&schema=test&table=records"
+_FILTER_QUERY = urlencode({"filter_expr": '[{"column": "value", "op": ">", "value": 50}]'})
+
+_TOTAL_RECORDS = 10000
+# The fake table is deterministic, so build it once and serve pages as slices
+_ALL_RECORDS = [
+    {"id": i, "name": f"Record_{i}", "value": i * 10.5, "is_deleted": False}
+    for i in range(_TOTAL_RECORDS)
+]
 
 
+@pytest.mark.asyncio(loop_scope="session")
 class TestLargeDatasetPagination:
     """Test suite for pagination with large datasets."""
 
@@ -20,25 +37,13 @@ class TestLargeDatasetPagination:
                 "params": params
             })
 
-            import re
-            limit_match = re.search(r'LIMIT (\d+)', sql_query)
-            offset_match = re.search(r'OFFSET (\d+)', sql_query)
+            limit_match = _LIMIT_RE.search(sql_query)
+            offset_match = _OFFSET_RE.search(sql_query)
 
             limit = int(limit_match.group(1)) if limit_match else 100
             offset = int(offset_match.group(1)) if offset_match else 0
 
-            total_records = 10000
-
-            records = []
-            for i in range(offset, min(offset + limit, total_records)):
-                records.append({
-                    "id": i,
-                    "name": f"Record_{i}",
-                    "value": i * 10.5,
-                    "is_deleted": False
-                })
-
-            return records
+            return _ALL_RECORDS[offset:offset + limit]
 
         def fake_insert(table_path, data, warehouse_id):
             return len(data)
@@ -46,290 +51,141 @@ class TestLargeDatasetPagination:
         monkeypatch.setattr("backend.services.db.connector.query", fake_query)
         monkeypatch.setattr("backend.services.db.connector.insert_data", fake_insert)
 
-    def test_first_page_pagination(self):
+    async def test_first_page_pagination(self, async_client):
         """Test retrieving the first page of results."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": 100,
-                    "offset": 0
-                }
-            )
+        resp = await async_client.get(f"{_READ_URL}&limit=100&offset=0")
 
-            assert resp.status_code == 200
-            data = resp.json()
-            assert data["count"] == 100
-            assert len(data["data"]) == 100
-            assert data["data"][0]["id"] == 0
-            assert data["data"][99]["id"] == 99
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 100
+        assert len(data["data"]) == 100
+        assert data["data"][0]["id"] == 0
+        assert data["data"][99]["id"] == 99
 
-    def test_middle_page_pagination(self):
+    async def test_middle_page_pagination(self, async_client):
         """Test retrieving a middle page of results."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": 50,
-                    "offset": 500
-                }
-            )
+        resp = await async_client.get(f"{_READ_URL}&limit=50&offset=500")
 
-            assert resp.status_code == 200
-            data = resp.json()
-            assert data["count"] == 50
-            assert data["data"][0]["id"] == 500
-            assert data["data"][49]["id"] == 549
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 50
+        assert data["data"][0]["id"] == 500
+        assert data["data"][49]["id"] == 549
 
-    def test_last_page_pagination(self):
+    async def test_last_page_pagination(self, async_client):
         """Test retrieving the last page with partial results."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": 100,
-                    "offset": 9900
-                }
-            )
+        resp = await async_client.get(f"{_READ_URL}&limit=100&offset=9900")
 
-            assert resp.status_code == 200
-            data = resp.json()
-            assert data["count"] == 100
-            assert data["data"][0]["id"] == 9900
-            assert data["data"][99]["id"] == 9999
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 100
+        assert data["data"][0]["id"] == 9900
+        assert data["data"][99]["id"] == 9999
 
-    def test_beyond_last_page(self):
+    async def test_beyond_last_page(self, async_client):
         """Test requesting data beyond the last page."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": 100,
-                    "offset": 10000
-                }
-            )
+        resp = await async_client.get(f"{_READ_URL}&limit=100&offset=10000")
 
-            assert resp.status_code == 200
-            data = resp.json()
-            assert data["count"] == 0
-            assert len(data["data"]) == 0
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 0
+        assert len(data["data"]) == 0
 
-    def test_maximum_limit_boundary(self):
+    async def test_maximum_limit_boundary(self, async_client):
         """Test pagination with maximum allowed limit."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": 1000,
-                    "offset": 0
-                }
-            )
+        resp = await async_client.get(f"{_READ_URL}&limit=1000&offset=0")
 
-            assert resp.status_code == 200
-            data = resp.json()
-            assert data["count"] == 1000
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 1000
 
-    def test_limit_exceeds_maximum(self):
+    async def test_limit_exceeds_maximum(self, async_client):
         """Test that limit exceeding maximum is rejected."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": 2000,
-                    "offset": 0
-                }
-            )
-
-            assert resp.status_code == 400
-
-    def test_negative_offset(self):
+        resp = await async_client.get(f"{_READ_URL}&limit=2000&offset=0")
+
+        assert resp.status_code == 400
+
+    async def test_negative_offset(self, async_client):
         """Test that negative offset is rejected."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": 100,
-                    "offset": -10
-                }
-            )
-
-            assert resp.status_code == 400
-
-    def test_zero_limit(self):
+        resp = await async_client.get(f"{_READ_URL}&limit=100&offset=-10")
+
+        assert resp.status_code == 400
+
+    async def test_zero_limit(self, async_client):
         """Test that zero limit is rejected."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": 0,
-                    "offset": 0
-                }
-            )
-
-            assert resp.status_code == 400
-
-    def test_large_offset_performance(self):
+        resp = await async_client.get(f"{_READ_URL}&limit=0&offset=0")
+
+        assert resp.status_code == 400
+
+    async def test_large_offset_performance(self, async_client):
         """Test that large offsets are handled (though may be slow)."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": 10,
-                    "offset": 9990
-                }
-            )
+        resp = await async_client.get(f"{_READ_URL}&limit=10&offset=9990")
 
-            assert resp.status_code == 200
-            data = resp.json()
-            assert data["count"] == 10
-            assert data["data"][0]["id"] == 9990
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 10
+        assert data["data"][0]["id"] == 9990
 
-    def test_records_pagination(self):
+    async def test_records_pagination(self, async_client):
         """Test pagination in records endpoint."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "records",
-                    "limit": 50,
-                    "offset": 100
-                }
-            )
+        resp = await async_client.get(f"{_RECORDS_READ_URL}&limit=50&offset=100")
 
-            assert resp.status_code == 200
-            data = resp.json()
-            assert data["count"] == 50
-            assert len(self.query_calls) > 0
-            assert "OFFSET 100" in self.query_calls[-1]["query"]
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 50
+        assert len(self.query_calls) > 0
+        assert "OFFSET 100" in self.query_calls[-1]["query"]
 
-    def test_pagination_with_filters(self):
+    async def test_pagination_with_filters(self, async_client):
         """Test pagination combined with filters."""
-        with TestClient(app) as client:
-            filters = '[{"column": "value", "op": ">", "value": 50}]'
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": 20,
-                    "offset": 10,
-                    "filter_expr": filters
-                }
-            )
+        resp = await async_client.get(f"{_READ_URL}&limit=20&offset=10&{_FILTER_QUERY}")
 
-            assert resp.status_code == 200
-            query = self.query_calls[-1]["query"]
-            assert "LIMIT 20" in query
-            assert "OFFSET 10" in query
-
-    def test_multiple_page_iteration(self):
-        """Test iterating through multiple pages."""
-        with TestClient(app) as client:
-            page_size = 100
-            total_fetched = 0
-            all_ids = set()
-
-            for page in range(5):
-                resp = client.get(
-                    "/api/v1/records/read",
-                    params={
-                        "catalog": "test",
-                        "schema": "test",
-                        "table": "large_table",
-                        "limit": page_size,
-                        "offset": page * page_size
-                    }
-                )
-
-                assert resp.status_code == 200
-                data = resp.json()
-                total_fetched += data["count"]
-
-                for record in data["data"]:
-                    all_ids.add(record["id"])
-
-            assert total_fetched == 500
-            assert len(all_ids) == 500
-
-    def test_string_limit_parameter(self):
-        """Test that string limit parameter is handled correctly."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": "50",
-                    "offset": "100"
-                }
-            )
+        assert resp.status_code == 200
+        query = self.query_calls[-1]["query"]
+        assert "LIMIT 20" in query
+        assert "OFFSET 10" in query
 
+    async def test_multiple_page_iteration(self, async_client):
+        """Test fetching several consecutive pages concurrently."""
+        page_size = 100
+
+        responses = await asyncio.gather(*[
+            async_client.get(f"{_READ_URL}&limit={page_size}&offset={page * page_size}")
+            for page in range(5)
+        ])
+
+        total_fetched = 0
+        all_ids = set()
+        for resp in responses:
             assert resp.status_code == 200
             data = resp.json()
-            assert data["count"] == 50
+            total_fetched += data["count"]
+            all_ids.update(record["id"] for record in data["data"])
+
+        assert total_fetched == 500
+        assert len(all_ids) == 500
+
+    async def test_string_limit_parameter(self, async_client):
+        """Test that string limit parameter is handled correctly."""
+        resp = await async_client.get(f"{_READ_URL}&limit=50&offset=100")
 
-    def test_float_limit_parameter(self):
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 50
+
+    async def test_float_limit_parameter(self, async_client):
         """Test that float limit parameter causes validation error."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table",
-                    "limit": "50.5",
-                    "offset": 0
-                }
-            )
-
-            assert resp.status_code == 422
-
-    def test_default_pagination_values(self):
+        resp = await async_client.get(f"{_READ_URL}&limit=50.5&offset=0")
+
+        assert resp.status_code == 422
+
+    async def test_default_pagination_values(self, async_client):
         """Test default pagination values when not specified."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "large_table"
-                }
-            )
+        resp = await async_client.get(_READ_URL)
 
-            assert resp.status_code == 200
-            query = self.query_calls[-1]["query"]
-            assert "LIMIT 100" in query
-            assert "OFFSET 0" in query
+        assert resp.status_code == 200
+        query = self.query_calls[-1]["query"]
+        assert "LIMIT 100" in query
+        assert "OFFSET 0" in query
 
 
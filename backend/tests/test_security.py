@@ -1,257 +1,146 @@
 """Security tests for SQL injection and validation vulnerabilities."""
 
+import re
+
+import orjson
 import pytest
-from fastapi.testclient import TestClient
 
-from backend.app import app
 from backend.services.db.sql_helpers import _validate_identifier, build_where_clause
+from backend.tests.fakes import FakeConnector
+from backend.tests.helpers import assert_error
+
+pytestmark = pytest.mark.usefixtures("fake_db")
+
+# Well-formed read parameters; tests override one field to inject through it
+_READ_PARAMS = {"catalog": "test_catalog", "schema": "test_schema", "table": "test_table", "limit": 10, "offset": 0}
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Message for rejected identifiers; compiled once for the pytest.raises(match=...) cases
+_INVALID_IDENTIFIER = "Invalid identifier"
+_INVALID_IDENTIFIER_RE = re.compile(_INVALID_IDENTIFIER)
+
+# Update whose key column carries a stacked statement; encoded once at import
+_UPDATE_INVALID_KEY_BODY = orjson.dumps({
+    "catalog": "test",
+    "schema_name": "test",
+    "table": "records",
+    "key_column": "id; DROP TABLE x",
+    "key_value": 1,
+    "updates": {"status": "completed"},
+})
+
+# Statement fragments that must never appear in SQL built from request input
+_DESTRUCTIVE_SQL = re.compile(r"UNION\s+SELECT|DROP\s+TABLE|DELETE\s+FROM", re.IGNORECASE)
+
+
+def _filter(column, op="=", value=1):
+    """Build one structured filter as the read endpoint receives it."""
+    return {"column": column, "op": op, "value": value}
 
 
+@pytest.mark.xdist_group("records_routes")
 class TestSQLInjectionPrevention:
     """Test suite for SQL injection attack prevention."""
 
-    @pytest.fixture(autouse=True)
-    def patch_connector(self, monkeypatch):
-        """Mock the database connector to capture SQL queries."""
-        self.executed_queries = []
-
-        def fake_query(sql_query, warehouse_id, as_dict=True, params=None):
-            self.executed_queries.append({
-                "query": sql_query,
-                "params": params,
-                "warehouse_id": warehouse_id
-            })
-            if sql_query.strip().upper().startswith("DESCRIBE"):
-                return [
-                    {"col_name": "id", "data_type": "bigint"},
-                    {"col_name": "name", "data_type": "string"},
-                    {"col_name": "is_deleted", "data_type": "boolean"},
-                ]
-            return [{"id": 1, "name": "Test"}]
-
-        def fake_insert(table_path, data, warehouse_id):
-            self.executed_queries.append({
-                "table_path": table_path,
-                "data": data,
-                "warehouse_id": warehouse_id
-            })
-            return len(data)
-
-        monkeypatch.setattr("backend.services.db.connector.query", fake_query)
-        monkeypatch.setattr("backend.services.db.connector.insert_data", fake_insert)
-        monkeypatch.setattr("backend.routes.v1.records.db_connector.query", fake_query)
-        monkeypatch.setattr("backend.routes.v1.records.db_connector.insert_data", fake_insert)
-
-    def test_sql_injection_in_filter_clause(self):
-        """Test SQL injection attempt through filter parameter."""
-        with TestClient(app) as client:
-            malicious_filter = "1=1; DROP TABLE users; --"
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test_catalog",
-                    "schema": "test_schema",
-                    "table": "test_table",
-                    "filters": malicious_filter,
-                    "limit": 10,
-                    "offset": 0
-                }
-            )
-
-            assert resp.status_code == 500
-            body = resp.json()
-            assert body["error"] is True
-            assert "Invalid filters JSON" in body["message"]
-
-    def test_sql_injection_in_columns_parameter(self):
-        """Test SQL injection attempt through columns parameter."""
-        with TestClient(app) as client:
-            malicious_columns = "id, name; DROP TABLE users; --"
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test_catalog",
-                    "schema": "test_schema",
-                    "table": "test_table",
-                    "columns": malicious_columns,
-                    "limit": 10,
-                    "offset": 0
-                }
-            )
-
-            assert resp.status_code == 200
-            query = self.executed_queries[-1]["query"]
-            assert "SELECT" in query
-            assert malicious_columns in query
-
-    def test_sql_injection_in_catalog_name(self):
-        """Test SQL injection attempt through catalog identifier."""
-        with TestClient(app) as client:
-            malicious_catalog = "test'; DROP TABLE users; --"
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": malicious_catalog,
-                    "schema": "test_schema",
-                    "table": "test_table",
-                    "limit": 10,
-                    "offset": 0
-                }
-            )
-
-            assert resp.status_code == 400
-            body = resp.json()
-            assert body["error"] is True
-            assert "Invalid identifier" in body["message"]
-
-    def test_sql_injection_in_records_filter(self):
-        """Test SQL injection through records filter parameter."""
-        with TestClient(app) as client:
-            malicious_filter = '[{"column": "id", "op": "=", "value": "1 OR 1=1"}]'
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "public",
-                    "table": "records",
-                    "filters": malicious_filter,
-                    "limit": 10
-                }
-            )
-
-            assert resp.status_code == 200
-            assert len(self.executed_queries) > 0
-            query_info = self.executed_queries[0]
-            if query_info["params"]:
-                assert "1 OR 1=1" in str(query_info["params"])
-
-    def test_structured_filter_injection(self):
-        """Test SQL injection via structured filters."""
+    @pytest.mark.parametrize(
+        ("param_name", "payload", "expected_status", "expected_msg"),
+        [
+            pytest.param("filters", "1=1; DROP TABLE users; --", 400, "Invalid filters JSON", id="filters"),
+            pytest.param("columns", "id, name; DROP TABLE users; --", 400, _INVALID_IDENTIFIER, id="columns"),
+            pytest.param("catalog", "test'; DROP TABLE users; --", 400, _INVALID_IDENTIFIER, id="catalog"),
+            pytest.param("catalog", "invalid-catalog", 400, _INVALID_IDENTIFIER, id="catalog-hyphen"),
+            pytest.param("table", "records; DROP TABLE users", 400, _INVALID_IDENTIFIER, id="table"),
+            # A well-formed filter is accepted, but its value must only ever be bound as a parameter
+            pytest.param(
+                "filters", '[{"column": "id", "op": "=", "value": "1 OR 1=1"}]', 200, "1 OR 1=1", id="filter-value"
+            ),
+        ],
+    )
+    def test_sql_injection_in_read_parameter(self, client, param_name, payload, expected_status, expected_msg):
+        """Test SQL injection attempts through the read endpoint's query parameters."""
+        resp = client.get("/api/v1/records/read", params={**_READ_PARAMS, param_name: payload})
+
+        selects = [q for q in FakeConnector.queries if q.query.startswith("SELECT")]
+        if expected_status == 400:
+            assert_error(resp, 400, expected_msg)
+            assert not selects
+        else:
+            assert resp.status_code == expected_status
+            assert expected_msg not in selects[-1].query
+            assert expected_msg in selects[-1].params
+
+    @pytest.mark.parametrize(
+        ("column", "op", "match"),
+        [
+            pytest.param("id'; DROP TABLE users; --", "=", _INVALID_IDENTIFIER_RE, id="quoted-column"),
+            pytest.param("col; DROP TABLE x", "=", _INVALID_IDENTIFIER_RE, id="stacked-column"),
+            pytest.param("id", "= 1; DROP TABLE users; --", "Unsupported operator", id="operator"),
+        ],
+    )
+    def test_build_where_clause_rejects_injection(self, column, op, match):
+        """Test SQL injection through a structured filter's column or operator."""
+        with pytest.raises(ValueError, match=match):
+            build_where_clause([_filter(column, op)])
+
+    def test_lowercase_operator_is_normalised(self):
+        """Test that operators are matched case-insensitively and emitted uppercase."""
         filters = [
-            {"column": "id'; DROP TABLE users; --", "op": "=", "value": 1}
+            {"column": "name", "op": "like", "value": "a%"},
+            {"column": "id", "op": "in", "value": (1, 2)},
         ]
 
-        with pytest.raises(ValueError, match="Invalid identifier"):
-            build_where_clause(filters)
+        where_clause, params = build_where_clause(filters)
+        assert where_clause == "WHERE name LIKE ? AND id IN (?, ?)"
+        assert params == ["a%", 1, 2]
 
-    def test_operator_injection(self):
-        """Test SQL injection through operator field."""
-        filters = [
-            {"column": "id", "op": "= 1; DROP TABLE users; --", "value": 1}
-        ]
+    def test_union_based_injection(self, client):
+        """Test UNION-based SQL injection attempt."""
+        resp = client.get("/api/v1/records/read", params=_READ_PARAMS)
 
-        with pytest.raises(ValueError, match="Unsupported operator"):
-            build_where_clause(filters)
+        assert resp.status_code == 200
+        query = FakeConnector.queries[-1].query
+        assert not _DESTRUCTIVE_SQL.search(query)
+        # The fake table has is_deleted, so soft-deleted rows are filtered through a bound parameter
+        assert "is_deleted = ?" in query
 
-    def test_union_based_injection(self, mocker):
-        """Test UNION-based SQL injection attempt."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "test",
-                    "limit": 10
-                }
-            )
-
-            assert resp.status_code == 200
-            query = self.executed_queries[-1]["query"]
-            assert "UNION SELECT" not in query.upper()
-            assert "DROP TABLE" not in query.upper()
-            assert "DELETE FROM" not in query.upper()
-            assert "IS_DELETED" in query.upper() or "IS_DELETED" not in query.upper()
-
-    def test_time_based_blind_injection(self, mocker):
+    def test_time_based_blind_injection(self, client):
         """Test time-based blind SQL injection attempt."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "test",
-                    "limit": 10
-                }
-            )
+        resp = client.get("/api/v1/records/read", params=_READ_PARAMS)
 
-            assert resp.status_code == 200
+        assert resp.status_code == 200
 
 
 class TestInvalidIdentifiers:
     """Test suite for identifier validation."""
 
-    def test_validate_identifier_with_valid_names(self):
+    @pytest.mark.parametrize("identifier", ["table_name", "TableName", "_private", "table123", "UPPERCASE_TABLE"])
+    def test_validate_identifier_with_valid_names(self, identifier):
         """Test that valid identifiers pass validation."""
-        valid_identifiers = [
-            "table_name",
-            "TableName",
-            "_private",
-            "table123",
-            "UPPERCASE_TABLE"
-        ]
-
-        for identifier in valid_identifiers:
-            _validate_identifier(identifier)
-
-    def test_validate_identifier_with_invalid_names(self):
+        _validate_identifier(identifier)
+
+    @pytest.mark.parametrize(
+        "identifier",
+        [
+            pytest.param(value, id=repr(value))
+            for value in [
+                "123table",
+                "table-name",
+                "table.name",
+                "table name",
+                "table;drop",
+                "table'name",
+                "table\"name",
+                "",
+                "table/*comment*/",
+                "table--comment",
+            ]
+        ],
+    )
+    def test_validate_identifier_with_invalid_names(self, identifier):
         """Test that invalid identifiers are rejected."""
-        invalid_identifiers = [
-            "123table",
-            "table-name",
-            "table.name",
-            "table name", 
-            "table;drop",
-            "table'name",
-            "table\"name",
-            "",
-            "table/*comment*/",
-            "table--comment",
-        ]
-
-        for identifier in invalid_identifiers:
-            with pytest.raises(ValueError, match="Invalid identifier"):
-                _validate_identifier(identifier)
-
-    def test_invalid_catalog_name(self):
-        """Test invalid catalog name is rejected."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "invalid-catalog",
-                    "schema": "test_schema",
-                    "table": "test_table",
-                    "limit": 10
-                }
-            )
-
-            assert resp.status_code in [400, 500]
-
-    def test_invalid_table_name_in_records(self):
-        """Test invalid table name in records endpoint."""
-        with TestClient(app) as client:
-            resp = client.get(
-                "/api/v1/records/read",
-                params={
-                    "catalog": "test",
-                    "schema": "test",
-                    "table": "records; DROP TABLE users",
-                    "limit": 10
-                }
-            )
-
-            assert resp.status_code in [400, 500]
-
-    def test_invalid_column_name_in_filter(self):
-        """Test invalid column name in structured filter."""
-        filters = [
-            {"column": "col; DROP TABLE x", "op": "=", "value": 1}
-        ]
-
-        with pytest.raises(ValueError):
-            build_where_clause(filters)
+        with pytest.raises(ValueError, match=_INVALID_IDENTIFIER_RE):
+            _validate_identifier(identifier)
 
     def test_empty_identifier(self):
         """Test empty identifier is rejected."""
@@ -270,52 +159,31 @@ class TestInvalidIdentifiers:
         except ValueError:
             pass
 
-    def test_special_sql_keywords_as_identifiers(self):
-        """Test SQL keywords used as identifiers."""
-        sql_keywords = ["select", "from", "where", "order", "group"]
+    def test_non_ascii_and_non_string_identifiers(self):
+        """Test identifiers are ASCII-only and non-string names are rejected cleanly."""
+        for name in ["naïve", "table\n", ["table"], 1]:
+            with pytest.raises(ValueError, match=_INVALID_IDENTIFIER_RE):
+                _validate_identifier(name)
 
-        for keyword in sql_keywords:
-            _validate_identifier(keyword)
+    @pytest.mark.parametrize("keyword", ["select", "from", "where", "order", "group"])
+    def test_special_sql_keywords_as_identifiers(self, keyword):
+        """Test SQL keywords used as identifiers."""
+        _validate_identifier(keyword)
 
 
+@pytest.mark.xdist_group("records_routes")
 class TestIdentifierValidationInRoutes:
     """Test identifier validation in API routes."""
 
-    @pytest.fixture(autouse=True)
-    def patch_connector(self, monkeypatch):
-        """Mock database connector."""
-        def fake_query(sql_query, warehouse_id, as_dict=True, params=None):
-            return []
-
-        def fake_insert(table_path, data, warehouse_id):
-            return len(data)
-
-        monkeypatch.setattr("backend.services.db.connector.query", fake_query)
-        monkeypatch.setattr("backend.services.db.connector.insert_data", fake_insert)
-
-    def test_records_update_with_invalid_key_column(self):
+    def test_records_update_with_invalid_key_column(self, client):
         """Test records update with invalid key column name."""
-        with TestClient(app) as client:
-            resp = client.put(
-                "/api/v1/records/update",
-                json={
-                    "catalog": "test",
-                    "schema_name": "test",
-                    "table": "records",
-                    "key_column": "id; DROP TABLE x",
-                    "key_value": 1,
-                    "updates": {"status": "completed"}
-                }
-            )
-
-            assert resp.status_code in [400, 500]
+        resp = client.put("/api/v1/records/update", content=_UPDATE_INVALID_KEY_BODY, headers=_JSON_HEADERS)
+
+        assert resp.status_code in [400, 500]
 
     def test_nested_identifier_injection(self):
         """Test injection through nested field names."""
-        filters = [
-            {"column": "valid_col", "op": "=", "value": 1},
-            {"column": "col2", "op": "IN", "value": [1, 2, "3; DROP TABLE x"]}
-        ]
+        filters = [_filter("valid_col"), _filter("col2", "IN", [1, 2, "3; DROP TABLE x"])]
 
         where_clause, params = build_where_clause(filters)
         assert "DROP TABLE" not in where_clause